@@ -5,6 +5,11 @@
 
 import sys
 import os
+import time
+
+# 启动计时（导入、创建窗口、显示窗口各阶段耗时）
+_start_time = time.perf_counter()
+_start_wall_time = time.time()  # 检测线程的启动指标从进程启动开始计时
 
 # 添加项目根目录到Python路径
 project_root = os.path.dirname(os.path.abspath(__file__))
@@ -13,6 +18,8 @@ sys.path.insert(0, project_root)
 from PyQt6.QtWidgets import QApplication
 from ui.main_window_ui import MainWindowUI
 
+_import_time = time.perf_counter()
+
 
 def main():
     """主函数"""
@@ -23,8 +30,20 @@ def main():
     app.setApplicationVersion("1.0.0")
     
     # 创建主窗口
-    window = MainWindowUI()
+    window_start = time.perf_counter()
+    window = MainWindowUI(start_time=_start_wall_time)
+    window_created = time.perf_counter()
     window.show()
+    app.processEvents()
+    window_shown = time.perf_counter()
+    
+    # 检测和动作执行模块在窗口显示后由后台线程加载，不计入这里
+    report = (f"启动耗时: 导入 {(_import_time - _start_time) * 1000:.0f}ms, "
+              f"创建窗口 {(window_created - window_start) * 1000:.0f}ms, "
+              f"显示窗口 {(window_shown - window_created) * 1000:.0f}ms, "
+              f"合计 {(window_shown - _start_time) * 1000:.0f}ms")
+    print(report)
+    window.log_message(report)
     
     # 运行应用程序
     sys.exit(app.exec())
@@ -1,10 +1,16 @@
 """
 蓝牙通信模块 - 用于树莓派和PC之间的手势数据传输
+
+接收器和发送器按需导入：接收器依赖 PyQt6，pybluez 在首次使用蓝牙时才导入（见 backend.load_pybluez）。
 """
 
+from lazy_exports import lazy_exports
 from .protocol import BluetoothProtocol, PacketType, HandData, GestureData
-from .receiver import BluetoothReceiver
-from .sender import BluetoothSender
+
+_EXPORTS = {
+    'BluetoothReceiver': '.receiver',
+    'BluetoothSender': '.sender'
+}
 
 __all__ = [
     'BluetoothProtocol',
@@ -13,4 +19,6 @@ __all__ = [
     'GestureData',
     'BluetoothReceiver',
     'BluetoothSender'
-] 
\ No newline at end of file
+]
+
+__getattr__ = lazy_exports(__name__, _EXPORTS)
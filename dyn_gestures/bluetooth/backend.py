@@ -0,0 +1,23 @@
+"""
+pybluez 加载 - 首次使用蓝牙时才导入（导入较慢，界面启动和只用协议打包时不需要）
+"""
+
+_pybluez = None
+_pybluez_checked = False
+
+
+def load_pybluez():
+    """
+    导入 pybluez（只尝试一次）
+    Returns:
+        pybluez 模块，未安装时返回None
+    """
+    global _pybluez, _pybluez_checked
+    if not _pybluez_checked:
+        _pybluez_checked = True
+        try:
+            import bluetooth
+            _pybluez = bluetooth
+        except ImportError:
+            print("警告: pybluez库未安装，蓝牙功能不可用")
+    return _pybluez
@@ -2,6 +2,7 @@
 蓝牙管理器 - 集成蓝牙通信到手势检测系统
 """
 
+import time
 from typing import Optional, Dict, Any, List
 from PyQt6.QtCore import QObject, pyqtSignal
 
@@ -11,6 +12,7 @@ from gesture_manager import GestureManager
 from hand_utils import HandUtils
 from core.action_executor import ActionExecutor
 from core.gesture_bindings import GestureBindings
+from session import SessionRecorder
 import config
 
 
@@ -29,6 +31,9 @@ class BluetoothManager(QObject):
         self.gesture_manager = None
         self.action_executor = None
         self.gesture_bindings = None
+        self.recorder = None
+        self.hand_data_count = 0  # 上次汇总日志以来收到的手部数据包数
+        self.last_hand_data_log = time.time()
         self.enabled = config.BLUETOOTH_CONFIG['enabled']
         self.auto_gesture_detection = config.BLUETOOTH_CONFIG['auto_gesture_detection']
         
@@ -68,6 +73,8 @@ class BluetoothManager(QObject):
         success = self.receiver.start_server()
         if success:
             self.log_message.emit("蓝牙服务器启动成功")
+            if config.RECORDING_CONFIG['enabled'] and not self.recorder:
+                self.recorder = SessionRecorder.create_default("bluetooth")
         else:
             self.log_message.emit("蓝牙服务器启动失败")
         
@@ -78,30 +85,61 @@ class BluetoothManager(QObject):
         if self.receiver:
             self.receiver.stop_server()
             self.log_message.emit("蓝牙服务器已停止")
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
     
     def on_hand_data_received(self, hand_data: HandData):
         """处理接收到的手部数据"""
         try:
             self.bluetooth_hand_data_received.emit(hand_data)
-            self.log_message.emit(f"接收到手部数据: {hand_data.hand_type}手 (置信度: {hand_data.confidence:.2f})")
+            self._log_hand_data(hand_data)
             
             # 如果启用自动手势检测，使用本地手势管理器处理
+            detected_gestures = []
             if self.auto_gesture_detection and self.gesture_manager:
                 # 转换手部数据为int格式的landmarks
                 int_landmarks = [[int(p[0]), int(p[1]), int(p[2])] for p in hand_data.landmarks]
                 
-                # 检测手势
-                detected_gestures = self.gesture_manager.detect_gestures(
+                # 检测手势并转换为手势事件
+                detected_gestures, events = self.gesture_manager.detect_events(
                     int_landmarks, hand_data.hand_id, hand_data.hand_type
                 )
                 
-                # 处理检测到的手势
-                for gesture in detected_gestures:
-                    self._execute_gesture_action(gesture)
+                # 按手势事件执行动作（started 执行一次，held 按绑定的 repeat 设置重复）
+                for event in events:
+                    self._execute_gesture_action({'gesture': event.gesture}, event)
+            
+            # 录制接收到的关键点
+            if self.recorder:
+                self.recorder.record_frame(hand_data.timestamp, [{
+                    'hand_id': hand_data.hand_id, 'hand_type': hand_data.hand_type,
+                    'landmarks': hand_data.landmarks,
+                    'gestures': [gesture['gesture'] for gesture in detected_gestures]
+                }])
         
         except Exception as e:
             self.log_message.emit(f"处理手部数据失败: {e}")
     
+    def _log_hand_data(self, hand_data: HandData):
+        """按 hand_data_log_interval 汇总记录收到的手部数据（数据包按流速率到达，不逐包记录）"""
+        interval = config.LOG_VIEW_CONFIG['hand_data_log_interval']
+        if interval <= 0:
+            return
+        
+        self.hand_data_count += 1
+        now = time.time()
+        elapsed = now - self.last_hand_data_log
+        if elapsed < interval:
+            return
+        
+        self.log_message.emit(
+            f"接收到手部数据: {self.hand_data_count} 包 ({self.hand_data_count / elapsed:.1f}/s)，"
+            f"最近: {hand_data.hand_type}手 (置信度: {hand_data.confidence:.2f})"
+        )
+        self.hand_data_count = 0
+        self.last_hand_data_log = now
+    
     def on_gesture_detected(self, gesture_data: GestureData):
         """处理接收到的手势数据"""
         try:
@@ -129,8 +167,13 @@ class BluetoothManager(QObject):
         except Exception as e:
             self.log_message.emit(f"处理手势数据失败: {e}")
     
-    def _execute_gesture_action(self, gesture_result: Dict[str, Any]):
-        """执行手势对应的动作"""
+    def _execute_gesture_action(self, gesture_result: Dict[str, Any], event=None):
+        """
+        执行手势对应的动作
+        Args:
+            gesture_result: 手势结果
+            event: 本地检测产生的 GestureEvent，None 表示远端发送的手势结果
+        """
         if not self.action_executor or not self.gesture_bindings:
             return
         
@@ -142,7 +185,10 @@ class BluetoothManager(QObject):
             return
         
         # 执行动作
-        result = self.action_executor.execute_action(gesture_name, binding)
+        if event is not None:
+            result = self.action_executor.execute_event(event, binding)
+        else:
+            result = self.action_executor.execute_action(gesture_name, binding)
         if result is True:
             action_desc = binding.get('description', binding.get('action', ''))
             self.log_message.emit(f"✅ 执行蓝牙手势动作: {action_desc}")
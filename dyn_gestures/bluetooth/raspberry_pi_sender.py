@@ -14,6 +14,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from bluetooth.sender import BluetoothSender, create_hand_data_from_landmarks, create_gesture_data_from_result
 from bluetooth.protocol import HandData, GestureData
 from gesture_manager import GestureManager
+from motion_gate import MotionGate
+from frame_buffers import FrameBufferPool
 from hand_utils import HandUtils
 
 # 导入CVZone手势检测
@@ -33,6 +35,8 @@ class RaspberryPiGestureSender:
         self.port = port
         self.sender = BluetoothSender(pc_bluetooth_address, port)
         self.gesture_manager = GestureManager()
+        self.motion_gate = MotionGate()
+        self.frame_buffers = FrameBufferPool()
         
         # 摄像头和检测器
         self.cap = None
@@ -98,16 +102,19 @@ class RaspberryPiGestureSender:
         
         while self.running:
             try:
-                success, img = self.cap.read()
+                success, img = self.frame_buffers.read(self.cap)
                 if not success:
                     print("无法读取摄像头画面")
                     break
                 
-                # 左右翻转画面
-                img = cv2.flip(img, 1)
-                
-                # 检测手部
-                hands, img = self.detector.findHands(img, draw=True)
+                # 检测手部，空闲且画面静止时跳过；画面不整帧翻转，只镜像关键点坐标
+                # （与先翻转再检测的结果相同），绘制时才翻转画面
+                hands = []
+                if self.motion_gate.should_infer(img):
+                    hands, img = self.detector.findHands(img, draw=True, flipType=False, mirror=True)
+                    self.motion_gate.update(bool(hands))
+                else:
+                    img = self.frame_buffers.flip(img, 1)
                 
                 if hands:
                     for i, hand in enumerate(hands):
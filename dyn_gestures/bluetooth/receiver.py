@@ -10,14 +10,8 @@ import json
 from typing import Optional, Callable, Dict, Any
 from PyQt6.QtCore import QObject, pyqtSignal
 
-try:
-    import bluetooth
-    BLUETOOTH_AVAILABLE = True
-except ImportError:
-    BLUETOOTH_AVAILABLE = False
-    print("警告: pybluez库未安装，蓝牙功能不可用")
-
 from .protocol import BluetoothProtocol, PacketType, HandData, GestureData
+from .backend import load_pybluez
 import config
 
 
@@ -51,14 +45,11 @@ class BluetoothReceiver(QObject):
         self.buffer_size = self.config['buffer_size']
         self.heartbeat_timeout = self.config['heartbeat_interval'] * 2
         
-        # 检查蓝牙可用性
-        if not BLUETOOTH_AVAILABLE:
-            self.error_occurred.emit("蓝牙功能不可用：请安装pybluez库")
-    
     def start_server(self) -> bool:
         """启动蓝牙服务器"""
-        if not BLUETOOTH_AVAILABLE:
-            self.error_occurred.emit("蓝牙功能不可用")
+        bluetooth = load_pybluez()
+        if bluetooth is None:
+            self.error_occurred.emit("蓝牙功能不可用：请安装pybluez库")
             return False
         
         try:
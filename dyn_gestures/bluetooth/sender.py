@@ -8,14 +8,8 @@ import socket
 from typing import Optional, List
 from collections import deque
 
-try:
-    import bluetooth
-    BLUETOOTH_AVAILABLE = True
-except ImportError:
-    BLUETOOTH_AVAILABLE = False
-    print("警告: pybluez库未安装，蓝牙功能不可用")
-
 from .protocol import BluetoothProtocol, PacketType, HandData, GestureData
+from .backend import load_pybluez
 
 
 class BluetoothSender:
@@ -33,15 +27,12 @@ class BluetoothSender:
         self.send_queue = deque(maxlen=100)
         self.send_thread = None
         self.heartbeat_thread = None
-        
-        # 检查蓝牙可用性
-        if not BLUETOOTH_AVAILABLE:
-            print("蓝牙功能不可用：请安装pybluez库")
     
     def connect(self) -> bool:
         """连接到PC端蓝牙服务器"""
-        if not BLUETOOTH_AVAILABLE:
-            print("蓝牙功能不可用")
+        bluetooth = load_pybluez()
+        if bluetooth is None:
+            print("蓝牙功能不可用：请安装pybluez库")
             return False
         
         try:
@@ -144,7 +135,8 @@ class BluetoothSender:
     
     def auto_discover_devices(self) -> List[str]:
         """自动发现附近的蓝牙设备"""
-        if not BLUETOOTH_AVAILABLE:
+        bluetooth = load_pybluez()
+        if bluetooth is None:
             return []
         
         try:
@@ -163,7 +155,8 @@ class BluetoothSender:
     
     def find_service_devices(self, service_uuid: str) -> List[str]:
         """查找提供特定服务的设备"""
-        if not BLUETOOTH_AVAILABLE:
+        bluetooth = load_pybluez()
+        if bluetooth is None:
             return []
         
         try:
@@ -8,33 +8,27 @@ import struct
 import platform
 from typing import List, Dict, Any, Optional, Tuple
 from .protocol import BluetoothProtocol, PacketType, HandData, GestureData
+from .backend import load_pybluez
 
-try:
-    import bluetooth
-    BLUETOOTH_AVAILABLE = True
-    
-    # 检查Windows兼容性
-    WINDOWS_COMPATIBILITY_ISSUE = platform.system() == "Windows"
-    
-    # 测试关键API是否可用
-    if WINDOWS_COMPATIBILITY_ISSUE:
-        try:
-            # 测试是否有这些方法
-            hasattr(bluetooth, 'discover_devices')
-            hasattr(bluetooth, 'read_local_bdaddr')
-            BLUETOOTH_DISCOVERY_AVAILABLE = True
-        except:
-            BLUETOOTH_DISCOVERY_AVAILABLE = False
-    else:
-        BLUETOOTH_DISCOVERY_AVAILABLE = True
-        
-except ImportError:
-    BLUETOOTH_AVAILABLE = False
-    BLUETOOTH_DISCOVERY_AVAILABLE = False
+
+def discovery_available(bluetooth) -> bool:
+    """
+    检查设备发现功能是否可用（Windows下pybluez的部分API可能缺失）
+    Args:
+        bluetooth: load_pybluez 返回的模块
+    """
+    if bluetooth is None:
+        return False
+    if platform.system() == "Windows":
+        return hasattr(bluetooth, 'discover_devices') and hasattr(bluetooth, 'read_local_bdaddr')
+    return True
 
 
 def check_bluetooth_compatibility() -> Dict[str, Any]:
     """检查蓝牙兼容性"""
+    bluetooth = load_pybluez()
+    BLUETOOTH_AVAILABLE = bluetooth is not None
+    BLUETOOTH_DISCOVERY_AVAILABLE = discovery_available(bluetooth)
     status = {
         'bluetooth_available': BLUETOOTH_AVAILABLE,
         'discovery_available': BLUETOOTH_DISCOVERY_AVAILABLE,
@@ -91,11 +85,12 @@ def scan_bluetooth_devices(duration: int = 8, lookup_names: bool = True) -> List
     Returns:
         设备列表 [(地址, 名称), ...]
     """
-    if not BLUETOOTH_AVAILABLE:
+    bluetooth = load_pybluez()
+    if bluetooth is None:
         print("蓝牙功能不可用，请安装pybluez")
         return []
     
-    if not BLUETOOTH_DISCOVERY_AVAILABLE:
+    if not discovery_available(bluetooth):
         print("⚠️ 设备发现功能在当前平台不可用")
         print("这是Windows下pybluez的已知兼容性问题")
         print("建议在Linux系统或树莓派上使用此功能")
@@ -127,11 +122,12 @@ def find_gesture_receiver_devices(service_uuid: str = "94f39d29-7d6d-437d-973b-f
     Returns:
         设备列表
     """
-    if not BLUETOOTH_AVAILABLE:
+    bluetooth = load_pybluez()
+    if bluetooth is None:
         print("蓝牙功能不可用，请安装pybluez")
         return []
     
-    if not BLUETOOTH_DISCOVERY_AVAILABLE:
+    if not discovery_available(bluetooth):
         print("⚠️ 服务发现功能在当前平台不可用")
         return []
     
@@ -391,7 +387,8 @@ def verify_bluetooth_connection(target_address: str, port: int = 1) -> bool:
     Returns:
         连接是否成功
     """
-    if not BLUETOOTH_AVAILABLE:
+    bluetooth = load_pybluez()
+    if bluetooth is None:
         print("蓝牙功能不可用")
         return False
     
@@ -0,0 +1,33 @@
+"""
+时钟 - 为检测器和手部跟踪器提供可注入的时间源
+
+实时运行时使用系统时钟 time.time；离线回放时使用 ManualClock，
+由回放引擎将时间设置为录制时的帧时间戳，使回放结果可重复、且不受回放速度影响。
+"""
+
+import time
+from typing import Callable
+
+
+# 时钟即返回当前时间（秒）的可调用对象
+Clock = Callable[[], float]
+
+system_clock: Clock = time.time
+
+
+class ManualClock:
+    """手动推进的时钟，用于离线回放"""
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def set(self, timestamp: float):
+        """设置当前时间"""
+        self.now = timestamp
+
+    def advance(self, seconds: float):
+        """将时间向前推进"""
+        self.now += seconds
@@ -17,6 +17,85 @@ HAND_DETECTION_CONFIG = {
     'min_tracking_confidence': 0.5      # 最小跟踪置信度
 }
 
+# 模型加载配置
+LANDMARKER_CONFIG = {
+    'delegate_cache_file': '.cache/landmarker_delegate.json',  # GPU/CPU delegate 探测结果缓存，空字符串表示不缓存
+    'warmup_frames': 3,                 # 启动时用合成图像预热的推理次数
+    'use_pool': False,                  # 是否使用预加载实例池（切换最大手数时免去重建等待）
+    'startup_metrics_file': 'logs/startup_metrics.jsonl'  # 启动耗时指标文件，空字符串表示不写文件
+}
+
+# 推理输入配置（感兴趣区域裁剪与自适应输入分辨率）
+HAND_ROI_CONFIG = {
+    'enabled': True,                    # 跟踪到手后只把手部周围区域送入推理
+    'padding': 0.6,                     # 裁剪区域在手部包围框外扩展的比例（相对于包围框长边）
+    'min_size': 160,                    # 裁剪区域的最小高度（像素）
+    'max_area_ratio': 0.6,              # 裁剪区域超过整帧该比例时直接使用整帧
+    'full_frame_interval': 15,          # 每隔N帧做一次整帧检测，发现新进入画面的手
+    'adaptive_scale': True,             # 根据推理耗时自动调整输入分辨率
+    'target_inference_ms': 25.0,        # 目标推理耗时（毫秒），超出后降低输入分辨率
+    'recover_ratio': 0.6,               # 平均耗时低于 目标*该比例 时提高输入分辨率
+    'min_scale': 0.5,                   # 最小输入缩放比例
+    'scale_step': 0.1,                  # 每次调整的缩放步长
+    'adjust_interval': 30,              # 每隔N次推理调整一次
+    'min_input_size': 160,              # 缩放后输入的短边不小于该值（像素）
+    'smoothing': 0.1                    # 推理耗时的指数平滑系数
+}
+
+# 运动门控配置（画面静止且没有手时跳过推理）
+MOTION_GATE_CONFIG = {
+    'enabled': True,                    # 是否启用
+    'idle_delay': 3.0,                  # 连续没有手超过该时间（秒）后进入空闲模式
+    'probe_rate': 3.0,                  # 空闲模式下画面静止时每秒推理次数
+    'thumbnail_size': (64, 36),         # 帧差缩略图尺寸 (宽, 高)
+    'pixel_threshold': 15,              # 缩略图像素灰度变化超过该值视为变化
+    'motion_ratio': 0.005               # 变化像素占缩略图的比例超过该值视为有运动
+}
+
+# 帧率调节器配置（按端到端延迟预算调整处理负载）
+GOVERNOR_CONFIG = {
+    'enabled': True,                    # 是否启用；启用后推理分辨率由调节器控制
+    'target_latency_ms': 60.0,          # 端到端延迟目标（毫秒）
+    'recover_ratio': 0.6,               # 低于 目标*该比例 时逐档恢复
+    'adjust_interval': 2.0,             # 两次调整之间的最短间隔（秒）
+    'min_frames': 30,                   # 开始调整前的最少帧数
+    'smoothing': 0.1,                   # 耗时的指数平滑系数
+    'backlog_threshold_ms': 2.0,        # 读取帧等待少于该值视为缓冲区有积压（仅对进程内读取的摄像头）
+    'fps_headroom': 0.9,                # 处理耗时超过 采集间隔*该比例 时降低采集帧率
+    'fps_levels': [30, 20, 15, 10],     # 采集帧率档位（从 CAMERA_FPS 开始逐档降低）
+    'scale_levels': [0.85, 0.7, 0.55],  # 推理输入缩放档位
+    'overlay_fps_levels': [30, 15, 5],  # 叠加层渲染帧率档位
+    'min_max_hands': 1,                 # 最大手数最低降到该值
+    'capture_buffer_size': 1,           # 摄像头缓冲帧数（减少积压的旧帧），0表示不设置
+    'history': 100,                     # 保留的最近决策数
+    'metrics_file': 'logs/governor_metrics.jsonl'  # 调节决策指标文件，空字符串表示不写文件
+}
+
+# 多摄像头配置（每个摄像头一个采集+推理进程，守护进程负责融合）
+MULTI_CAMERA_CONFIG = {
+    'sources': [],                      # 摄像头编号或视频路径列表，为空时只使用 CAMERA_INDEX
+    'max_hands': 2,                     # 每个摄像头的最大检测手数
+    'fusion_fps': 30,                   # 融合和手势检测的最高频率
+    'duplicate_threshold': 0.35,        # 不同摄像头的手型距离小于该值视为同一只手（相对于手掌基准长度）
+    'stale_timeout': 0.2,               # 超过该时间（秒）未更新的摄像头结果不参与融合
+    'poll_interval': 0.002,             # 没有新结果时的轮询间隔（秒）
+    'max_read_failures': 100,           # 连续读取失败多少次后停止该摄像头（视频文件结束或摄像头断开）
+    'stop_timeout': 3.0                 # 停止时等待 worker 进程退出的时间（秒）
+}
+
+# 采集进程配置（采集在独立进程中进行，图像经共享内存帧环传给推理进程）
+# 只有摄像头采集移到独立进程，推理和手势逻辑仍在主进程中执行（推理也需要独立进程时使用 MULTI_CAMERA_CONFIG）
+CAPTURE_PROCESS_CONFIG = {
+    'enabled': False,                   # 是否在独立进程中采集
+    'slots': 4,                         # 帧环槽位数（至少3个）
+    'max_frame_size': (1920, 1080),     # 帧环单帧最大尺寸 (宽, 高)
+    'open_timeout': 5.0,                # 等待采集进程打开摄像头的时间（秒）
+    'read_timeout': 1.0,                # 等待新帧的最长时间（秒）
+    'poll_interval': 0.001,             # 等待新帧时的轮询间隔（秒）
+    'max_read_failures': 100,           # 连续读取失败多少次后停止采集（视频文件结束）
+    'stop_timeout': 3.0                 # 停止时等待采集进程退出的时间（秒）
+}
+
 # 手势识别参数
 GESTURE_CONFIG = {
     # 握拳到张开手势
@@ -29,7 +108,8 @@ GESTURE_CONFIG = {
     # V字手势
     'peace_sign': {
         'distance_threshold_percent': 0.6,  # 手指伸展阈值（相对于手掌基准长度）
-        'required_frames': 15  # 需要连续检测的帧数
+        'required_frames': 15,  # 需要连续检测的帧数
+        'temporal': {'mode': 'consecutive'}     # 时间累积方式，见 TEMPORAL_DEFAULTS
     },
     
     # 竖大拇指
@@ -38,7 +118,8 @@ GESTURE_CONFIG = {
         'other_fingers_threshold': 0.45,        # 其他手指指尖距离掌心阈值（百分比）
         'thumb_angle_threshold': 45.0,          # 大拇指角度阈值（度）
         'thumb_isolation_threshold': 0.5,       # 大拇指与其他手指PIP最小距离阈值（百分比）
-        'required_frames': 15                   # 需要连续检测的帧数
+        'required_frames': 15,                  # 需要连续检测的帧数
+        'temporal': {'mode': 'consecutive'}     # 时间累积方式，见 TEMPORAL_DEFAULTS
     },
 
     # 倒竖大拇指
@@ -47,14 +128,16 @@ GESTURE_CONFIG = {
         'other_fingers_threshold': 0.45,        # 其他手指指尖距离掌心阈值（百分比）
         'thumb_angle_threshold': 45.0,          # 大拇指角度阈值（度）
         'thumb_isolation_threshold': 0.5,       # 大拇指与其他手指PIP最小距离阈值（百分比）
-        'required_frames': 15                   # 需要连续检测的帧数
+        'required_frames': 15,                  # 需要连续检测的帧数
+        'temporal': {'mode': 'consecutive'}     # 时间累积方式，见 TEMPORAL_DEFAULTS
     },
 
     # OK手势
     'ok_sign': {
         'circle_threshold': 0.15,               # 圆圈检测阈值（相对于手掌基准长度）
         'other_fingers_threshold': 0.6,         # 其他手指伸展阈值
-        'required_frames': 15                   # 需要连续检测的帧数
+        'required_frames': 15,                  # 需要连续检测的帧数
+        'temporal': {'mode': 'consecutive'}     # 时间累积方式，见 TEMPORAL_DEFAULTS
     },
 
     # 滑动手势
@@ -64,9 +147,67 @@ GESTURE_CONFIG = {
         'min_swipe_speed': 0.1,                 # 最小滑动速度
         'required_frames': 5,                   # 需要连续检测的帧数
         'palm_angle_threshold': 45.0            # 手掌角度变化阈值（度）
+    },
+
+    # 学习型静态手势分类器（模型文件不存在时不启用）
+    'pose_classifier': {
+        'model_file': 'pose_classifier.npz',    # 模型文件，由 python -m session.train_pose_classifier 生成
+        'replace_rules': True,                  # 模型覆盖的手势不再运行对应的规则检测器
+        'min_confidence': 60.0,                 # 最低分类置信度（0-100）
+        'required_frames': 15,                  # 需要连续检测的帧数
+        'temporal': {'mode': 'consecutive'}     # 时间累积方式，见 TEMPORAL_DEFAULTS
+    },
+
+    # 轨迹模板手势（DTW匹配用户录制的模板，模板文件不存在时不启用）
+    'trajectory': {
+        'template_file': 'trajectory_templates.npz',  # 模板文件，由 python -m session.trajectory_templates 生成
+        'window_lengths': [20, 30, 45],         # 参与匹配的窗口长度（帧），适应不同速度的动作
+        'match_threshold': 0.35,                # 最大匹配距离（每步均方根距离，相对于手掌基准长度）
+        'min_motion': 1.0,                      # 窗口内最小运动量（相对于手掌基准长度）
+        'stride': 2                             # 每隔多少帧匹配一次
     }
 }
 
+# 静态手势时间累积默认参数（各手势可在 GESTURE_CONFIG 的 'temporal' 中覆盖）
+TEMPORAL_DEFAULTS = {
+    'mode': 'consecutive',              # consecutive：连续 required_frames 帧满足才触发，一帧不满足即从头计数
+                                        # decay：指数衰减打分，超过进入阈值触发、低于退出阈值停止
+                                        # k_of_n：最近 window 帧中至少 k 帧满足即触发
+    'decay': 0.8,                       # decay 模式的衰减系数（每帧保留的比例）
+    'enter_threshold': 0.7,             # decay 模式的进入阈值（连续满足约6帧达到）
+    'exit_threshold': 0.3,              # decay 模式的退出阈值
+    'k': 6,                             # k_of_n 模式的最少满足帧数
+    'window': 8                         # k_of_n 模式的窗口帧数
+}
+
+# 手势事件配置（started / held / released）
+GESTURE_EVENT_CONFIG = {
+    'hold_delay': 0.6,                  # 手势保持多久后开始发出 held 事件（秒）
+    'repeat_interval': 0.3,             # held 事件的重复间隔（秒）
+    'release_timeout': 0.25             # 超过该时间没有检测到手势即视为松开（秒）
+}
+
+# 关键点平滑配置（One-Euro滤波，位于手部检测和手势检测之间）
+SMOOTHING_CONFIG = {
+    'enabled': False,                   # 是否启用；启用后可适当降低静态手势的 required_frames
+    'min_cutoff': 1.5,                  # 最小截止频率（Hz），越小静止时越平滑
+    'beta': 0.01,                       # 速度系数（像素/秒），越大快速运动时延迟越小
+    'd_cutoff': 1.0                     # 速度估计的截止频率（Hz）
+}
+
+# 检测器保护配置（耗时统计与熔断）
+DETECTOR_GUARD_CONFIG = {
+    'enabled': True,                    # 是否启用检测器保护
+    'min_calls': 30,                    # 开始判断前的最少调用次数
+    'smoothing': 0.1,                   # 耗时/错误率的指数平滑系数
+    'time_budget_ms': 5.0,              # 单次调用平均耗时预算（毫秒），超出后降频
+    'sample_interval': 4,               # 降频后每N帧调用一次
+    'recover_ratio': 0.5,               # 平均耗时低于 预算*该比例 时恢复全频
+    'max_error_rate': 0.2,              # 错误率上限，超出后禁用检测器
+    'disable_duration': 30.0,           # 禁用时长（秒），到期后重新启用
+    'error_log_interval': 5.0           # 同一检测器错误日志的最小间隔（秒）
+}
+
 # 手势类型定义
 GESTURE_TYPES = {
     'static_gestures': ['PeaceSign', 'ThumbsUp', 'ThumbsDown', 'OKSign'],  # 静态手势列表
@@ -80,10 +221,64 @@ DISPLAY_CONFIG = {
     'show_palm_center': True,
     'show_landmarks': True,
     'flip_image': True,                 # cvzone的flipType参数
+    'mirror_landmarks': True,           # flip_image 启用时不翻转整帧，只镜像关键点坐标（只在渲染画面时翻转）
     'show_camera_window': True,         # 是否显示摄像头识别画面
     'gesture_message_duration': 15,     # 帧数
     'show_fps': True,                   # 显示FPS
-    'fps_update_interval': 10           # FPS更新间隔（帧数）
+    'fps_update_interval': 10,          # FPS更新间隔（帧数）
+    'overlay_max_fps': 30,              # 叠加层最大渲染帧率，与检测帧率无关（0表示不限制）
+    'preview_fps': 15                   # Qt界面预览帧率，与检测帧率无关（0表示不限制）
+}
+
+# 无界面守护进程配置
+DAEMON_CONFIG = {
+    'socket_path': '/tmp/gestureye.sock',   # 状态查询Unix套接字路径
+    'execute_actions': True,                # 是否执行手势绑定的动作
+    'status_print_interval': 60.0           # 终端打印运行状态的间隔（秒），0表示不打印
+}
+
+# 会话录制配置
+RECORDING_CONFIG = {
+    'enabled': False,                   # 是否录制手部关键点会话（用于事故排查和离线回放）
+    'output_dir': 'recordings',         # 录制文件目录
+    'chunk_records': 512                # 每个写盘块的记录数
+}
+
+# 界面日志配置
+LOG_VIEW_CONFIG = {
+    'capacity': 1000,                   # 日志区保留的最大行数（超出后丢弃最旧的行）
+    'duplicate_window': 2.0,            # 相同消息在该时间内重复出现时只记录次数（秒）
+    'hand_data_log_interval': 5.0       # 蓝牙手部数据的汇总日志间隔（秒），0表示不记录
+}
+
+# 离线评估配置
+EVALUATION_CONFIG = {
+    'match_tolerance': 0.5,             # 检测结果在标注区间结束后仍算命中的容差（秒）
+    'max_workers': 0                    # 并行评估的进程数，0表示使用全部CPU核心
+}
+
+# 阈值搜索配置
+THRESHOLD_SEARCH_CONFIG = {
+    'method': 'random',                 # 搜索方式：grid（网格）/ random（随机）
+    'samples': 50,                      # 随机搜索的候选数
+    'grid_steps': 4,                    # 网格搜索时连续参数的取值个数
+    'max_grid_candidates': 5000,        # 网格候选数上限，超出时拒绝运行（取值个数的参数个数次方增长）
+    'chunk_size': 256,                  # 每批提交评估的候选数（候选按需生成，不一次性展开）
+    'min_recall': 0.9,                  # 进入帕累托前沿的最低召回率
+    'seed': 0,                          # 随机种子
+    # 搜索空间："手势配置名.参数名" -> 取值列表，或 {'min', 'max', 'type': 'int'/'float'}
+    'space': {
+        'peace_sign.required_frames': {'min': 3, 'max': 15, 'type': 'int'},
+        'peace_sign.distance_threshold_percent': {'min': 0.4, 'max': 0.8, 'type': 'float'},
+        'thumbs_up.required_frames': {'min': 3, 'max': 15, 'type': 'int'},
+        'thumbs_up.thumb_angle_threshold': {'min': 30.0, 'max': 60.0, 'type': 'float'},
+        'thumbs_down.required_frames': {'min': 3, 'max': 15, 'type': 'int'},
+        'thumbs_down.thumb_angle_threshold': {'min': 30.0, 'max': 60.0, 'type': 'float'},
+        'ok_sign.required_frames': {'min': 3, 'max': 15, 'type': 'int'},
+        'ok_sign.circle_threshold': {'min': 0.1, 'max': 0.25, 'type': 'float'},
+        'swipe.min_swipe_speed': {'min': 0.05, 'max': 0.3, 'type': 'float'},
+        'swipe.required_frames': {'min': 3, 'max': 8, 'type': 'int'}
+    }
 }
 
 # 颜色配置 (BGR格式)
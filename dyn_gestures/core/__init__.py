@@ -1,11 +1,19 @@
 """
 核心模块 - 包含手势检测和动作执行的核心功能
+
+子模块按需导入：动作执行依赖 pynput 和 pywin32，导入较慢。
 """
 
-from .gesture_bindings import GestureBindings
-from .action_executor import ActionExecutor
+from lazy_exports import lazy_exports
+
+_EXPORTS = {
+    'GestureBindings': '.gesture_bindings',
+    'ActionExecutor': '.action_executor'
+}
 
 __all__ = [
     'GestureBindings',
     'ActionExecutor'
-] 
\ No newline at end of file
+]
+
+__getattr__ = lazy_exports(__name__, _EXPORTS)
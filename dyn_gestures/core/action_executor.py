@@ -19,9 +19,14 @@ class ActionExecutor:
         self.last_execution_time = {}  # 防止重复执行
         self.execution_cooldown = 1.0  # 执行冷却时间（秒）
         
-    def execute_action(self, gesture: str, binding: Dict[str, Any]) -> Optional[bool]:
+    def execute_action(self, gesture: str, binding: Dict[str, Any],
+                       ignore_cooldown: bool = False) -> Optional[bool]:
         """
         执行手势对应的动作
+        Args:
+            gesture: 手势名称
+            binding: 手势绑定配置
+            ignore_cooldown: 是否忽略冷却时间（按住重复执行时使用）
         Returns:
             True: 执行成功
             False: 执行失败
@@ -32,7 +37,7 @@ class ActionExecutor:
             
         # 检查冷却时间
         current_time = time.time()
-        if gesture in self.last_execution_time:
+        if not ignore_cooldown and gesture in self.last_execution_time:
             if current_time - self.last_execution_time[gesture] < self.execution_cooldown:
                 # 在冷却时间内，返回None表示跳过执行
                 return None
@@ -63,6 +68,21 @@ class ActionExecutor:
             print(f"执行动作失败: {gesture} -> {action}, 错误: {e}")
             return False
     
+    def execute_event(self, event, binding: Dict[str, Any]) -> Optional[bool]:
+        """
+        根据手势事件执行动作：started 时执行一次，held 时仅在绑定开启 repeat 后重复执行
+        Args:
+            event: GestureEvent 手势事件
+            binding: 手势绑定配置
+        Returns:
+            同 execute_action，不需要执行时返回 None
+        """
+        if event.type == "started":
+            return self.execute_action(event.gesture, binding)
+        if event.type == "held" and binding.get("repeat", False):
+            return self.execute_action(event.gesture, binding, ignore_cooldown=True)
+        return None
+    
     def _execute_keyboard_shortcut(self, shortcut: str) -> bool:
         """执行键盘快捷键"""
         try:
@@ -39,13 +39,15 @@ class GestureBindings:
                 "action_type": ActionType.SYSTEM_FUNCTION.value,
                 "action": "volume_up",
                 "description": "音量增加",
-                "enabled": True
+                "enabled": True,
+                "repeat": True
             },
             "thumbs_down": {
                 "action_type": ActionType.SYSTEM_FUNCTION.value,
                 "action": "volume_down",
                 "description": "音量减少",
-                "enabled": True
+                "enabled": True,
+                "repeat": True
             },
             "peace": {
                 "action_type": ActionType.SYSTEM_FUNCTION.value,
@@ -130,13 +132,14 @@ class GestureBindings:
         return self.bindings.get(gesture, {})
     
     def set_binding(self, gesture: str, action_type: str, action: str, 
-                   description: str = "", enabled: bool = True):
-        """设置手势绑定"""
+                   description: str = "", enabled: bool = True, repeat: bool = False):
+        """设置手势绑定（repeat 表示按住手势时重复执行）"""
         self.bindings[gesture] = {
             "action_type": action_type,
             "action": action,
             "description": description,
-            "enabled": enabled
+            "enabled": enabled,
+            "repeat": repeat
         }
         self.save_bindings()
     
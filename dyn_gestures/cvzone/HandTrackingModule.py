@@ -1,4 +1,8 @@
+import json
 import math
+import os
+import platform
+import threading
 import time
 import cv2
 import mediapipe as mp
@@ -7,7 +11,209 @@ import numpy as np
 # 导入新的 Task API 模块
 from mediapipe.tasks import python
 from mediapipe.tasks.python import vision
-from mediapipe.framework.formats import landmark_pb2
+
+from hand_utils import HandUtils
+from frame_buffers import FrameBufferPool
+import config
+
+MODEL_PATH = 'cvzone/hand_landmarker.task'
+
+
+def _delegate_cache_key():
+    """同一台机器、同一 mediapipe 版本上 GPU delegate 是否可用的结果不会变化"""
+    return f"{platform.node()}|{platform.system()}|{platform.machine()}|mediapipe {getattr(mp, '__version__', '')}"
+
+
+def load_cached_delegate():
+    """
+    读取缓存的 delegate 探测结果。
+    :return: 'GPU' / 'CPU'，没有缓存或缓存不属于本机时返回 None。
+    """
+    path = config.LANDMARKER_CONFIG['delegate_cache_file']
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data.get('delegate') if data.get('key') == _delegate_cache_key() else None
+
+
+def save_cached_delegate(delegate_name, reason=''):
+    """保存 delegate 探测结果，下次启动时跳过已知会失败的 GPU 初始化"""
+    path = config.LANDMARKER_CONFIG['delegate_cache_file']
+    if not path:
+        return
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'key': _delegate_cache_key(), 'delegate': delegate_name, 'reason': reason,
+                       'time': time.time()}, f, ensure_ascii=False)
+    except OSError as e:
+        print(f"⚠ 保存 delegate 缓存失败: {e}")
+
+
+def create_landmarker(maxHands, detectionCon, minTrackCon, delegate):
+    """按参数创建视频模式的 HandLandmarker"""
+    base_options = python.BaseOptions(
+        model_asset_path=MODEL_PATH,
+        delegate=delegate
+    )
+    options = vision.HandLandmarkerOptions(
+        base_options=base_options,
+        running_mode=vision.RunningMode.VIDEO,
+        num_hands=maxHands,
+        min_hand_detection_confidence=detectionCon,
+        min_tracking_confidence=minTrackCon
+    )
+    return vision.HandLandmarker.create_from_options(options)
+
+
+def create_landmarker_with_fallback(maxHands, detectionCon, minTrackCon):
+    """
+    优先使用 GPU delegate，失败时回退到 CPU。探测结果缓存到磁盘，
+    已知 GPU 不可用的机器直接创建 CPU 实例，不再每次启动都先等待 GPU 初始化失败。
+    :return: (HandLandmarker, 是否使用 GPU, 是否使用了缓存的探测结果)
+    """
+    cached = load_cached_delegate()
+    gpu_error = None
+    if cached != 'CPU':
+        try:
+            landmarker = create_landmarker(maxHands, detectionCon, minTrackCon, python.BaseOptions.Delegate.GPU)
+            print("✓ GPU delegate 初始化成功")
+            if cached != 'GPU':
+                save_cached_delegate('GPU')
+            return landmarker, True, cached == 'GPU'
+        except Exception as e:
+            gpu_error = e
+            print(f"⚠ GPU delegate 初始化失败: {gpu_error}")
+            print("正在尝试使用 CPU delegate...")
+    else:
+        print("本机 GPU delegate 不可用（已缓存探测结果），直接使用 CPU delegate")
+
+    try:
+        landmarker = create_landmarker(maxHands, detectionCon, minTrackCon, python.BaseOptions.Delegate.CPU)
+    except Exception as cpu_error:
+        print(f"✗ CPU delegate 也初始化失败: {cpu_error}")
+        raise RuntimeError(f"无法初始化 HandLandmarker，GPU 错误: {gpu_error}, CPU 错误: {cpu_error}")
+    print("✓ CPU delegate 初始化成功")
+    if gpu_error is not None:
+        save_cached_delegate('CPU', str(gpu_error))
+    return landmarker, False, cached == 'CPU'
+
+
+def warm_up_landmarker(landmarker, frames, size=None, first_timestamp_ms=0):
+    """
+    用合成图像推理几次，把模型加载、内存分配和 GPU 着色器编译提前到启动阶段，
+    避免用户第一次举手时才付出这部分延迟。
+    :param frames: 推理次数。
+    :param size: 合成图像尺寸 (宽, 高)，默认使用摄像头分辨率。
+    :param first_timestamp_ms: 第一帧使用的视频时间戳。
+    :return: 最后使用的视频时间戳（毫秒），之后的推理时间戳必须大于它。
+    """
+    width, height = size or (config.CAMERA_FRAME_WIDTH, config.CAMERA_FRAME_HEIGHT)
+    rng = np.random.default_rng(0)
+    data = rng.integers(96, 160, (height, width, 3), dtype=np.uint8)
+    mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=data)
+    timestamp_ms = first_timestamp_ms - 1
+    for i in range(frames):
+        timestamp_ms = first_timestamp_ms + i
+        landmarker.detect_for_video(mp_image, timestamp_ms)
+    return timestamp_ms
+
+
+class LandmarkerPool:
+    """
+    预先创建并预热的 HandLandmarker 池。
+    同一进程中的多个检测器（如多路摄像头）可以在后台提前加载模型；检测器切换最大手数时直接取用预加载的实例，
+    不必在主循环里等待重建。取出的实例不再放回（视频模式的时间戳和跟踪状态不能在检测器之间共享），池会在后台补充。
+    """
+
+    def __init__(self, detectionCon=0.5, minTrackCon=0.5, preload=None, warmup_frames=None):
+        """
+        :param detectionCon: 最低检测置信度。
+        :param minTrackCon: 最低跟踪置信度。
+        :param preload: {最大手数: 预加载个数}，在后台立即开始加载。
+        :param warmup_frames: 每个实例的预热帧数，默认使用 config.LANDMARKER_CONFIG['warmup_frames']。
+        """
+        self.detectionCon = detectionCon
+        self.minTrackCon = minTrackCon
+        self.warmup_frames = (config.LANDMARKER_CONFIG['warmup_frames']
+                              if warmup_frames is None else warmup_frames)
+        self.using_gpu = False
+        self.delegate_cached = False
+        self._ready = {}      # 最大手数 -> [(实例, 最后时间戳)]
+        self._targets = {}    # 最大手数 -> 保持的预加载个数
+        self._loading = {}    # 最大手数 -> 正在加载的个数
+        self._condition = threading.Condition()
+        self._closed = False
+        for maxHands, count in (preload or {}).items():
+            self.preload(maxHands, count)
+
+    def preload(self, maxHands, count=1):
+        """在后台预加载实例，并在被取用后补充到 count 个"""
+        with self._condition:
+            self._targets[maxHands] = max(self._targets.get(maxHands, 0), count)
+        self._refill(maxHands)
+
+    def _refill(self, maxHands):
+        with self._condition:
+            if self._closed:
+                return
+            missing = (self._targets.get(maxHands, 0) - len(self._ready.get(maxHands, []))
+                       - self._loading.get(maxHands, 0))
+            if missing <= 0:
+                return
+            self._loading[maxHands] = self._loading.get(maxHands, 0) + missing
+        for _ in range(missing):
+            threading.Thread(target=self._load, args=(maxHands,), name="LandmarkerPreload", daemon=True).start()
+
+    def _load(self, maxHands):
+        try:
+            entry = self._create(maxHands)
+        except Exception as e:
+            print(f"⚠ 预加载 HandLandmarker 失败: {e}")
+            entry = None
+        with self._condition:
+            self._loading[maxHands] -= 1
+            if entry is not None:
+                if self._closed:
+                    entry[0].close()
+                else:
+                    self._ready.setdefault(maxHands, []).append(entry)
+            self._condition.notify_all()
+
+    def _create(self, maxHands):
+        landmarker, self.using_gpu, self.delegate_cached = create_landmarker_with_fallback(
+            maxHands, self.detectionCon, self.minTrackCon)
+        return landmarker, warm_up_landmarker(landmarker, self.warmup_frames)
+
+    def acquire(self, maxHands):
+        """
+        取一个已预热的实例；正在后台加载时等待加载完成，没有预加载时立即创建。
+        :return: (HandLandmarker, 最后使用的视频时间戳)
+        """
+        with self._condition:
+            while not self._ready.get(maxHands) and self._loading.get(maxHands, 0) > 0:
+                self._condition.wait()
+            entry = self._ready[maxHands].pop() if self._ready.get(maxHands) else None
+        if entry is None:
+            entry = self._create(maxHands)
+        self._refill(maxHands)
+        return entry
+
+    def close(self):
+        """关闭池中尚未取用的实例"""
+        with self._condition:
+            self._closed = True
+            entries = [entry for ready in self._ready.values() for entry in ready]
+            self._ready = {}
+        for landmarker, _ in entries:
+            landmarker.close()
+
 
 class HandDetector:
     """
@@ -15,7 +221,8 @@ class HandDetector:
     支持 GPU Delegate 设置。
     """
 
-    def __init__(self, staticMode=False, maxHands=2, modelComplexity=1, detectionCon=0.5, minTrackCon=0.5):
+    def __init__(self, staticMode=False, maxHands=2, modelComplexity=1, detectionCon=0.5, minTrackCon=0.5,
+                 clock=None, roi_config=None, pool=None):
         """
         :param staticMode: 对于视频流，推荐为 False。这会影响 running_mode。
         :param maxHands: 要检测的最大手数。
@@ -23,76 +230,131 @@ class HandDetector:
                                 这里我们使用一个标准模型，这个参数不再直接使用。
         :param detectionCon: 最低检测置信度。
         :param minTrackCon: 最低跟踪置信度。
+        :param clock: 生成视频模式时间戳的时间源（返回秒），默认使用 time.time；
+                      处理录像文件时可传入按帧推进的时钟。
+        :param roi_config: 感兴趣区域裁剪与自适应输入分辨率配置，默认使用 config.HAND_ROI_CONFIG。
+        :param pool: LandmarkerPool，从池中取已预热的实例；None 时按 config.LANDMARKER_CONFIG['use_pool'] 决定是否自建。
         """
         self.maxHands = maxHands
+        self.clock = clock or time.time
+        self.last_timestamp_ms = -1
         self.detectionCon = detectionCon
         self.minTrackCon = minTrackCon
 
-        # 1. 尝试使用 GPU delegate，失败时回退到 CPU
+        # 优先使用 GPU delegate，失败时回退到 CPU（探测结果缓存到磁盘）
         self.using_gpu = False
         self.detector = None
-        
-        # 首先尝试 GPU delegate
-        try:
-            base_options = python.BaseOptions(
-                model_asset_path='cvzone/hand_landmarker.task',
-                delegate=python.BaseOptions.Delegate.GPU
-            )
-            
-            # 2. 根据是处理静态图片还是视频流，设置不同的 running_mode
-            running_mode = vision.RunningMode.VIDEO
-            
-            # 3. 创建 HandLandmarkerOptions
-            options = vision.HandLandmarkerOptions(
-                base_options=base_options,
-                running_mode=running_mode,
-                num_hands=self.maxHands,
-                min_hand_detection_confidence=self.detectionCon,
-                min_tracking_confidence=self.minTrackCon
-            )
-            
-            # 4. 创建检测器实例
-            self.detector = vision.HandLandmarker.create_from_options(options)
-            self.using_gpu = True
-            print("✓ GPU delegate 初始化成功")
-            
-        except Exception as gpu_error:
-            print(f"⚠ GPU delegate 初始化失败: {gpu_error}")
-            print("正在尝试使用 CPU delegate...")
-            
-            try:
-                # 回退到 CPU delegate
-                base_options = python.BaseOptions(
-                    model_asset_path='cvzone/hand_landmarker.task',
-                    delegate=python.BaseOptions.Delegate.CPU
-                )
-                
-                running_mode = vision.RunningMode.VIDEO
-                
-                options = vision.HandLandmarkerOptions(
-                    base_options=base_options,
-                    running_mode=running_mode,
-                    num_hands=self.maxHands,
-                    min_hand_detection_confidence=self.detectionCon,
-                    min_tracking_confidence=self.minTrackCon
-                )
-                
-                self.detector = vision.HandLandmarker.create_from_options(options)
-                self.using_gpu = False
-                print("✓ CPU delegate 初始化成功")
-                
-            except Exception as cpu_error:
-                print(f"✗ CPU delegate 也初始化失败: {cpu_error}")
-                raise RuntimeError(f"无法初始化 HandLandmarker，GPU 错误: {gpu_error}, CPU 错误: {cpu_error}")
+        if pool is None and config.LANDMARKER_CONFIG['use_pool']:
+            pool = LandmarkerPool(detectionCon, minTrackCon)
+        self.pool = pool
+
+        start = time.perf_counter()
+        if pool is not None:
+            # 池中的实例已经预热过
+            self.detector, self.last_timestamp_ms = pool.acquire(maxHands)
+            self.using_gpu = pool.using_gpu
+            delegate_cached = pool.delegate_cached
+        else:
+            self.detector, self.using_gpu, delegate_cached = create_landmarker_with_fallback(
+                maxHands, detectionCon, minTrackCon)
+        self.startup_stats = {
+            'delegate': 'GPU' if self.using_gpu else 'CPU',
+            'delegate_cached': delegate_cached,
+            'pooled': pool is not None,
+            'create_ms': round((time.perf_counter() - start) * 1000, 1),
+            'warmup_ms': None
+        }
+        self.warmed_up = pool is not None
 
         self.tipIds = [4, 8, 12, 16, 20]
         self.results = None # 用于存储最新的检测结果
 
-    def findHands(self, img, draw=True, flipType=True):
+        # 感兴趣区域裁剪与自适应输入分辨率
+        self.roi_config = {**config.HAND_ROI_CONFIG, **(roi_config or {})}
+        self.adaptive_scale = self.roi_config['adaptive_scale']
+        self.input_scale = 1.0
+        self.inference_ms = None
+        self._tracked_boxes = []          # 上一帧各手部的包围框（整帧坐标）
+        self._frames_since_full = 0
+        self._scale_counter = 0
+        self.input_stats = {'full_frames': 0, 'roi_frames': 0, 'redetections': 0}
+
+        # 缩放和颜色转换写入复用的缓冲区，稳定运行时不再每帧分配图像
+        self.buffers = FrameBufferPool()
+
+    def _create_landmarker(self, delegate):
+        """按当前参数创建视频模式的 HandLandmarker"""
+        return create_landmarker(self.maxHands, self.detectionCon, self.minTrackCon, delegate)
+
+    def warm_up(self, frames=None, size=None):
+        """
+        启动时用合成图像预热模型，第一次真实推理不再承担模型初始化延迟。
+        :param frames: 预热帧数，默认使用 config.LANDMARKER_CONFIG['warmup_frames']。
+        :param size: 合成图像尺寸 (宽, 高)，默认使用摄像头分辨率。
+        :return: 预热耗时（毫秒），已预热过时返回 0。
+        """
+        if frames is None:
+            frames = config.LANDMARKER_CONFIG['warmup_frames']
+        if self.detector is None or self.warmed_up or frames <= 0:
+            return 0.0
+        start = time.perf_counter()
+        try:
+            self.last_timestamp_ms = warm_up_landmarker(self.detector, frames, size, self.last_timestamp_ms + 1)
+        except Exception as e:
+            print(f"⚠ 模型预热失败: {e}")
+            return 0.0
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.warmed_up = True
+        self.startup_stats['warmup_ms'] = round(elapsed_ms, 1)
+        print(f"✓ 模型预热完成: {frames} 帧, {elapsed_ms:.0f}ms")
+        return elapsed_ms
+
+    def set_max_hands(self, maxHands):
+        """
+        修改最大检测手数（需要重建 HandLandmarker，耗时较长，不宜频繁调用）。
+        :return: 是否修改成功，失败时保留原检测器。
+        """
+        if maxHands == self.maxHands or self.detector is None:
+            return True
+        previous = self.maxHands
+        self.maxHands = maxHands
+        delegate = python.BaseOptions.Delegate.GPU if self.using_gpu else python.BaseOptions.Delegate.CPU
+        try:
+            if self.pool is not None:
+                detector, last_timestamp_ms = self.pool.acquire(maxHands)
+                self.last_timestamp_ms = max(self.last_timestamp_ms, last_timestamp_ms)
+            else:
+                detector = self._create_landmarker(delegate)
+        except Exception as e:
+            print(f"⚠ 重建 HandLandmarker 失败: {e}")
+            self.maxHands = previous
+            return False
+        self.detector.close()
+        self.detector = detector
+        self._tracked_boxes = []
+        return True
+
+    def set_input_scale(self, scale):
+        """
+        由外部（如帧率调节器）接管输入缩放比例，接管期间暂停内部按推理耗时的自动调整
+        :param scale: 输入缩放比例，None 表示交还给内部调整（未启用自动调整时恢复原始分辨率）
+        """
+        if scale is None:
+            self.roi_config['adaptive_scale'] = self.adaptive_scale
+            if not self.adaptive_scale:
+                self.input_scale = 1.0
+            return
+        self.roi_config['adaptive_scale'] = False
+        self.input_scale = min(1.0, max(0.1, scale))
+
+    def findHands(self, img, draw=True, flipType=True, mirror=False):
         """
         在 BGR 图像中找到手部。
         :param img: 要查找手的图像。
         :param draw: 是否在图像上绘制结果的标志。
+        :param flipType: 是否交换左右手标签。
+        :param mirror: 在未翻转的图像上推理，只把关键点的 x 坐标镜像（结果与先 cv2.flip 再推理相同，
+                       省去整帧翻转）；此时 draw 会先把图像翻转到复用缓冲区再绘制。
         :return: 包含所有手部信息的列表，以及绘制了结果的图像。
         """
         # 检查检测器是否已成功初始化
@@ -100,33 +362,85 @@ class HandDetector:
             print("⚠ 检测器未初始化，返回空结果")
             return [], img
             
-        imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
         h, w, c = img.shape
+        mirror_width = w if mirror else None
+        x0, y0, x1, y1 = self._select_region(w, h)
+        if (x1 - x0, y1 - y0) == (w, h):
+            allHands = self._detect_region(img, 0, 0, w, flipType, mirror_width)
+            self.input_stats['full_frames'] += 1
+            self._frames_since_full = 0
+        else:
+            allHands = self._detect_region(img[y0:y1, x0:x1], x0, y0, w, flipType, mirror_width)
+            self.input_stats['roi_frames'] += 1
+            self._frames_since_full += 1
+            if allHands is not None and len(allHands) < len(self._tracked_boxes):
+                # 有手离开了裁剪区域（快速移动或遮挡），同一帧立即做整帧检测，避免误判为手部丢失
+                allHands = self._detect_region(img, 0, 0, w, flipType, mirror_width)
+                self.input_stats['redetections'] += 1
+                self._frames_since_full = 0
+
+        if allHands is None:
+            self._tracked_boxes = []
+            return [], img
+        # 跟踪区域使用推理图像（未镜像）的坐标
+        self._tracked_boxes = [(w - bbox[0] - bbox[2], bbox[1], bbox[2], bbox[3]) if mirror else bbox
+                               for bbox in (hand["bbox"] for hand in allHands)]
+
+        # draw
+        if draw:
+            if mirror:
+                img = self.buffers.flip(img, 1)
+            for myHand in allHands:
+                self.draw_hand(img, myHand)
         
+        return allHands, img
+
+    def _detect_region(self, region, offset_x, offset_y, frame_width, flipType, mirror_width=None):
+        """
+        对图像区域做推理，关键点映射回整帧坐标；mirror_width 不为 None 时 x 坐标按该宽度镜像。
+        深度 z 按整帧宽度换算，与整帧推理时的取值范围一致，不随裁剪区域大小变化。
+        :return: 手部信息列表，推理失败时返回 None。
+        """
+        h, w = region.shape[:2]
+        scale = self._effective_scale(w, h)
+        if scale < 1.0:
+            size = (max(1, int(w * scale)), max(1, int(h * scale)))
+            region = cv2.resize(region, size, dst=self.buffers.buffer('resize', (size[1], size[0], 3)),
+                                interpolation=cv2.INTER_AREA)
+        imgRGB = cv2.cvtColor(region, cv2.COLOR_BGR2RGB, dst=self.buffers.buffer('rgb', region.shape))
+
         # 将 OpenCV 图像转换为 MediaPipe Image 对象
         mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=imgRGB)
-        
-        # 为视频模式生成时间戳
-        timestamp_ms = int(time.time() * 1000)
-        
+
+        # 为视频模式生成时间戳（必须严格递增）
+        timestamp_ms = int(self.clock() * 1000)
+        if timestamp_ms <= self.last_timestamp_ms:
+            timestamp_ms = self.last_timestamp_ms + 1
+        self.last_timestamp_ms = timestamp_ms
+
         # 使用新的检测器进行检测
+        start = time.perf_counter()
         try:
             self.results = self.detector.detect_for_video(mp_image, timestamp_ms)
         except Exception as e:
             print(f"⚠ 手部检测失败: {e}")
-            return [], img
+            return None
+        self._update_input_scale((time.perf_counter() - start) * 1000)
 
         allHands = []
         if self.results.hand_landmarks:
             # 新的 API 返回结果结构不同
             for handedness, hand_landmarks in zip(self.results.handedness, self.results.hand_landmarks):
                 myHand = {}
-                # lmList
+                # lmList（归一化坐标相对于送入推理的区域，映射回整帧像素坐标）
                 mylmList = []
                 xList = []
                 yList = []
                 for id, lm in enumerate(hand_landmarks):
-                    px, py, pz = int(lm.x * w), int(lm.y * h), int(lm.z * w)
+                    fx = offset_x + lm.x * w
+                    if mirror_width is not None:
+                        fx = mirror_width - fx
+                    px, py, pz = int(fx), int(offset_y + lm.y * h), int(lm.z * frame_width)
                     mylmList.append([px, py, pz])
                     xList.append(px)
                     yList.append(py)
@@ -141,40 +455,88 @@ class HandDetector:
                 myHand["lmList"] = mylmList
                 myHand["bbox"] = bbox
                 myHand["center"] = (cx, cy)
-                
+
                 # 获取手的类型（左/右）
                 hand_type_label = handedness[0].category_name
                 if flipType:
                     myHand["type"] = "Right" if hand_type_label == "Left" else "Left"
                 else:
                     myHand["type"] = hand_type_label
-                
+
                 allHands.append(myHand)
+        return allHands
 
-                # draw
-                if draw:
-                    # 使用新的绘图方式
-                    self.draw_landmarks(img, hand_landmarks)
-                    cv2.rectangle(img, (bbox[0] - 20, bbox[1] - 20),
-                                  (bbox[0] + bbox[2] + 20, bbox[1] + bbox[3] + 20),
-                                  (255, 0, 255), 2)
-                    cv2.putText(img, myHand["type"], (bbox[0] - 30, bbox[1] - 30), cv2.FONT_HERSHEY_PLAIN,
-                                2, (255, 0, 255), 2)
-        
-        return allHands, img
+    def _select_region(self, w, h):
+        """
+        选择本帧送入推理的区域：跟踪中的手部周围，或者整帧。
+        :return: (x0, y0, x1, y1)
+        """
+        cfg = self.roi_config
+        if (not cfg['enabled'] or not self._tracked_boxes
+                or self._frames_since_full + 1 >= cfg['full_frame_interval']):
+            return 0, 0, w, h
+
+        left = min(box[0] for box in self._tracked_boxes)
+        top = min(box[1] for box in self._tracked_boxes)
+        right = max(box[0] + box[2] for box in self._tracked_boxes)
+        bottom = max(box[1] + box[3] for box in self._tracked_boxes)
+        pad = cfg['padding'] * max(right - left, bottom - top)
+
+        # 保持与整帧相同的宽高比，避免关键点模型看到的手部被拉伸
+        region_h = max(bottom - top + 2 * pad, (right - left + 2 * pad) * h / w, cfg['min_size'])
+        region_w = region_h * w / h
+        if region_w * region_h >= cfg['max_area_ratio'] * w * h:
+            return 0, 0, w, h
+
+        # 尺寸取16像素的整数倍，减少输入尺寸的逐帧变化，缩放和颜色转换缓冲区也能复用
+        region_h = min(-(-int(region_h) // 16) * 16, h)
+        region_w = min(int(region_h * w / h), w)
+        x0 = min(max(int((left + right - region_w) / 2), 0), w - region_w)
+        y0 = min(max(int((top + bottom - region_h) / 2), 0), h - region_h)
+        return x0, y0, x0 + region_w, y0 + region_h
+
+    def _effective_scale(self, w, h):
+        """本次推理的输入缩放比例，缩放后短边不小于 min_input_size"""
+        floor = self.roi_config['min_input_size'] / max(1, min(w, h))
+        return min(1.0, max(self.input_scale, floor))
+
+    def _update_input_scale(self, elapsed_ms):
+        """根据推理耗时的平滑值调整输入分辨率"""
+        cfg = self.roi_config
+        if self.inference_ms is None:
+            self.inference_ms = elapsed_ms
+        else:
+            self.inference_ms += cfg['smoothing'] * (elapsed_ms - self.inference_ms)
+
+        if not cfg['adaptive_scale']:
+            return
+        self._scale_counter += 1
+        if self._scale_counter < cfg['adjust_interval']:
+            return
+        self._scale_counter = 0
+
+        if self.inference_ms > cfg['target_inference_ms']:
+            self.input_scale = max(cfg['min_scale'], self.input_scale - cfg['scale_step'])
+        elif self.inference_ms < cfg['target_inference_ms'] * cfg['recover_ratio']:
+            self.input_scale = min(1.0, self.input_scale + cfg['scale_step'])
+
+    def get_input_stats(self):
+        """推理输入统计：整帧/裁剪帧数、重新检测次数、当前输入缩放和平均推理耗时"""
+        return {
+            **self.input_stats,
+            'input_scale': round(self.input_scale, 2),
+            'inference_ms': round(self.inference_ms, 2) if self.inference_ms is not None else None
+        }
 
-    def draw_landmarks(self, rgb_image, hand_landmarks):
-        """辅助函数，用于在新版 API 上绘制关键点"""
-        hand_landmarks_proto = landmark_pb2.NormalizedLandmarkList()
-        hand_landmarks_proto.landmark.extend([
-            landmark_pb2.NormalizedLandmark(x=landmark.x, y=landmark.y, z=landmark.z) for landmark in hand_landmarks
-        ])
-        mp.solutions.drawing_utils.draw_landmarks(
-            rgb_image,
-            hand_landmarks_proto,
-            mp.solutions.hands.HAND_CONNECTIONS,
-            mp.solutions.drawing_styles.get_default_hand_landmarks_style(),
-            mp.solutions.drawing_styles.get_default_hand_connections_style())
+    def draw_hand(self, img, myHand):
+        """在图像上绘制单只手的关键点、骨架、包围框和左右手标签"""
+        bbox = myHand["bbox"]
+        HandUtils.draw_landmarks(img, myHand["lmList"])
+        cv2.rectangle(img, (bbox[0] - 20, bbox[1] - 20),
+                      (bbox[0] + bbox[2] + 20, bbox[1] + bbox[3] + 20),
+                      (255, 0, 255), 2)
+        cv2.putText(img, myHand["type"], (bbox[0] - 30, bbox[1] - 30), cv2.FONT_HERSHEY_PLAIN,
+                    2, (255, 0, 255), 2)
 
     def fingersUp(self, myHand):
         fingers = []
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+无界面手势检测守护进程 - 适用于无显示器的树莓派/展台设备
+
+只运行采集、推理、手势检测和动作执行，不创建任何窗口、不绘制任何叠加层。
+运行状态通过本地Unix套接字以JSON格式提供：
+
+    python daemon.py
+    python daemon.py --sources 0 1      # 多摄像头，每个摄像头一个采集+推理进程
+    socat - UNIX-CONNECT:/tmp/gestureye.sock
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+# 进程启动时间，启动指标从这里开始计时（包含下面导入 mediapipe / OpenCV 的冷启动耗时）
+_start_time = time.time()
+
+from cvzone.HandTrackingModule import HandDetector
+from gesture_manager import GestureManager
+from gesture_events import GestureEvent, STARTED
+from motion_gate import MotionGate
+from frame_governor import FrameGovernor
+from frame_buffers import FrameBufferPool
+from frame_ring import open_capture
+from multi_camera import MultiCameraPipeline
+from startup_metrics import StartupMetrics
+from session import SessionRecorder
+import config
+
+
+class StatusServer:
+    """Unix套接字状态服务器，每个连接返回一份JSON状态快照后关闭"""
+
+    def __init__(self, socket_path: str, status_provider):
+        self.socket_path = socket_path
+        self.status_provider = status_provider
+        self.server_socket = None
+        self.thread = None
+        self.running = False
+
+    def start(self) -> bool:
+        """启动状态服务器"""
+        if not hasattr(socket, 'AF_UNIX'):
+            print("当前平台不支持Unix套接字，状态服务未启动")
+            return False
+
+        if self.in_use():
+            print(f"状态服务未启动: {self.socket_path} 已有其他服务在监听")
+            return False
+
+        try:
+            # 清理上次异常退出残留的套接字文件
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+            self.server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.server_socket.bind(self.socket_path)
+            self.server_socket.listen(4)
+            self.server_socket.settimeout(1.0)
+        except OSError as e:
+            print(f"状态服务启动失败: {e}")
+            self.server_socket = None
+            return False
+
+        self.running = True
+        self.thread = threading.Thread(target=self._serve, name="StatusServer", daemon=True)
+        self.thread.start()
+        print(f"状态服务已启动: {self.socket_path}")
+        return True
+
+    def in_use(self) -> bool:
+        """套接字文件存在且能连接上时，说明另一个服务实例正在运行"""
+        if not hasattr(socket, 'AF_UNIX') or not os.path.exists(self.socket_path):
+            return False
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.settimeout(1.0)
+            probe.connect(self.socket_path)
+            return True
+        except OSError:
+            return False
+        finally:
+            probe.close()
+
+    def _serve(self):
+        """接受连接并返回状态"""
+        while self.running:
+            try:
+                client, _ = self.server_socket.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+            try:
+                payload = json.dumps(self.status_provider(), ensure_ascii=False)
+                client.sendall(payload.encode('utf-8') + b'\n')
+            except Exception as e:
+                print(f"发送状态失败: {e}")
+            finally:
+                client.close()
+
+    def stop(self):
+        """停止状态服务器并删除套接字文件（未启动时不删除，套接字可能属于另一个实例）"""
+        self.running = False
+        if self.server_socket:
+            self.server_socket.close()
+            self.server_socket = None
+        if not self.thread:
+            return
+        self.thread.join(timeout=2.0)
+        self.thread = None
+        if os.path.exists(self.socket_path):
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+
+
+class GestureDaemon:
+    """无界面手势检测服务"""
+
+    def __init__(self, socket_path: Optional[str] = None, execute_actions: Optional[bool] = None,
+                 sources: Optional[List] = None):
+        self.daemon_config = config.DAEMON_CONFIG
+        self.socket_path = socket_path or self.daemon_config['socket_path']
+        if execute_actions is None:
+            execute_actions = self.daemon_config['execute_actions']
+        if sources is None:
+            sources = config.MULTI_CAMERA_CONFIG['sources']
+        self.sources = list(sources)
+
+        self.cap = None
+        self.detector = None
+        self.gesture_manager = None
+        self.gesture_bindings = None
+        self.action_executor = None
+        self.recorder = None
+        self.motion_gate = MotionGate()
+        self.governor = None
+        self.frame_buffers = FrameBufferPool()
+        self.multi_camera = None
+        self.status_server = StatusServer(self.socket_path, self.get_status)
+
+        # 运行状态
+        self.running = False
+        self.start_time = time.time()
+        self.startup = StartupMetrics("daemon", _start_time)
+        self.frame_count = 0
+        self.current_fps = 0.0
+        self.hands_visible = 0
+        self.visible_hand_ids = set()
+        self.last_gesture: Optional[Dict[str, Any]] = None
+        self.gesture_counts: Dict[str, int] = {}
+        self.status_lock = threading.Lock()
+
+        if execute_actions:
+            self.setup_actions()
+
+    def setup_actions(self):
+        """加载动作执行模块（依赖平台相关库，不可用时只做检测）"""
+        try:
+            from core.gesture_bindings import GestureBindings
+            from core.action_executor import ActionExecutor
+            self.gesture_bindings = GestureBindings()
+            self.action_executor = ActionExecutor()
+        except Exception as e:
+            print(f"动作执行模块不可用，仅进行手势检测: {e}")
+            self.gesture_bindings = None
+            self.action_executor = None
+
+    def setup_pipeline(self) -> bool:
+        """初始化摄像头、手部检测器和手势管理器"""
+        if self.sources:
+            return self.setup_multi_camera()
+
+        self.cap = open_capture(config.CAMERA_INDEX)
+        if not self.cap.isOpened():
+            print("无法打开摄像头")
+            return False
+
+        self.detector = HandDetector(
+            maxHands=config.HAND_DETECTION_CONFIG['max_hands'],
+            detectionCon=config.HAND_DETECTION_CONFIG['detection_confidence'],
+            minTrackCon=config.HAND_DETECTION_CONFIG['min_tracking_confidence']
+        )
+        self.detector.warm_up()
+        self.startup.detector_ready(self.detector)
+        self.gesture_manager = GestureManager()
+        self.governor = FrameGovernor(self.cap, self.detector)
+        if config.RECORDING_CONFIG['enabled']:
+            self.recorder = SessionRecorder.create_default("camera")
+        return True
+
+    def setup_multi_camera(self) -> bool:
+        """启动多摄像头 worker 进程，本进程只做融合和手势检测"""
+        self.multi_camera = MultiCameraPipeline(self.sources)
+        self.multi_camera.start()
+        self.gesture_manager = GestureManager()
+        # 没有可调节的采集和推理，调节器只统计融合和手势检测耗时
+        self.governor = FrameGovernor()
+        if config.RECORDING_CONFIG['enabled']:
+            self.recorder = SessionRecorder.create_default("multi_camera")
+        return True
+
+    def install_signal_handlers(self):
+        """安装退出信号处理，收到信号后在当前帧结束时退出主循环"""
+        def handle_signal(signum, frame):
+            print(f"\n收到信号 {signum}，正在停止...")
+            self.running = False
+
+        signal.signal(signal.SIGINT, handle_signal)
+        signal.signal(signal.SIGTERM, handle_signal)
+        if hasattr(signal, 'SIGHUP'):
+            signal.signal(signal.SIGHUP, handle_signal)
+
+    def process_frame(self, img):
+        """处理单帧图像：推理和手势检测，不做任何绘制"""
+        # 不显示画面，镜像只需作用在关键点坐标上
+        flip_image = config.DISPLAY_CONFIG['flip_image']
+        mirror = flip_image and config.DISPLAY_CONFIG['mirror_landmarks']
+        if flip_image and not mirror:
+            img = self.frame_buffers.flip(img, 1)
+
+        # 空闲且画面静止时跳过推理
+        hands = []
+        if self.motion_gate.should_infer(img):
+            hands, _ = self.detector.findHands(
+                img,
+                draw=False,
+                flipType=mirror or not flip_image,
+                mirror=mirror
+            )
+            self.motion_gate.update(bool(hands))
+        self.governor.mark('inference')
+        self.process_hands(hands)
+
+    def process_hands(self, hands: List[Dict[str, Any]]):
+        """
+        对一帧的手部结果做手势检测和录制
+        Args:
+            hands: 手部列表，多摄像头融合结果带有 hand_id，单摄像头按序号编号
+        """
+        recorded_hands = []
+        hand_ids = set()
+        if hands:
+            for i, hand in enumerate(hands):
+                hand_id = hand.get("hand_id", f"hand_{i}")
+                hand_ids.add(hand_id)
+                detected_gestures, events = self.gesture_manager.detect_events(
+                    hand["lmList"], hand_id, hand["type"]
+                )
+                for event in events:
+                    self.handle_gesture_event(event)
+                recorded_hands.append({
+                    'hand_id': hand_id, 'hand_type': hand["type"], 'landmarks': hand["lmList"],
+                    'gestures': [gesture['gesture'] for gesture in detected_gestures]
+                })
+            # 多摄像头时同一只手可能换由另一个摄像头提供，消失的编号单独结束其手势
+            for hand_id in self.visible_hand_ids - hand_ids:
+                for event in self.gesture_manager.on_hand_lost(hand_id):
+                    self.handle_gesture_event(event)
+        else:
+            for event in self.gesture_manager.on_all_hands_lost():
+                self.handle_gesture_event(event)
+
+        if self.recorder:
+            self.recorder.record_frame(time.time(), recorded_hands)
+        self.hands_visible = len(hands)
+        self.visible_hand_ids = hand_ids
+
+    def handle_gesture_event(self, event: GestureEvent):
+        """记录手势事件并执行绑定的动作（每次手势只在 started 时计数）"""
+        gesture_name = event.gesture
+        self.startup.gesture_event(event)
+        with self.status_lock:
+            self.last_gesture = dict(event.to_dict(), time=time.time())
+            if event.type == STARTED:
+                self.gesture_counts[gesture_name] = self.gesture_counts.get(gesture_name, 0) + 1
+
+        if not self.action_executor or not self.gesture_bindings:
+            return
+
+        binding = self.gesture_bindings.get_binding(gesture_name)
+        if binding and binding.get("enabled", True):
+            result = self.action_executor.execute_event(event, binding)
+            if result is False:
+                print(f"执行动作失败: {gesture_name} -> {binding.get('action', '')}")
+
+    def get_status(self) -> Dict[str, Any]:
+        """获取运行状态快照（供状态服务调用）"""
+        with self.status_lock:
+            last_gesture = dict(self.last_gesture) if self.last_gesture else None
+            gesture_counts = dict(self.gesture_counts)
+
+        return {
+            'running': self.running,
+            'pid': os.getpid(),
+            'uptime': time.time() - self.start_time,
+            'frames': self.frame_count,
+            'fps': self.current_fps,
+            'hands_visible': self.hands_visible,
+            'using_gpu': bool(self.detector and self.detector.using_gpu),
+            'input': self.detector.get_input_stats() if self.detector else {},
+            'capture': self.cap.get_stats() if hasattr(self.cap, 'get_stats') else None,
+            'startup': self.startup.get_stats(),
+            'motion_gate': self.motion_gate.get_stats(),
+            'governor': self.governor.get_stats() if self.governor else {},
+            'multi_camera': self.multi_camera.get_stats() if self.multi_camera else None,
+            'actions_enabled': self.action_executor is not None,
+            'recording': self.recorder.path if self.recorder else None,
+            'last_gesture': last_gesture,
+            'gesture_counts': gesture_counts,
+            'detectors': self.gesture_manager.get_detector_stats() if self.gesture_manager else {}
+        }
+
+    def run(self) -> int:
+        """运行主循环，返回进程退出码"""
+        if self.status_server.in_use():
+            print(f"已有服务实例在运行（{self.status_server.socket_path}），退出")
+            return 1
+
+        # 先置位再安装信号处理，加载模型期间收到的信号也能让主循环不再启动
+        self.running = True
+        self.install_signal_handlers()
+        if not self.setup_pipeline():
+            self.cleanup()
+            return 1
+        if not self.running:
+            self.cleanup()
+            return 0
+
+        self.status_server.start()
+        print("无界面手势检测服务已启动")
+
+        fps_counter = 0
+        fps_start_time = time.time()
+        last_status_print = time.time()
+        status_interval = self.daemon_config['status_print_interval']
+
+        poll_interval = config.MULTI_CAMERA_CONFIG['poll_interval']
+
+        try:
+            while self.running:
+                if self.multi_camera:
+                    hands = self.multi_camera.poll()
+                    if hands is None:
+                        if not self.multi_camera.alive():
+                            print("所有摄像头进程均已退出")
+                            break
+                        time.sleep(poll_interval)
+                        continue
+                    self.governor.begin_frame()
+                    self.process_hands(hands)
+                else:
+                    self.governor.begin_frame()
+                    success, img = self.frame_buffers.read(self.cap)
+                    self.governor.mark('capture')
+                    if not success:
+                        time.sleep(0.01)
+                        continue
+
+                    self.process_frame(img)
+                self.governor.mark('gestures')
+                self.governor.end_frame()
+                self.frame_count += 1
+
+                # 更新FPS
+                fps_counter += 1
+                now = time.time()
+                if now - fps_start_time >= 1.0:
+                    self.current_fps = fps_counter / (now - fps_start_time)
+                    fps_counter = 0
+                    fps_start_time = now
+
+                if status_interval > 0 and now - last_status_print >= status_interval:
+                    print(f"运行中: {self.frame_count} 帧, FPS: {self.current_fps:.1f}, "
+                          f"手势: {sum(self.gesture_counts.values())} 次")
+                    last_status_print = now
+        finally:
+            self.cleanup()
+
+        return 0
+
+    def cleanup(self):
+        """释放资源"""
+        self.running = False
+        self.status_server.stop()
+        if self.cap:
+            self.cap.release()
+        if self.multi_camera:
+            self.multi_camera.stop()
+            self.multi_camera = None
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
+        print("无界面手势检测服务已停止")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="无界面手势检测守护进程")
+    parser.add_argument("--socket", help="状态查询Unix套接字路径")
+    parser.add_argument("--no-actions", action="store_true", help="只检测手势，不执行绑定的动作")
+    parser.add_argument("--sources", nargs="+", help="多摄像头模式：摄像头编号或视频路径列表")
+    args = parser.parse_args()
+
+    daemon = GestureDaemon(
+        socket_path=args.socket,
+        execute_actions=False if args.no_actions else None,
+        sources=args.sources
+    )
+    raise SystemExit(daemon.run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+帧缓冲池 - 复用采集、翻转、缩放和颜色转换的图像缓冲区
+
+每帧都会经过 cap.read → cv2.flip → cv2.resize → cv2.cvtColor，默认每一步都会分配一张新图像。
+缓冲池按用途和形状缓存数组，各步骤通过 image= / dst= 写入已有内存，稳定运行时每帧不再分配图像内存，
+减少内存带宽占用和垃圾回收停顿。
+
+同一用途的缓冲区在下一次取用时会被覆盖，调用方不能跨帧持有这些数组（需要保留时先 copy()）。
+"""
+
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import cv2
+import numpy as np
+
+
+class FrameBufferPool:
+    """按用途和形状复用的图像缓冲池"""
+
+    def __init__(self, capture_buffers: int = 2, max_shapes: int = 4):
+        """
+        Args:
+            capture_buffers: 采集缓冲区个数（轮流使用，上一帧在读取下一帧时仍然有效）
+            max_shapes: 每种用途最多缓存的不同形状数（裁剪区域尺寸变化时使用）
+        """
+        self.capture_buffers = max(1, capture_buffers)
+        self.max_shapes = max_shapes
+        self._capture = []
+        self._capture_index = 0
+        self._buffers: Dict[str, OrderedDict] = {}
+
+    def read(self, cap) -> Tuple[bool, np.ndarray]:
+        """
+        从 cv2.VideoCapture 读取一帧到复用的缓冲区
+        Returns:
+            (是否成功, 图像)
+        """
+        if len(self._capture) < self.capture_buffers:
+            success, img = cap.read()
+            if success:
+                self._capture.append(img)
+            return success, img
+
+        self._capture_index = (self._capture_index + 1) % self.capture_buffers
+        buffer = self._capture[self._capture_index]
+        success, img = cap.read(image=buffer)
+        if success and img is not buffer:
+            # 分辨率变化时 OpenCV 会分配新数组，改为复用新数组
+            self._capture[self._capture_index] = img
+        return success, img
+
+    def buffer(self, name: str, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """
+        获取指定用途和形状的缓冲区（内容未初始化）
+        Args:
+            name: 用途名称，如 'flip'、'resize'、'rgb'
+            shape: 数组形状
+            dtype: 数据类型
+        Returns:
+            可作为 dst= 参数的连续数组
+        """
+        shape = tuple(shape)
+        buffers = self._buffers.setdefault(name, OrderedDict())
+        array = buffers.get(shape)
+        if array is None or array.dtype != dtype:
+            array = np.empty(shape, dtype=dtype)
+            buffers[shape] = array
+            if len(buffers) > self.max_shapes:
+                buffers.popitem(last=False)
+        else:
+            buffers.move_to_end(shape)
+        return array
+
+    def flip(self, img: np.ndarray, flip_code: int = 1) -> np.ndarray:
+        """翻转图像到复用的缓冲区（cv2.flip 的 dst 版本）"""
+        return cv2.flip(img, flip_code, dst=self.buffer('flip', img.shape, img.dtype))
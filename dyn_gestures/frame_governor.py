@@ -0,0 +1,246 @@
+"""
+帧率调节器 - 按端到端延迟预算动态调整采集帧率、推理分辨率、最大手数和叠加层绘制
+
+主循环在每帧的各阶段结束时打点（capture / inference / gestures / overlay），调节器平滑各阶段耗时并估算端到端延迟：
+处理耗时加上读取帧时已积压的时间（cap.read 几乎不等待说明拿到的是缓冲区里的旧帧）。
+
+- 延迟超出 target_latency_ms 时依次降级：叠加层帧率 → 推理分辨率 → 最大手数；
+  延迟低于 目标*recover_ratio 时按相反顺序恢复。
+- 处理耗时超过采集间隔时帧会在缓冲区积压，此时降低采集帧率；有余量时再提高。
+- 推理分辨率在第0档时仍由检测器按推理耗时自行调整（HAND_ROI_CONFIG['adaptive_scale']），
+  调节器降级时才接管，恢复到第0档后交还。
+
+每个调整决策都会打印、保留在最近决策列表中，并以 JSON 行追加到 metrics_file，便于对比不同设备上的表现。
+"""
+
+import json
+import os
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional
+
+import cv2
+
+from clock import Clock
+from frame_ring import ProcessCapture
+import config
+
+
+class FrameGovernor:
+    """按延迟预算调整处理负载"""
+
+    def __init__(self, cap=None, detector=None, overlay=None,
+                 governor_config: Optional[Dict[str, Any]] = None, clock: Optional[Clock] = None):
+        """
+        Args:
+            cap: cv2.VideoCapture，None 时不调整采集帧率
+            detector: HandDetector，None 时不调整推理分辨率和最大手数
+            overlay: HandOverlay，None 时不调整叠加层帧率
+            governor_config: 调节器配置，缺省项使用 config.GOVERNOR_CONFIG
+            clock: 时间源，默认使用 time.perf_counter
+        """
+        self.governor_config = {**config.GOVERNOR_CONFIG, **(governor_config or {})}
+        cfg = self.governor_config
+        self.enabled = cfg['enabled']
+        self.cap = cap
+        self.detector = detector
+        self.overlay = overlay
+        self.clock = clock or time.perf_counter
+
+        # 各调节项的档位（第0档为初始值，依次降级）
+        self.fps_levels = self._levels(config.CAMERA_FPS, cfg['fps_levels']) if cap is not None else []
+        self.scale_levels = self._levels(1.0, cfg['scale_levels']) if detector is not None else []
+        self.hand_levels = (list(range(detector.maxHands, cfg['min_max_hands'] - 1, -1))
+                            if detector is not None else [])
+        self.overlay_levels = (self._levels(overlay.max_fps, cfg['overlay_fps_levels'])
+                               if overlay is not None else [])
+        self.fps_index = self.scale_index = self.hand_index = self.overlay_index = 0
+
+        # 只有进程内直接读取的摄像头会在驱动缓冲区积压旧帧；独立采集进程总是交出最新帧，
+        # 视频文件每次读取都很快，两者都不能用读取耗时判断积压
+        self.detect_backlog = (cap is not None and not isinstance(cap, ProcessCapture)
+                               and cap.get(cv2.CAP_PROP_FRAME_COUNT) <= 0)
+
+        if self.enabled and detector is not None and detector.pool is not None:
+            # 预加载各档最大手数的实例，切换时不必在主循环里等待重建
+            for max_hands in self.hand_levels:
+                detector.pool.preload(max_hands)
+        if self.enabled and cap is not None and cfg['capture_buffer_size'] > 0:
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, cfg['capture_buffer_size'])
+
+        self.stage_ms: Dict[str, float] = {}
+        self.processing_ms: Optional[float] = None
+        self.latency_ms: Optional[float] = None
+        self.frames = 0
+        self._frame_stages: Dict[str, float] = {}
+        self._frame_start = 0.0
+        self._last_mark = 0.0
+        self._last_adjust = self.clock()
+        self.decisions = deque(maxlen=cfg['history'])
+
+    @staticmethod
+    def _levels(initial, candidates: List[float]) -> List[float]:
+        """以初始值为第0档，加上比它低的候选档位（0 表示不限制，视为最高）"""
+        lower = sorted((level for level in candidates if level > 0 and (not initial or level < initial)),
+                       reverse=True)
+        return [initial] + lower
+
+    def begin_frame(self):
+        """开始一帧的计时"""
+        if not self.enabled:
+            return
+        self._frame_start = self._last_mark = self.clock()
+        self._frame_stages = {}
+
+    def mark(self, stage: str):
+        """
+        记录一个阶段结束，耗时为距上一次打点的时间
+        Args:
+            stage: 阶段名称（capture / inference / gestures / overlay）
+        """
+        if not self.enabled:
+            return
+        now = self.clock()
+        self._frame_stages[stage] = self._frame_stages.get(stage, 0.0) + (now - self._last_mark) * 1000
+        self._last_mark = now
+
+    def end_frame(self):
+        """结束一帧：更新耗时统计，按调整间隔做出调节决策"""
+        if not self.enabled:
+            return
+        cfg = self.governor_config
+        now = self.clock()
+        total_ms = (now - self._frame_start) * 1000
+        capture_ms = self._frame_stages.get('capture', 0.0)
+        processing_ms = total_ms - capture_ms
+        # 读取几乎没有等待时拿到的是积压的旧帧，画面至少已经晚了一个采集间隔
+        backlog_ms = 0.0
+        if self.detect_backlog and capture_ms < cfg['backlog_threshold_ms']:
+            backlog_ms = 1000.0 / self.capture_fps
+
+        alpha = cfg['smoothing'] if self.frames else 1.0
+        for stage in set(self.stage_ms) | set(self._frame_stages):
+            value = self._frame_stages.get(stage, 0.0)
+            self.stage_ms[stage] = self.stage_ms.get(stage, value) + alpha * (value - self.stage_ms.get(stage, value))
+        self.processing_ms = processing_ms if self.processing_ms is None else \
+            self.processing_ms + alpha * (processing_ms - self.processing_ms)
+        latency_ms = processing_ms + backlog_ms
+        self.latency_ms = latency_ms if self.latency_ms is None else \
+            self.latency_ms + alpha * (latency_ms - self.latency_ms)
+        self.frames += 1
+
+        if self.frames >= cfg['min_frames'] and now - self._last_adjust >= cfg['adjust_interval']:
+            self._last_adjust = now
+            self._adjust()
+
+    @property
+    def capture_fps(self) -> float:
+        """当前请求的采集帧率"""
+        return self.fps_levels[self.fps_index] if self.fps_levels else config.CAMERA_FPS
+
+    def _adjust(self):
+        """根据平滑后的延迟和处理耗时各做最多一个调整"""
+        cfg = self.governor_config
+        target = cfg['target_latency_ms']
+        if self.latency_ms > target:
+            self._degrade(f"延迟 {self.latency_ms:.1f}ms 超出目标 {target:.0f}ms")
+        elif self.latency_ms < target * cfg['recover_ratio']:
+            self._upgrade(f"延迟 {self.latency_ms:.1f}ms 低于目标 {target:.0f}ms")
+
+        # 处理耗时超过采集间隔时帧会积压；降档后若较高一档也有余量则恢复
+        if self.fps_levels:
+            interval_ms = 1000.0 / self.capture_fps
+            if self.processing_ms > interval_ms * cfg['fps_headroom'] and self.fps_index < len(self.fps_levels) - 1:
+                self._set_level('capture_fps', self.fps_index + 1,
+                                f"处理耗时 {self.processing_ms:.1f}ms 超过采集间隔 {interval_ms:.1f}ms")
+            elif self.fps_index > 0:
+                higher_interval_ms = 1000.0 / self.fps_levels[self.fps_index - 1]
+                if self.processing_ms < higher_interval_ms * cfg['recover_ratio']:
+                    self._set_level('capture_fps', self.fps_index - 1,
+                                    f"处理耗时 {self.processing_ms:.1f}ms 低于采集间隔 {higher_interval_ms:.1f}ms")
+
+    def _degrade(self, reason: str):
+        """降级一档：叠加层帧率 → 推理分辨率 → 最大手数"""
+        for knob, index, levels in (('overlay_fps', self.overlay_index, self.overlay_levels),
+                                    ('input_scale', self.scale_index, self.scale_levels),
+                                    ('max_hands', self.hand_index, self.hand_levels)):
+            target = index + 1
+            if knob == 'input_scale' and index == 0:
+                # 接管时跳过不低于检测器当前自适应缩放的档位，避免反而提高分辨率
+                while target < len(levels) and levels[target] >= self.detector.input_scale:
+                    target += 1
+            if target < len(levels) and self._set_level(knob, target, reason):
+                return
+
+    def _upgrade(self, reason: str):
+        """恢复一档，顺序与降级相反"""
+        for knob, index in (('max_hands', self.hand_index),
+                            ('input_scale', self.scale_index),
+                            ('overlay_fps', self.overlay_index)):
+            if index > 0 and self._set_level(knob, index - 1, reason):
+                return
+
+    def _set_level(self, knob: str, index: int, reason: str) -> bool:
+        """应用一个调节项的档位并记录决策，返回是否成功"""
+        if knob == 'capture_fps':
+            old, new = self.fps_levels[self.fps_index], self.fps_levels[index]
+            self.cap.set(cv2.CAP_PROP_FPS, new)
+            self.fps_index = index
+        elif knob == 'input_scale':
+            old = round(self.detector.input_scale, 2)
+            # 第0档交还给检测器内部的自适应调整
+            self.detector.set_input_scale(self.scale_levels[index] if index > 0 else None)
+            new = round(self.detector.input_scale, 2)
+            self.scale_index = index
+        elif knob == 'max_hands':
+            old, new = self.hand_levels[self.hand_index], self.hand_levels[index]
+            if not self.detector.set_max_hands(new):
+                return False
+            self.hand_index = index
+        else:
+            old, new = self.overlay_levels[self.overlay_index], self.overlay_levels[index]
+            self.overlay.set_max_fps(new)
+            self.overlay_index = index
+
+        self._record(knob, old, new, reason)
+        return True
+
+    def _record(self, knob: str, old, new, reason: str):
+        """记录一个调节决策（打印、保存到最近决策列表、追加到指标文件）"""
+        decision = {
+            'timestamp': time.time(),
+            'knob': knob,
+            'old': old,
+            'new': new,
+            'reason': reason,
+            'latency_ms': round(self.latency_ms, 2),
+            'processing_ms': round(self.processing_ms, 2),
+            'stages_ms': {stage: round(value, 2) for stage, value in self.stage_ms.items()}
+        }
+        self.decisions.append(decision)
+        print(f"帧率调节: {knob} {old} -> {new}（{reason}）")
+
+        metrics_file = self.governor_config['metrics_file']
+        if metrics_file:
+            try:
+                directory = os.path.dirname(metrics_file)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(metrics_file, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(decision, ensure_ascii=False) + '\n')
+            except OSError as e:
+                print(f"写入调节指标失败: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """当前延迟、各阶段耗时、各调节项的取值和最近的决策"""
+        return {
+            'enabled': self.enabled,
+            'latency_ms': round(self.latency_ms, 2) if self.latency_ms is not None else None,
+            'processing_ms': round(self.processing_ms, 2) if self.processing_ms is not None else None,
+            'stages_ms': {stage: round(value, 2) for stage, value in self.stage_ms.items()},
+            'capture_fps': self.capture_fps,
+            'input_scale': round(self.detector.input_scale, 2) if self.scale_levels else None,
+            'max_hands': self.hand_levels[self.hand_index] if self.hand_levels else None,
+            'overlay_fps': self.overlay_levels[self.overlay_index] if self.overlay_levels else None,
+            'decisions': list(self.decisions)[-10:]
+        }
@@ -0,0 +1,390 @@
+"""
+共享内存帧环 - 采集进程与推理进程之间零拷贝传递图像
+
+进程间用队列传递图像需要逐帧序列化几 MB 数据。SharedFrameRing 在 multiprocessing.shared_memory 中预分配
+若干帧槽位，单生产者（采集进程）/单消费者（推理进程）无锁使用：
+
+- 生产者总是写入最旧的空闲槽位（跳过最新发布的槽位和消费者正在读取的槽位），cap.read 直接写入共享内存；
+- 消费者每次只取最新的一帧（latest-frame-wins），返回共享内存上的视图，不做复制，中间积压的帧直接丢弃；
+- 每个槽位带有序号，写入期间序号为0，消费者取帧后可用 is_valid 确认该帧没有被覆盖。
+
+消费者持有的槽位在下一次 read_latest 之前不会被覆盖；只有生产者在消费者登记读取前的极短窗口内
+连续发布两帧以上才可能写入同一槽位。ProcessCapture.read 交出帧前用 is_valid 复查（已被覆盖则重取），
+下一次 read 时再确认上一帧在使用期间是否被覆盖，计入 torn 统计（该帧的推理结果可能来自混合图像，最坏影响一帧）。
+
+ProcessCapture 把采集进程包装成与 cv2.VideoCapture 相同的 read / set / get / release 接口，
+主循环、FrameBufferPool 和帧率调节器无需修改即可使用。只有采集移到了独立进程，
+推理和手势逻辑仍在主进程中顺序执行；需要把推理也放到独立进程时使用 multi_camera（--sources）。
+"""
+
+import multiprocessing
+import queue
+import time
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+import config
+
+
+# 控制区字段
+LATEST = 0      # 最新发布的帧序号
+READING = 1     # 消费者正在读取的槽位
+STATE = 2       # 采集进程状态
+
+# 采集进程状态
+STARTING = 0
+RUNNING = 1
+FAILED = 2
+STOPPED = 3
+
+SLOT_DTYPE = np.dtype([
+    ('sequence', '<u8'),     # 帧序号，写入期间为0
+    ('timestamp', '<f8'),    # 采集时间（time.time）
+    ('shape', '<u4', (3,))   # 图像形状 (高, 宽, 通道)
+])
+
+# 采集进程上报给消费者的属性
+PROPERTIES = (cv2.CAP_PROP_FPS, cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT)
+
+_ALIGNMENT = 64
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+class SharedFrameRing:
+    """共享内存中的单生产者/单消费者帧环"""
+
+    def __init__(self, max_shape: Tuple[int, int, int], slots: int = 4, name: Optional[str] = None):
+        """
+        Args:
+            max_shape: 单帧最大形状 (高, 宽, 通道)，uint8
+            slots: 槽位数，至少3个（最新帧、消费者持有的帧和正在写入的帧）
+            name: 已有共享内存的名称，None 时新建
+        """
+        if slots < 3:
+            raise ValueError("帧环至少需要3个槽位")
+        self.max_shape = tuple(int(v) for v in max_shape)
+        self.slots = slots
+        self.frame_bytes = int(np.prod(self.max_shape))
+
+        control_bytes = _align(8 * 3)
+        properties_bytes = _align(8 * len(PROPERTIES))
+        meta_bytes = _align(SLOT_DTYPE.itemsize * slots)
+        frames_offset = control_bytes + properties_bytes + meta_bytes
+        size = frames_offset + _align(self.frame_bytes) * slots
+
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        buf = self.shm.buf
+        self.control = np.ndarray((3,), dtype='<u8', buffer=buf)
+        self.properties = np.ndarray((len(PROPERTIES),), dtype='<f8', buffer=buf, offset=control_bytes)
+        self.meta = np.ndarray((slots,), dtype=SLOT_DTYPE, buffer=buf, offset=control_bytes + properties_bytes)
+        self.frames = [np.ndarray((self.frame_bytes,), dtype=np.uint8, buffer=buf,
+                                  offset=frames_offset + _align(self.frame_bytes) * i)
+                       for i in range(slots)]
+        if self.owner:
+            self.control[:] = 0
+            self.control[READING] = slots
+            self.properties[:] = 0
+            self.meta[:] = np.zeros(slots, dtype=SLOT_DTYPE)
+
+        # 生产者状态（只在生产者进程中使用）
+        self._sequence = 0
+        self._write_slot = None
+        self._published_slot = None
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def state(self) -> int:
+        return int(self.control[STATE])
+
+    def set_state(self, state: int):
+        self.control[STATE] = state
+
+    def _view(self, slot: int, shape) -> np.ndarray:
+        """槽位上指定形状的图像视图"""
+        return self.frames[slot][:int(np.prod(shape))].reshape(shape)
+
+    def acquire(self, shape) -> np.ndarray:
+        """
+        生产者：取一个可写槽位（最旧的空闲槽位），在 publish 之前该槽位对消费者不可见
+        Args:
+            shape: 图像形状 (高, 宽, 通道)
+        Returns:
+            槽位上的图像视图，可直接作为 cap.read(image=...) 的参数
+        """
+        shape = tuple(int(v) for v in shape)
+        if int(np.prod(shape)) > self.frame_bytes:
+            raise ValueError(f"图像尺寸 {shape} 超出帧环容量 {self.max_shape}")
+        reading = int(self.control[READING])
+        sequences = self.meta['sequence']
+        slot = min((s for s in range(self.slots) if s != self._published_slot and s != reading),
+                   key=lambda s: sequences[s])
+        self.meta['sequence'][slot] = 0
+        self.meta['shape'][slot] = shape if len(shape) == 3 else (*shape, 1)
+        self._write_slot = slot
+        return self._view(slot, shape)
+
+    def publish(self, timestamp: float) -> int:
+        """
+        生产者：发布 acquire 取得的槽位
+        Returns:
+            帧序号
+        """
+        slot = self._write_slot
+        self._sequence += 1
+        self.meta['timestamp'][slot] = timestamp
+        self.meta['sequence'][slot] = self._sequence
+        self.control[LATEST] = self._sequence
+        self._published_slot = slot
+        self._write_slot = None
+        return self._sequence
+
+    def read_latest(self, last_sequence: int = 0) -> Optional[Tuple[int, float, np.ndarray]]:
+        """
+        消费者：取最新的一帧（共享内存视图，不复制），该槽位在下一次调用前不会被覆盖
+        Args:
+            last_sequence: 上一次取得的帧序号
+        Returns:
+            (帧序号, 采集时间, 图像)，没有更新的帧时返回None
+        """
+        for _ in range(self.slots):
+            latest = int(self.control[LATEST])
+            if latest <= last_sequence:
+                return None
+            matches = np.flatnonzero(self.meta['sequence'] == latest)
+            if not len(matches):
+                continue
+            slot = int(matches[0])
+            self.control[READING] = slot
+            # 登记读取后再确认槽位没有开始被覆盖
+            if int(self.meta['sequence'][slot]) != latest:
+                continue
+            height, width, channels = (int(v) for v in self.meta['shape'][slot])
+            shape = (height, width, channels) if channels > 1 else (height, width)
+            return latest, float(self.meta['timestamp'][slot]), self._view(slot, shape)
+        return None
+
+    def is_valid(self, sequence: int) -> bool:
+        """消费者：确认取得的帧在使用期间没有被覆盖"""
+        slot = int(self.control[READING])
+        return slot < self.slots and int(self.meta['sequence'][slot]) == sequence
+
+    def close(self):
+        """关闭共享内存，创建者同时释放它"""
+        self.control = self.properties = self.meta = None
+        self.frames = []
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def capture_worker(source, ring_name: str, max_shape, slots: int, settings, commands, stop_event):
+    """
+    采集进程：从摄像头读取图像直接写入帧环
+    Args:
+        source: cv2.VideoCapture 的参数
+        ring_name: 帧环共享内存名称
+        max_shape: 帧环单帧最大形状
+        slots: 帧环槽位数
+        settings: 启动时应用的 (属性, 值) 列表
+        commands: 运行中 cap.set 请求队列
+        stop_event: 停止事件
+    """
+    ring = SharedFrameRing(max_shape, slots, ring_name)
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        print(f"采集进程无法打开: {source}")
+        ring.set_state(FAILED)
+        ring.close()
+        return
+
+    def apply(prop, value):
+        cap.set(prop, value)
+        report()
+
+    def report():
+        for i, prop in enumerate(PROPERTIES):
+            ring.properties[i] = cap.get(prop)
+
+    for prop, value in settings:
+        cap.set(prop, value)
+    report()
+    ring.set_state(RUNNING)
+
+    shape = None
+    failures = 0
+    max_failures = config.CAPTURE_PROCESS_CONFIG['max_read_failures']
+    try:
+        while not stop_event.is_set():
+            try:
+                while True:
+                    apply(*commands.get_nowait())
+            except queue.Empty:
+                pass
+
+            view = ring.acquire(shape) if shape else None
+            success, img = cap.read(image=view)
+            if not success:
+                failures += 1
+                if failures >= max_failures:
+                    print(f"采集进程连续 {failures} 次读取失败，停止采集")
+                    break
+                time.sleep(0.01)
+                continue
+            failures = 0
+
+            if img is not view:
+                # 首帧或分辨率变化：OpenCV 分配了新数组，复制到槽位后按新形状直接写入
+                view = ring.acquire(img.shape)
+                view[...] = img
+                shape = img.shape
+            ring.publish(time.time())
+    except KeyboardInterrupt:
+        pass
+    except ValueError as e:
+        print(f"采集进程错误: {e}")
+    finally:
+        ring.set_state(STOPPED)
+        cap.release()
+        ring.close()
+
+
+class ProcessCapture:
+    """在独立进程中采集、通过共享内存帧环取帧的 cv2.VideoCapture 替代品"""
+
+    def __init__(self, source, settings=(), capture_config=None):
+        """
+        Args:
+            source: cv2.VideoCapture 的参数（摄像头编号或路径）
+            settings: 启动时应用的 (属性, 值) 列表
+            capture_config: 采集进程配置，缺省项使用 config.CAPTURE_PROCESS_CONFIG
+        """
+        self.capture_config = {**config.CAPTURE_PROCESS_CONFIG, **(capture_config or {})}
+        cfg = self.capture_config
+        width, height = cfg['max_frame_size']
+        self.ring = SharedFrameRing((height, width, 3), cfg['slots'])
+        self.sequence = 0
+        self.timestamp = 0.0
+        self.frames = 0             # 交出的帧数
+        self.dropped = 0            # 推理跟不上而跳过的帧数
+        self.retried = 0            # 交出前发现已被覆盖、重新取帧的次数
+        self.torn = 0               # 交出后在使用期间被覆盖的帧数
+        self._check_previous = False
+
+        context = multiprocessing.get_context('spawn')
+        self.commands = context.Queue()
+        self.stop_event = context.Event()
+        self.process = context.Process(
+            target=capture_worker,
+            args=(source, self.ring.name, self.ring.max_shape, self.ring.slots,
+                  list(settings), self.commands, self.stop_event),
+            name="CaptureProcess",
+            daemon=True
+        )
+        self.process.start()
+
+        deadline = time.monotonic() + cfg['open_timeout']
+        while self.ring.state == STARTING and self.process.is_alive() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def isOpened(self) -> bool:
+        return self.ring is not None and self.ring.state == RUNNING
+
+    def read(self, image=None) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        取最新的一帧，没有新帧时等待
+        Args:
+            image: 与 cv2.VideoCapture.read 兼容，忽略（返回的是共享内存上的视图）
+        Returns:
+            (是否成功, 图像)；图像在下一次 read 之前有效
+        """
+        cfg = self.capture_config
+        if self._check_previous and self.ring is not None:
+            # 上一帧在推理期间是否被采集进程覆盖
+            if not self.ring.is_valid(self.sequence):
+                self.torn += 1
+            self._check_previous = False
+
+        deadline = time.monotonic() + cfg['read_timeout']
+        while self.ring is not None:
+            frame = self.ring.read_latest(self.sequence)
+            if frame is not None:
+                sequence, timestamp, img = frame
+                if not self.ring.is_valid(sequence):
+                    self.retried += 1
+                    continue
+                if self.sequence:
+                    self.dropped += sequence - self.sequence - 1
+                self.sequence = sequence
+                self.timestamp = timestamp
+                self.frames += 1
+                self._check_previous = True
+                return True, img
+            if self.ring.state != RUNNING or time.monotonic() >= deadline:
+                break
+            time.sleep(cfg['poll_interval'])
+        return False, None
+
+    def get_stats(self) -> dict:
+        """取帧统计：交出的帧数、跳过的帧数、重取次数和使用期间被覆盖的帧数"""
+        return {'frames': self.frames, 'dropped': self.dropped, 'retried': self.retried, 'torn': self.torn}
+
+    def set(self, prop, value) -> bool:
+        """把属性设置转发给采集进程"""
+        if not self.isOpened():
+            return False
+        self.commands.put((prop, value))
+        return True
+
+    def get(self, prop) -> float:
+        """采集进程上报的帧率和分辨率，其他属性返回0"""
+        if self.ring is None or prop not in PROPERTIES:
+            return 0.0
+        return float(self.ring.properties[PROPERTIES.index(prop)])
+
+    def release(self):
+        """停止采集进程并释放帧环"""
+        if self.ring is None:
+            return
+        self.stop_event.set()
+        self.process.join(self.capture_config['stop_timeout'])
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(1.0)
+        self.ring.close()
+        self.ring = None
+
+
+def open_capture(source, configure: bool = True):
+    """
+    按 CAPTURE_PROCESS_CONFIG 打开摄像头：独立采集进程或当前进程内的 cv2.VideoCapture
+    Args:
+        source: 摄像头编号或路径
+        configure: 是否应用配置中的分辨率和帧率
+    Returns:
+        ProcessCapture 或 cv2.VideoCapture
+    """
+    settings = []
+    if configure:
+        settings = [(cv2.CAP_PROP_FRAME_WIDTH, config.CAMERA_FRAME_WIDTH),
+                    (cv2.CAP_PROP_FRAME_HEIGHT, config.CAMERA_FRAME_HEIGHT),
+                    (cv2.CAP_PROP_FPS, config.CAMERA_FPS)]
+    if config.CAPTURE_PROCESS_CONFIG['enabled']:
+        return ProcessCapture(source, settings)
+
+    cap = cv2.VideoCapture(source)
+    for prop, value in settings:
+        cap.set(prop, value)
+    return cap
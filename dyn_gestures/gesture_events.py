@@ -0,0 +1,162 @@
+"""
+手势事件 - 将逐帧的手势检测结果转换为 started / held / released 事件
+
+静态手势达到触发条件后每帧都会输出结果，直接绑定动作时只能依赖冷却时间去重。
+状态机为每只手的每种手势维护状态：第一次输出时发出 started，持续输出超过 hold_delay 后
+每隔 repeat_interval 发出一次 held（带重复序号），超过 release_timeout 没有输出或手部丢失时发出 released。
+动态手势（滑动、握拳张开）是一次性的，started 后立即 released。
+"""
+
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+
+from clock import Clock, system_clock
+import config
+
+
+# 事件类型
+STARTED = "started"
+HELD = "held"
+RELEASED = "released"
+
+
+@dataclass
+class GestureEvent:
+    """手势事件"""
+    type: str                       # started / held / released
+    gesture: str                    # 手势名称
+    hand_id: str
+    hand_type: str
+    confidence: float = 0.0
+    repeat: int = 0                 # held 事件的重复序号（从1开始）
+    duration: float = 0.0           # 自 started 起经过的时间（秒）
+    display_message: str = ""
+    timestamp: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return {
+            'type': self.type,
+            'gesture': self.gesture,
+            'hand_id': self.hand_id,
+            'hand_type': self.hand_type,
+            'confidence': self.confidence,
+            'repeat': self.repeat,
+            'duration': self.duration,
+            'timestamp': self.timestamp
+        }
+
+
+@dataclass
+class _ActiveGesture:
+    """一只手上正在进行的手势"""
+    gesture: str
+    hand_id: str
+    hand_type: str
+    start_time: float
+    last_seen: float
+    next_repeat_time: float
+    confidence: float = 0.0
+    display_message: str = ""
+    repeat: int = 0
+
+
+class GestureStateMachine:
+    """手势事件状态机"""
+
+    def __init__(self, clock: Optional[Clock] = None, event_config: Optional[Dict[str, float]] = None,
+                 instant_gestures: Optional[Iterable[str]] = None):
+        """
+        Args:
+            clock: 时间源，默认使用系统时钟
+            event_config: 事件参数，默认使用 config.GESTURE_EVENT_CONFIG
+            instant_gestures: 一次性手势名称，默认为 GESTURE_TYPES['dynamic_gestures']
+        """
+        self.clock = clock or system_clock
+        self.event_config = event_config or config.GESTURE_EVENT_CONFIG
+        if instant_gestures is None:
+            instant_gestures = config.GESTURE_TYPES['dynamic_gestures']
+        self.instant_gestures = set(instant_gestures)
+        self.active: Dict[Tuple[str, str], _ActiveGesture] = {}
+
+    def _event(self, event_type: str, state: _ActiveGesture, now: float) -> GestureEvent:
+        return GestureEvent(
+            type=event_type,
+            gesture=state.gesture,
+            hand_id=state.hand_id,
+            hand_type=state.hand_type,
+            confidence=state.confidence,
+            repeat=state.repeat,
+            duration=now - state.start_time,
+            display_message=state.display_message,
+            timestamp=now
+        )
+
+    def update(self, hand_id: str, hand_type: str, results: List[Dict[str, Any]]) -> List[GestureEvent]:
+        """
+        输入一只手本帧的检测结果
+        Args:
+            hand_id: 手部ID
+            hand_type: 手部类型
+            results: GestureManager.detect_gestures 的返回值
+        Returns:
+            本帧产生的事件
+        """
+        now = self.clock()
+        events = []
+        seen = set()
+
+        for result in results:
+            gesture_name = result['gesture']
+            key = (hand_id, gesture_name)
+            state = self.active.get(key)
+            if state is None:
+                state = _ActiveGesture(
+                    gesture=gesture_name,
+                    hand_id=hand_id,
+                    hand_type=hand_type,
+                    start_time=now,
+                    last_seen=now,
+                    next_repeat_time=now + self.event_config['hold_delay']
+                )
+            state.confidence = result.get('confidence', 0)
+            state.display_message = result.get('display_message', "")
+            state.last_seen = now
+
+            if gesture_name in self.instant_gestures:
+                events.append(self._event(STARTED, state, now))
+                events.append(self._event(RELEASED, state, now))
+                continue
+
+            if key not in self.active:
+                self.active[key] = state
+                events.append(self._event(STARTED, state, now))
+            elif now >= state.next_repeat_time:
+                state.repeat += 1
+                state.next_repeat_time = now + self.event_config['repeat_interval']
+                events.append(self._event(HELD, state, now))
+            seen.add(key)
+
+        # 超时没有输出的手势视为已松开（包括其他手上的手势）
+        timeout = self.event_config['release_timeout']
+        expired = [key for key, state in self.active.items()
+                   if key not in seen and now - state.last_seen > timeout]
+        for key in expired:
+            events.append(self._event(RELEASED, self.active.pop(key), now))
+        return events
+
+    def release_all(self, hand_id: Optional[str] = None) -> List[GestureEvent]:
+        """
+        手部丢失时松开手势
+        Args:
+            hand_id: 丢失的手部ID，None 表示所有手
+        Returns:
+            released 事件列表
+        """
+        now = self.clock()
+        keys = [key for key in self.active if hand_id is None or key[0] == hand_id]
+        return [self._event(RELEASED, self.active.pop(key), now) for key in keys]
+
+    def reset(self):
+        """清空状态（不产生事件）"""
+        self.active.clear()
@@ -2,67 +2,165 @@
 手势管理器 - 统一管理所有手势检测器
 """
 
-from typing import List, Dict, Any, Optional
+import os
+import time
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple
 from gestures import (
     GestureDetector, 
     StaticGestureDetector,
+    DynamicGestureDetector,
     HandOpenDetector, 
     PeaceSignDetector,
     ThumbsDetector,
     OKSignDetector,
-    SwipeDetector
+    SwipeDetector,
+    TrajectoryDetector,
+    TrajectoryTemplateStore,
+    PoseClassifier,
+    PoseClassifierDetector
 )
+from clock import Clock, system_clock
+from landmark_filter import LandmarkSmoother
+from gesture_events import GestureEvent, GestureStateMachine
 import config
 
+
+@dataclass
+class DetectorStats:
+    """单个检测器的运行统计"""
+    calls: int = 0                  # 实际调用次数
+    skipped: int = 0                # 因降频/禁用跳过的帧数
+    hits: int = 0                   # 返回手势结果的次数
+    errors: int = 0                 # 抛出异常的次数
+    total_time_ms: float = 0.0      # 累计耗时（毫秒）
+    max_time_ms: float = 0.0        # 最大单次耗时（毫秒）
+    avg_time_ms: float = 0.0        # 平滑后的平均耗时（毫秒）
+    error_rate: float = 0.0         # 平滑后的错误率
+    state: str = "active"           # active / sampled / disabled
+    frame_counters: Dict[str, int] = field(default_factory=dict)  # 降频状态下每只手的帧计数
+    disabled_until: float = 0.0     # 禁用截止时间（手势管理器的时间源）
+    last_error: str = ""            # 最近一次错误信息
+    last_error_log_time: float = float('-inf')  # 最近一次打印错误的时间
+    suppressed_errors: int = 0      # 未打印的错误数
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为统计报告字典"""
+        return {
+            'state': self.state,
+            'calls': self.calls,
+            'skipped': self.skipped,
+            'hits': self.hits,
+            'errors': self.errors,
+            'hit_rate': self.hits / self.calls if self.calls else 0.0,
+            'error_rate': self.error_rate,
+            'avg_time_ms': self.avg_time_ms,
+            'mean_time_ms': self.total_time_ms / self.calls if self.calls else 0.0,
+            'max_time_ms': self.max_time_ms,
+            'last_error': self.last_error
+        }
+
+
 class GestureManager:
     """手势管理器，负责管理和协调所有手势检测器"""
     
-    def __init__(self):
+    def __init__(self, clock: Optional[Clock] = None,
+                 gesture_config: Optional[Dict[str, Dict[str, Any]]] = None,
+                 smoothing_config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            clock: 检测器使用的时间源，默认使用系统时钟；离线回放时传入 ManualClock
+            gesture_config: 覆盖 config.GESTURE_CONFIG 的手势参数，按手势合并，
+                            如 {'ok_sign': {'required_frames': 10}}（用于离线调参）
+            smoothing_config: 覆盖 config.SMOOTHING_CONFIG 的关键点平滑参数
+        """
+        self.clock = clock or system_clock
+        overrides = gesture_config or {}
+        self.gesture_config = {
+            name: {**params, **overrides.get(name, {})}
+            for name, params in config.GESTURE_CONFIG.items()
+        }
+        self.smoothing_config = {**config.SMOOTHING_CONFIG, **(smoothing_config or {})}
+        self.smoother = LandmarkSmoother(self.smoothing_config) if self.smoothing_config['enabled'] else None
         self.detectors: List[GestureDetector] = []
+        self.state_machine = GestureStateMachine(self.clock)
+        self.guard_config = config.DETECTOR_GUARD_CONFIG
+        self.detector_stats: Dict[str, DetectorStats] = {}
         self.setup_default_detectors()
     
     def setup_default_detectors(self):
         """设置默认的手势检测器"""
         # 添加动态手势检测器
-        self.add_detector(HandOpenDetector())
+        hand_open_config = self.gesture_config['hand_open']
+        self.add_detector(HandOpenDetector(
+            variance_change_percent=hand_open_config['variance_change_percent'],
+            distance_multiplier=hand_open_config['distance_multiplier'],
+            history_length=hand_open_config['history_length']
+        ))
+        
+        # 添加学习型静态手势分类器，它覆盖的手势不再运行规则检测器
+        replaced = set()
+        classifier_config = self.gesture_config['pose_classifier']
+        if os.path.exists(classifier_config['model_file']):
+            try:
+                model = PoseClassifier.load(classifier_config['model_file'])
+            except Exception as e:
+                print(f"加载手势分类模型失败: {e}")
+            else:
+                self.add_detector(PoseClassifierDetector(
+                    model,
+                    required_frames=classifier_config['required_frames'],
+                    min_confidence=classifier_config['min_confidence'],
+                    temporal=classifier_config.get('temporal')
+                ))
+                if classifier_config['replace_rules']:
+                    replaced = set(model.gesture_names)
         
         # 添加静态手势检测器
-        peace_config = config.GESTURE_CONFIG['peace_sign']
-        self.add_detector(PeaceSignDetector(
+        rule_detectors = []
+        peace_config = self.gesture_config['peace_sign']
+        rule_detectors.append(PeaceSignDetector(
             distance_threshold_percent=peace_config['distance_threshold_percent'],
-            required_frames=peace_config['required_frames']
+            required_frames=peace_config['required_frames'],
+            temporal=peace_config.get('temporal')
         ))
         
-        thumbs_up_config = config.GESTURE_CONFIG['thumbs_up']
-        self.add_detector(ThumbsDetector(
+        thumbs_up_config = self.gesture_config['thumbs_up']
+        rule_detectors.append(ThumbsDetector(
             thumb_distance_threshold=thumbs_up_config['thumb_distance_threshold'],
             other_fingers_threshold=thumbs_up_config['other_fingers_threshold'],
             thumb_angle_threshold=thumbs_up_config['thumb_angle_threshold'],
             thumb_isolation_threshold=thumbs_up_config['thumb_isolation_threshold'],
             required_frames=thumbs_up_config['required_frames'],
-            type="ThumbsUp"
+            type="ThumbsUp",
+            temporal=thumbs_up_config.get('temporal')
         ))
 
-        thumbs_down_config = config.GESTURE_CONFIG['thumbs_down']
-        self.add_detector(ThumbsDetector(
+        thumbs_down_config = self.gesture_config['thumbs_down']
+        rule_detectors.append(ThumbsDetector(
             thumb_distance_threshold=thumbs_down_config['thumb_distance_threshold'],
             other_fingers_threshold=thumbs_down_config['other_fingers_threshold'],
             thumb_angle_threshold=thumbs_down_config['thumb_angle_threshold'],
             thumb_isolation_threshold=thumbs_down_config['thumb_isolation_threshold'],
             required_frames=thumbs_down_config['required_frames'],
-            type="ThumbsDown"
+            type="ThumbsDown",
+            temporal=thumbs_down_config.get('temporal')
         ))
 
         # 添加OK手势检测器
-        ok_config = config.GESTURE_CONFIG['ok_sign']
-        self.add_detector(OKSignDetector(
+        ok_config = self.gesture_config['ok_sign']
+        rule_detectors.append(OKSignDetector(
             circle_threshold=ok_config['circle_threshold'],
             other_fingers_threshold=ok_config['other_fingers_threshold'],
-            required_frames=ok_config['required_frames']
+            required_frames=ok_config['required_frames'],
+            temporal=ok_config.get('temporal')
         ))
+        for detector in rule_detectors:
+            if detector.name not in replaced:
+                self.add_detector(detector)
 
         # 添加滑动手势检测器
-        swipe_config = config.GESTURE_CONFIG['swipe']
+        swipe_config = self.gesture_config['swipe']
         self.add_detector(SwipeDetector(
             history_length=swipe_config['history_length'],
             min_swipe_distance=swipe_config['min_swipe_distance'],
@@ -70,14 +168,40 @@ class GestureManager:
             required_frames=swipe_config['required_frames'],
             palm_angle_threshold=swipe_config['palm_angle_threshold']
         ))
+        
+        # 添加轨迹模板检测器（需要先录制模板）
+        trajectory_config = self.gesture_config['trajectory']
+        if os.path.exists(trajectory_config['template_file']):
+            try:
+                templates = TrajectoryTemplateStore.load(trajectory_config['template_file'])
+            except Exception as e:
+                print(f"加载轨迹模板失败: {e}")
+            else:
+                self.add_detector(TrajectoryDetector(
+                    templates,
+                    window_lengths=trajectory_config['window_lengths'],
+                    match_threshold=trajectory_config['match_threshold'],
+                    min_motion=trajectory_config['min_motion'],
+                    stride=trajectory_config['stride']
+                ))
     
     def add_detector(self, detector: GestureDetector):
         """添加新的手势检测器"""
+        detector.clock = self.clock
         self.detectors.append(detector)
+        self.detector_stats[detector.name] = DetectorStats()
+    
+    def set_clock(self, clock: Clock):
+        """替换所有检测器的时间源"""
+        self.clock = clock
+        self.state_machine.clock = clock
+        for detector in self.detectors:
+            detector.clock = clock
     
     def remove_detector(self, detector_name: str):
         """移除手势检测器"""
         self.detectors = [d for d in self.detectors if d.name != detector_name]
+        self.detector_stats.pop(detector_name, None)
     
     def detect_gestures(self, landmarks: List[List[int]], hand_id: str, hand_type: str) -> List[Dict[str, Any]]:
         """
@@ -87,22 +211,155 @@ class GestureManager:
         """
         results = []
         
+        # 检测前先平滑关键点，所有检测器看到相同的平滑结果
+        if self.smoother:
+            landmarks = self.smoother.filter(landmarks, hand_id, self.clock())
+        
         for detector in self.detectors:
+            stats = self.detector_stats.setdefault(detector.name, DetectorStats())
+            if not self._should_run(stats, hand_id):
+                stats.skipped += 1
+                self._skip_frame(detector, stats, hand_id)
+                continue
+            
+            start_time = time.perf_counter()
             try:
                 result = detector.detect(landmarks, hand_id, hand_type)
                 if result:
                     # 添加显示消息到结果中
                     result['display_message'] = detector.get_display_message(result)
                     results.append(result)
+                    # 动态手势（包括模板定义的轨迹手势）是一次性的
+                    if isinstance(detector, DynamicGestureDetector):
+                        self.state_machine.instant_gestures.add(result['gesture'])
+                self._record_call(detector, stats, start_time, hit=bool(result))
             except Exception as e:
-                print(f"检测器 {detector.name} 出错: {e}")
+                self._record_call(detector, stats, start_time, error=e)
         
         return results
     
+    def detect_events(self, landmarks: List[List[int]], hand_id: str,
+                      hand_type: str) -> Tuple[List[Dict[str, Any]], List[GestureEvent]]:
+        """
+        检测手势并转换为 started / held / released 事件
+        Returns:
+            (本帧检测结果, 本帧产生的手势事件)
+        """
+        results = self.detect_gestures(landmarks, hand_id, hand_type)
+        return results, self.state_machine.update(hand_id, hand_type, results)
+    
+    def _should_run(self, stats: DetectorStats, hand_id: str) -> bool:
+        """根据检测器状态判断本帧是否对这只手调用"""
+        if not self.guard_config['enabled'] or stats.state == "active":
+            return True
+        
+        if stats.state == "disabled":
+            if self.clock() < stats.disabled_until:
+                return False
+            # 禁用到期，重新启用并清空平滑统计
+            stats.state = "active"
+            stats.error_rate = 0.0
+            stats.avg_time_ms = 0.0
+            return True
+        
+        # 降频状态：每只手每 sample_interval 帧调用一次（按手计数，多只手时每只手都会被轮到）
+        counter = stats.frame_counters.get(hand_id, 0) + 1
+        stats.frame_counters[hand_id] = counter
+        return counter % self.guard_config['sample_interval'] == 0
+    
+    def _skip_frame(self, detector: GestureDetector, stats: DetectorStats, hand_id: str):
+        """
+        检测器本帧未调用时维护静态手势的连续帧计数：降频时沿用上一次调用的结果，
+        禁用时清空该手的检测历史，避免重新启用后接着旧的计数触发
+        """
+        if not isinstance(detector, StaticGestureDetector):
+            return
+        if stats.state == "sampled":
+            detector.repeat_last_frame(hand_id)
+        else:
+            detector.reset_detection_history(hand_id)
+    
+    def _record_call(self, detector: GestureDetector, stats: DetectorStats, start_time: float,
+                     hit: bool = False, error: Optional[Exception] = None):
+        """记录一次调用的耗时、命中和错误，并更新检测器状态"""
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        alpha = self.guard_config['smoothing']
+        
+        stats.calls += 1
+        stats.total_time_ms += elapsed_ms
+        stats.max_time_ms = max(stats.max_time_ms, elapsed_ms)
+        stats.avg_time_ms = elapsed_ms if stats.calls == 1 else \
+            (1 - alpha) * stats.avg_time_ms + alpha * elapsed_ms
+        stats.error_rate = (1 - alpha) * stats.error_rate + alpha * (1.0 if error else 0.0)
+        if hit:
+            stats.hits += 1
+        if error is not None:
+            stats.errors += 1
+            stats.last_error = str(error)
+            self._log_detector_error(detector, stats, error)
+        
+        if not self.guard_config['enabled'] or stats.calls < self.guard_config['min_calls']:
+            return
+        
+        budget_ms = self.guard_config['time_budget_ms']
+        if stats.error_rate > self.guard_config['max_error_rate']:
+            stats.state = "disabled"
+            stats.disabled_until = self.clock() + self.guard_config['disable_duration']
+            detector.reset()
+            print(f"检测器 {detector.name} 错误率过高 ({stats.error_rate:.0%})，"
+                  f"暂停 {self.guard_config['disable_duration']:.0f} 秒")
+        elif stats.state == "active" and stats.avg_time_ms > budget_ms:
+            stats.state = "sampled"
+            stats.frame_counters.clear()
+            print(f"检测器 {detector.name} 平均耗时 {stats.avg_time_ms:.2f}ms 超出预算 "
+                  f"{budget_ms:.2f}ms，降频为每 {self.guard_config['sample_interval']} 帧调用一次")
+        elif stats.state == "sampled" and stats.avg_time_ms < budget_ms * self.guard_config['recover_ratio']:
+            stats.state = "active"
+            print(f"检测器 {detector.name} 耗时已恢复 ({stats.avg_time_ms:.2f}ms)，恢复全频调用")
+    
+    def _log_detector_error(self, detector: GestureDetector, stats: DetectorStats, error: Exception):
+        """按时间间隔限流打印检测器错误，避免每帧刷屏"""
+        now = self.clock()
+        if now - stats.last_error_log_time < self.guard_config['error_log_interval']:
+            stats.suppressed_errors += 1
+            return
+        
+        suffix = f"（期间另有 {stats.suppressed_errors} 次错误未打印）" if stats.suppressed_errors else ""
+        print(f"检测器 {detector.name} 出错: {error}{suffix}")
+        stats.last_error_log_time = now
+        stats.suppressed_errors = 0
+    
+    def get_detector_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        获取所有检测器的运行统计
+        Returns:
+            {检测器名称: 统计字典}，包含状态、调用次数、命中率、错误率和耗时；
+            静态手势检测器另含 temporal（时间累积模式和触发耗时分布），
+            轨迹检测器另含 matching（下界计算、DTW计算和提前放弃次数）
+        """
+        report = {name: stats.to_dict() for name, stats in self.detector_stats.items()}
+        for detector in self.detectors:
+            if isinstance(detector, StaticGestureDetector) and detector.name in report:
+                report[detector.name]['temporal'] = detector.get_temporal_stats()
+            elif isinstance(detector, TrajectoryDetector) and detector.name in report:
+                report[detector.name]['matching'] = dict(detector.match_stats)
+        return report
+    
+    def reset_detector_stats(self, detector_name: Optional[str] = None):
+        """重置检测器统计并恢复为全频调用"""
+        names = [detector_name] if detector_name else list(self.detector_stats.keys())
+        for name in names:
+            if name in self.detector_stats:
+                self.detector_stats[name] = DetectorStats()
+    
     def reset_all_detectors(self, hand_id: Optional[str] = None):
         """重置所有检测器"""
         for detector in self.detectors:
             detector.reset(hand_id)
+        if hand_id is None:
+            self.state_machine.reset()
+        if self.smoother:
+            self.smoother.reset(hand_id)
     
     def get_detector_by_name(self, name: str) -> Optional[GestureDetector]:
         """根据名称获取检测器"""
@@ -111,20 +368,34 @@ class GestureManager:
                 return detector
         return None
     
-    def on_hand_lost(self, hand_id: str):
+    def on_hand_lost(self, hand_id: str) -> List[GestureEvent]:
         """
         当手部丢失时调用，重置相关的静态手势检测历史
         Args:
             hand_id: 丢失的手部ID
+        Returns:
+            该手上仍在进行的手势的 released 事件
         """
         for detector in self.detectors:
             if isinstance(detector, StaticGestureDetector):
                 detector.reset_detection_history(hand_id)
+        for stats in self.detector_stats.values():
+            stats.frame_counters.pop(hand_id, None)
+        if self.smoother:
+            self.smoother.reset(hand_id)
+        return self.state_machine.release_all(hand_id)
     
-    def on_all_hands_lost(self):
+    def on_all_hands_lost(self) -> List[GestureEvent]:
         """
         当所有手部都丢失时调用，重置所有静态手势检测历史
+        Returns:
+            仍在进行的手势的 released 事件
         """
         for detector in self.detectors:
             if isinstance(detector, StaticGestureDetector):
                 detector.reset_detection_history()
+        for stats in self.detector_stats.values():
+            stats.frame_counters.clear()
+        if self.smoother:
+            self.smoother.reset()
+        return self.state_machine.release_all()
@@ -8,11 +8,13 @@ from .base import GestureDetector, StaticGestureDetector, DynamicGestureDetector
 # 导入动态手势检测器
 from .dynamic.hand_open import HandOpenDetector
 from .dynamic.swipe import SwipeDetector
+from .dynamic.trajectory import TrajectoryDetector, TrajectoryTemplateStore
 
 # 导入静态手势检测器
 from .static.peace_sign import PeaceSignDetector
 from .static.thumbs import ThumbsDetector
 from .static.ok_sign import OKSignDetector
+from .static.pose_classifier import PoseClassifier, PoseClassifierDetector
 
 __all__ = [
     'GestureDetector', 
@@ -20,7 +22,11 @@ __all__ = [
     'DynamicGestureDetector',
     'HandOpenDetector',
     'SwipeDetector',
+    'TrajectoryDetector',
+    'TrajectoryTemplateStore',
     'PeaceSignDetector',
     'ThumbsDetector',
     'OKSignDetector',
+    'PoseClassifier',
+    'PoseClassifierDetector',
 ]
\ No newline at end of file
@@ -3,7 +3,13 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from collections import deque
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from clock import system_clock
+import config
 
 
 class GestureDetector(ABC):
@@ -12,6 +18,7 @@ class GestureDetector(ABC):
     def __init__(self, name: str):
         self.name = name
         self.history = {}  # 存储每只手的历史数据
+        self.clock = system_clock  # 时间源，离线回放时由手势管理器替换
     
     @abstractmethod
     def detect(self, landmarks: List[List[int]], hand_id: str, hand_type: str) -> Optional[Dict[str, Any]]:
@@ -47,41 +54,226 @@ class GestureDetector(ABC):
         return f"{hand_type} Hand: {gesture_name} (Confidence: {confidence:.1f}%)"
 
 
+class TemporalAccumulator(ABC):
+    """
+    时间累积器 - 将逐帧的“是否满足基础条件”累积为“是否触发手势”
+    每只手一个实例，由静态手势检测器创建
+    """
+    
+    @abstractmethod
+    def update(self, matched: bool) -> bool:
+        """
+        输入一帧
+        Args:
+            matched: 本帧是否满足手势基础条件
+        Returns:
+            本帧是否触发手势
+        """
+        pass
+    
+    @abstractmethod
+    def reset(self):
+        """清空累积状态"""
+        pass
+    
+    @property
+    @abstractmethod
+    def idle(self) -> bool:
+        """是否已回到初始状态（用于划分一次手势的起止，统计触发耗时）"""
+        pass
+
+
+class ConsecutiveAccumulator(TemporalAccumulator):
+    """连续帧计数：连续满足 required_frames 帧后触发，任意一帧不满足即从头计数（默认行为）"""
+    
+    def __init__(self, required_frames: int):
+        self.required_frames = required_frames
+        self.count = 0
+    
+    def update(self, matched: bool) -> bool:
+        self.count = self.count + 1 if matched else 0
+        return self.count >= self.required_frames
+    
+    def reset(self):
+        self.count = 0
+    
+    @property
+    def idle(self) -> bool:
+        return self.count == 0
+
+
+class DecayAccumulator(TemporalAccumulator):
+    """
+    指数衰减打分 + 滞回：score = decay * score + (1 - decay) * matched，
+    score 达到 enter_threshold 后开始触发，降到 exit_threshold 以下才停止，
+    单帧抖动只会让分数小幅下降，不会打断手势
+    """
+    
+    def __init__(self, decay: float, enter_threshold: float, exit_threshold: float):
+        self.decay = decay
+        self.enter_threshold = enter_threshold
+        self.exit_threshold = exit_threshold
+        self.score = 0.0
+        self.active = False
+    
+    def update(self, matched: bool) -> bool:
+        self.score = self.decay * self.score + (1.0 - self.decay) * (1.0 if matched else 0.0)
+        if self.active:
+            self.active = self.score >= self.exit_threshold
+        else:
+            self.active = self.score >= self.enter_threshold
+        return self.active
+    
+    def reset(self):
+        self.score = 0.0
+        self.active = False
+    
+    @property
+    def idle(self) -> bool:
+        return not self.active and self.score < self.exit_threshold
+
+
+class KOfNAccumulator(TemporalAccumulator):
+    """最近 window 帧中至少 k 帧满足即触发"""
+    
+    def __init__(self, k: int, window: int):
+        self.k = k
+        self.window = window
+        self.frames = deque(maxlen=window)
+        self.matched_count = 0
+    
+    def update(self, matched: bool) -> bool:
+        if len(self.frames) == self.window:
+            self.matched_count -= self.frames[0]
+        self.frames.append(1 if matched else 0)
+        self.matched_count += 1 if matched else 0
+        return self.matched_count >= self.k
+    
+    def reset(self):
+        self.frames.clear()
+        self.matched_count = 0
+    
+    @property
+    def idle(self) -> bool:
+        return self.matched_count == 0
+
+
+def create_accumulator(temporal_config: Dict[str, Any], required_frames: int) -> TemporalAccumulator:
+    """
+    按配置创建时间累积器
+    Args:
+        temporal_config: 时间累积配置（已合并 config.TEMPORAL_DEFAULTS）
+        required_frames: consecutive 模式的连续帧数
+    Returns:
+        时间累积器实例
+    """
+    mode = temporal_config['mode']
+    if mode == 'consecutive':
+        return ConsecutiveAccumulator(required_frames)
+    if mode == 'decay':
+        return DecayAccumulator(temporal_config['decay'], temporal_config['enter_threshold'],
+                                temporal_config['exit_threshold'])
+    if mode == 'k_of_n':
+        return KOfNAccumulator(temporal_config['k'], temporal_config['window'])
+    raise ValueError(f"未知的时间累积模式: {mode}")
+
+
 class StaticGestureDetector(GestureDetector):
     """静态手势检测器基类"""
     
-    def __init__(self, name: str, required_frames: int = 30):
+    # 是否支持批量检测（batch_gestures）。规则检测器实现 match_batch 后设为 True 即可
+    supports_batch = False
+    
+    def __init__(self, name: str, required_frames: int = 30, temporal: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            name: 检测器名称
+            required_frames: consecutive 模式下需要连续检测的帧数
+            temporal: 时间累积配置，见 config.TEMPORAL_DEFAULTS，默认为 consecutive
+        """
         super().__init__(name)
         self.required_frames = required_frames  # 需要连续检测的帧数
-        self.detection_history = {}  # 存储每只手的检测历史 {hand_id: {'gesture': str, 'count': int, 'last_confidence': float}}
+        self.temporal_config = {**config.TEMPORAL_DEFAULTS, **(temporal or {})}
+        create_accumulator(self.temporal_config, required_frames)  # 提前检查配置
+        # 存储每只手的检测历史 {hand_id: {'gesture': str, 'count': int, 'last_confidence': float,
+        #                                'accumulator': TemporalAccumulator, 'episode_start': float, 'fired': bool}}
+        self.detection_history = {}
+        self.time_to_fire = deque(maxlen=200)  # 最近的触发耗时（秒）：从开始满足条件到第一次触发
+    
+    def _get_history(self, hand_id: str) -> Dict[str, Any]:
+        """获取（必要时创建）某只手的检测历史"""
+        history = self.detection_history.get(hand_id)
+        if history is None:
+            history = self.detection_history[hand_id] = {
+                'gesture': None, 'count': 0, 'last_confidence': 0,
+                'accumulator': create_accumulator(self.temporal_config, self.required_frames),
+                'episode_start': None, 'fired': False, 'matched': False
+            }
+        return history
+    
+    def _update_temporal(self, history: Dict[str, Any], matched: bool) -> bool:
+        """将一帧输入时间累积器，并统计触发耗时"""
+        now = self.clock()
+        if matched and history['episode_start'] is None:
+            history['episode_start'] = now
+        
+        fired = history['accumulator'].update(matched)
+        if fired and not history['fired'] and history['episode_start'] is not None:
+            self.time_to_fire.append(now - history['episode_start'])
+        history['fired'] = fired
+        
+        if history['accumulator'].idle:
+            history['episode_start'] = None
+            history['count'] = 0
+        return fired
     
     def check_continuous_detection(self, hand_id: str, gesture_name: str, confidence: float) -> bool:
         """
-        检查是否连续检测到足够帧数
+        本帧满足基础条件时调用，检查是否达到触发条件
         Args:
             hand_id: 手部ID
             gesture_name: 手势名称
             confidence: 置信度
         Returns:
-            是否满足连续检测条件
+            是否触发手势
         """
-        if hand_id not in self.detection_history:
-            self.detection_history[hand_id] = {'gesture': None, 'count': 0, 'last_confidence': 0}
-        
-        history = self.detection_history[hand_id]
+        history = self._get_history(hand_id)
         
-        # 如果检测到相同手势，增加计数
-        if history['gesture'] == gesture_name:
-            history['count'] += 1
-            history['last_confidence'] = confidence
-        else:
-            # 检测到不同手势，重置计数
+        # 检测到不同手势，重置累积状态
+        if history['gesture'] != gesture_name:
             history['gesture'] = gesture_name
-            history['count'] = 1
-            history['last_confidence'] = confidence
+            history['count'] = 0
+            history['accumulator'].reset()
+            history['episode_start'] = None
+            history['fired'] = False
         
-        # 检查是否达到所需帧数
-        return history['count'] >= self.required_frames
+        history['count'] += 1
+        history['last_confidence'] = confidence
+        history['matched'] = True
+        return self._update_temporal(history, True)
+    
+    def register_miss(self, hand_id: str):
+        """
+        本帧不满足基础条件时调用。consecutive 模式下等同于重置检测历史，
+        decay / k_of_n 模式下只让累积状态衰减，单帧抖动不会打断手势
+        """
+        if self.temporal_config['mode'] == 'consecutive':
+            self.reset_detection_history(hand_id)
+        elif hand_id in self.detection_history:
+            self.detection_history[hand_id]['matched'] = False
+            self._update_temporal(self.detection_history[hand_id], False)
+    
+    def repeat_last_frame(self, hand_id: str):
+        """
+        检测器降频时，跳过的帧调用：沿用该手上一次调用的结果推进时间累积（不输出手势），
+        使 required_frames 仍按实际帧数计算，上一次未满足条件时照常衰减或保持清空
+        """
+        history = self.detection_history.get(hand_id)
+        if history is None:
+            return
+        if history['matched']:
+            history['count'] += 1
+        self._update_temporal(history, history['matched'])
     
     def reset_detection_history(self, hand_id: Optional[str] = None):
         """重置检测历史"""
@@ -89,6 +281,103 @@ class StaticGestureDetector(GestureDetector):
             self.detection_history.clear()
         elif hand_id in self.detection_history:
             del self.detection_history[hand_id]
+    
+    def get_temporal_stats(self) -> Dict[str, Any]:
+        """
+        获取时间累积统计
+        Returns:
+            模式和最近触发耗时的分布（秒）
+        """
+        samples = np.asarray(self.time_to_fire, dtype=np.float64)
+        stats = {'mode': self.temporal_config['mode'], 'fires': len(samples)}
+        if len(samples):
+            stats.update({
+                'time_to_fire_mean': float(samples.mean()),
+                'time_to_fire_p50': float(np.percentile(samples, 50)),
+                'time_to_fire_p90': float(np.percentile(samples, 90)),
+                'time_to_fire_max': float(samples.max())
+            })
+        return stats
+    
+    def detect_batch(self, landmarks: np.ndarray,
+                     resets: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        批量检测同一只手的连续帧，结果与逐帧调用 detect 一致。
+        子类设置 supports_batch = True 并实现 match_batch(landmarks) -> (布尔数组, 置信度数组)，
+        批量判断每帧是否满足基础条件（不含连续帧判断）
+        Args:
+            landmarks: 形状 (N, 21, 3) 的关键点数组，按时间顺序排列
+            resets: 形状 (N,) 的布尔数组，为 True 的帧之前检测历史被清空（如所有手丢失）
+        Returns:
+            (形状 (N,) 的布尔数组表示该帧是否输出手势, 形状 (N,) 的置信度数组)
+        """
+        landmarks = np.asarray(landmarks, dtype=np.float64)
+        match, confidence = self.match_batch(landmarks)
+        return self.temporal_batch(match, resets), confidence
+    
+    @property
+    def batch_gesture_names(self) -> List[str]:
+        """batch_gestures 可能输出的手势名称"""
+        return [self.name]
+    
+    def batch_gestures(self, landmarks: np.ndarray, resets: Optional[np.ndarray] = None,
+                       left_hands: Optional[np.ndarray] = None) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """
+        批量检测同一只手的连续帧，按手势名称返回结果（一个检测器可以输出多种手势）
+        Args:
+            landmarks: 形状 (N, 21, 3) 的关键点数组，按时间顺序排列
+            resets: 形状 (N,) 的布尔数组，为 True 的帧之前检测历史被清空
+            left_hands: 形状 (N,) 的布尔数组，标记左手（规则检测器不区分左右手）
+        Returns:
+            {手势名称: (形状 (N,) 的布尔数组表示该帧是否输出该手势, 形状 (N,) 的置信度数组)}
+        """
+        return {self.name: self.detect_batch(landmarks, resets)}
+    
+    def temporal_batch(self, match: np.ndarray, resets: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        对逐帧条件序列应用时间累积，结果与逐帧调用 check_continuous_detection / register_miss 一致
+        Args:
+            match: 形状 (N,) 的布尔数组
+            resets: 形状 (N,) 的布尔数组，为 True 的帧之前累积状态被清空
+        Returns:
+            形状 (N,) 的布尔数组，表示该帧是否输出手势
+        """
+        if self.temporal_config['mode'] == 'consecutive':
+            return self.consecutive_counts(match, resets) >= self.required_frames
+        
+        # 衰减和滞回是顺序依赖的，逐帧更新（相对几何计算开销很小）
+        accumulator = create_accumulator(self.temporal_config, self.required_frames)
+        fired = np.zeros(len(match), dtype=bool)
+        started = False
+        for i, matched in enumerate(match):
+            if resets is not None and resets[i]:
+                accumulator.reset()
+                started = False
+            # 逐帧路径中累积状态在第一次满足条件时才创建
+            if not started and not matched:
+                continue
+            started = True
+            fired[i] = accumulator.update(bool(matched))
+        # 逐帧路径只在满足基础条件的帧输出手势，滞回只决定累积是否被打断
+        return fired & match
+    
+    @staticmethod
+    def consecutive_counts(match: np.ndarray, resets: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        计算每帧的连续满足帧数（不满足的帧为0），即 check_continuous_detection 的计数
+        Args:
+            match: 形状 (N,) 的布尔数组
+            resets: 形状 (N,) 的布尔数组，为 True 的帧从头计数
+        Returns:
+            形状 (N,) 的整数数组
+        """
+        index = np.arange(len(match))
+        # 每帧之前最近一次中断（不满足或重置）的位置
+        breaks = np.where(~match, index, -1)
+        if resets is not None:
+            breaks = np.maximum(breaks, np.where(resets, index - 1, -1))
+        last_break = np.maximum.accumulate(breaks) if len(match) else breaks
+        return np.where(match, index - last_break, 0)
 
 
 class DynamicGestureDetector(GestureDetector):
@@ -3,5 +3,6 @@
 """
 
 from .hand_open import HandOpenDetector
+from .trajectory import TrajectoryDetector, TrajectoryTemplateStore
 
-__all__ = ['HandOpenDetector']
\ No newline at end of file
+__all__ = ['HandOpenDetector', 'TrajectoryDetector', 'TrajectoryTemplateStore']
\ No newline at end of file
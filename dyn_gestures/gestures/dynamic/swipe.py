@@ -49,8 +49,7 @@ class SwipeDetector(DynamicGestureDetector):
             }
         
         # 添加当前位置、时间戳、角度和手掌朝向
-        import time
-        current_time = time.time()
+        current_time = self.clock()
         palm_orientation = self._detect_palm_orientation(landmarks)
         
         self.history[hand_id]['positions'].append(palm_center)
@@ -0,0 +1,339 @@
+"""
+轨迹模板手势检测器 - 用带约束的动态时间规整（DTW）将关键点轨迹与用户录制的模板匹配
+
+每帧提取手掌中心位置和指尖相对手掌中心的偏移，取最近若干帧组成滑动窗口，
+以窗口内手掌平均位置为原点、手掌基准长度为单位归一化后重采样到模板长度，
+再与模板逐一比较。画圈、挥手、捏合缩放等动作只需录制模板，不需要编写新的启发式规则。
+
+匹配时先用 LB_Keogh 下界（所有模板一次向量化计算）排除不可能的模板，
+剩余模板一起计算 Sakoe-Chiba 带约束的 DTW（按行向量化），累计代价超过阈值时提前放弃，
+模板数量增加到几十个时每帧开销仍然很小。
+"""
+
+import os
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from collections import deque
+
+import numpy as np
+
+from ..base import DynamicGestureDetector
+from hand_utils import HandUtils
+
+
+# 默认参与匹配的指尖（拇指、食指、中指、无名指、小指）
+DEFAULT_FINGERTIPS = (4, 8, 12, 16, 20)
+
+
+def extract_frame_features(landmarks: np.ndarray, fingertips: Sequence[int]) -> np.ndarray:
+    """
+    提取逐帧原始特征
+    Args:
+        landmarks: 形状 (N, 21, 3) 的关键点数组
+        fingertips: 指尖关键点索引
+    Returns:
+        形状 (N, 3 + 2*指尖数) 的数组：手掌中心 (x, y)、手掌基准长度、各指尖相对手掌中心的偏移 (dx, dy)
+    """
+    landmarks = np.asarray(landmarks, dtype=np.float64)
+    palm = landmarks[:, HandUtils.PALM_POINTS, :2].mean(axis=1)
+    palm_length = HandUtils.calculate_palm_base_length_batch(landmarks)
+    offsets = landmarks[:, list(fingertips), :2] - palm[:, None, :]
+    return np.concatenate([palm, palm_length[:, None], offsets.reshape(len(landmarks), -1)], axis=1)
+
+
+def normalize_window(frame_features: np.ndarray) -> np.ndarray:
+    """
+    将一段原始特征归一化为平移、尺度无关的轨迹
+    Args:
+        frame_features: extract_frame_features 的输出（时间顺序）
+    Returns:
+        形状 (N, 2 + 2*指尖数) 的轨迹：手掌位置相对窗口平均位置、指尖偏移，均以平均手掌基准长度为单位
+    """
+    scale = max(float(frame_features[:, 2].mean()), 1e-6)
+    palm = frame_features[:, :2] - frame_features[:, :2].mean(axis=0)
+    return np.concatenate([palm, frame_features[:, 3:]], axis=1) / scale
+
+
+def resample(sequence: np.ndarray, length: int) -> np.ndarray:
+    """沿时间轴线性插值重采样到固定长度"""
+    if len(sequence) == length:
+        return sequence
+    source = np.linspace(0.0, 1.0, len(sequence))
+    target = np.linspace(0.0, 1.0, length)
+    return np.stack([np.interp(target, source, sequence[:, d]) for d in range(sequence.shape[1])], axis=1)
+
+
+def motion_amount(trajectory: np.ndarray) -> float:
+    """轨迹的运动量：相邻帧之间的位移总和（手掌基准长度）"""
+    return float(np.linalg.norm(np.diff(trajectory, axis=0), axis=1).sum())
+
+
+def envelope(sequence: np.ndarray, band: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    计算 LB_Keogh 使用的上下包络
+    Args:
+        sequence: 形状 (L, D) 的序列
+        band: Sakoe-Chiba 带宽（帧）
+    Returns:
+        (上包络, 下包络)，形状均为 (L, D)
+    """
+    padded = np.pad(sequence, ((band, band), (0, 0)), mode='edge')
+    windows = np.lib.stride_tricks.sliding_window_view(padded, 2 * band + 1, axis=0)
+    return windows.max(axis=-1), windows.min(axis=-1)
+
+
+def lb_keogh(query: np.ndarray, upper: np.ndarray, lower: np.ndarray) -> np.ndarray:
+    """
+    LB_Keogh 下界（一次计算所有模板）
+    Args:
+        query: 形状 (L, D) 的查询轨迹，或形状 (T, L, D) 的逐模板序列
+        upper: 形状 (T, L, D) 的上包络
+        lower: 形状 (T, L, D) 的下包络
+    Returns:
+        形状 (T,) 的下界，单位与 dtw_distances 相同（每步均方根距离）
+    """
+    above = np.maximum(query - upper, 0.0)
+    below = np.maximum(lower - query, 0.0)
+    total = (above * above + below * below).sum(axis=(1, 2))
+    return np.sqrt(total / upper.shape[1])
+
+
+def dtw_distances(query: np.ndarray, templates: np.ndarray, band: int,
+                  cutoff: float = float('inf')) -> np.ndarray:
+    """
+    Sakoe-Chiba 带约束的 DTW 距离（一次计算多个模板）
+
+    逐行计算累计代价，行内递推 D[j] = c[j] + min(D'[j-1], D'[j], D[j-1]) 改写为
+    前缀和 + 前缀最小值，整行（所有模板）一次向量化完成。
+    Args:
+        query: 形状 (L, D) 的查询轨迹
+        templates: 形状 (K, L, D) 的模板轨迹
+        band: 带宽（帧）
+        cutoff: 距离上限，某模板一行的最小累计代价已超过上限时提前放弃该模板
+    Returns:
+        形状 (K,) 的每步均方根距离；提前放弃的模板为 inf
+    """
+    count, length = templates.shape[0], templates.shape[1]
+    diff = query[None, :, None, :] - templates[:, None, :, :]
+    cost = (diff * diff).sum(axis=-1)
+    limit = cutoff * cutoff * length
+    columns = np.arange(length)
+
+    previous = np.full((count, length), np.inf)
+    active = np.ones(count, dtype=bool)
+    for i in range(length):
+        in_band = np.abs(columns - i) <= band
+        row = np.where(in_band, cost[:, i], np.inf)
+        if i == 0:
+            entry = np.full((count, length), np.inf)
+            entry[:, 0] = row[:, 0]
+        else:
+            shifted = np.concatenate([np.full((count, 1), np.inf), previous[:, :-1]], axis=1)
+            entry = row + np.minimum(previous, shifted)
+        # D[j] = min_{k<=j}(entry[k] + c[k+1..j])，用前缀和 C 写成 C[j] + min_{k<=j}(entry[k] - C[k])
+        prefix = np.cumsum(np.where(in_band, row, 0.0), axis=1)
+        with np.errstate(invalid='ignore'):
+            current = prefix + np.minimum.accumulate(entry - prefix, axis=1)
+        current[:, ~in_band] = np.inf
+        active &= current.min(axis=1) <= limit
+        if not active.any():
+            return np.full(count, np.inf)
+        previous = current
+
+    distances = np.sqrt(previous[:, -1] / length)
+    distances[~active] = np.inf
+    return distances
+
+
+class TrajectoryTemplateStore:
+    """轨迹模板库，所有模板重采样到相同长度并预先计算包络，保存为 .npz 文件"""
+
+    def __init__(self, length: int = 32, fingertips: Sequence[int] = DEFAULT_FINGERTIPS,
+                 band_ratio: float = 0.1):
+        """
+        Args:
+            length: 模板长度（帧）
+            fingertips: 参与匹配的指尖关键点索引
+            band_ratio: Sakoe-Chiba 带宽占模板长度的比例
+        """
+        self.length = length
+        self.fingertips = tuple(int(i) for i in fingertips)
+        self.band = max(1, int(round(band_ratio * length)))
+        self.names: List[str] = []
+        self.templates = np.zeros((0, length, 2 + 2 * len(self.fingertips)))
+        self.upper = self.templates.copy()
+        self.lower = self.templates.copy()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def prepare(self, frame_features: np.ndarray) -> np.ndarray:
+        """将原始特征归一化并重采样为模板长度的轨迹"""
+        return resample(normalize_window(frame_features), self.length)
+
+    def add(self, name: str, landmarks: np.ndarray):
+        """
+        添加模板
+        Args:
+            name: 手势名称（检测结果中的 gesture 字段），同名可以有多个模板
+            landmarks: 形状 (N, 21, 3) 的一段关键点序列
+        """
+        trajectory = self.prepare(extract_frame_features(landmarks, self.fingertips))
+        self._append(name, trajectory)
+
+    def _append(self, name: str, trajectory: np.ndarray):
+        upper, lower = envelope(trajectory, self.band)
+        self.names.append(name)
+        self.templates = np.concatenate([self.templates, trajectory[None]])
+        self.upper = np.concatenate([self.upper, upper[None]])
+        self.lower = np.concatenate([self.lower, lower[None]])
+
+    def remove(self, name: str):
+        """删除某个手势的所有模板"""
+        keep = [i for i, n in enumerate(self.names) if n != name]
+        self.names = [self.names[i] for i in keep]
+        self.templates = self.templates[keep]
+        self.upper = self.upper[keep]
+        self.lower = self.lower[keep]
+
+    def gesture_names(self) -> List[str]:
+        """模板库中的手势名称（去重）"""
+        return sorted(set(self.names))
+
+    def save(self, path: str):
+        """保存为 .npz 文件"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez_compressed(
+            path,
+            names=np.array(self.names, dtype=str),
+            templates=self.templates,
+            length=self.length,
+            band=self.band,
+            fingertips=np.array(self.fingertips, dtype=np.int64)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'TrajectoryTemplateStore':
+        """从 .npz 文件加载"""
+        with np.load(path) as data:
+            store = cls(int(data['length']), data['fingertips'].tolist())
+            store.band = int(data['band'])
+            for name, trajectory in zip(data['names'].tolist(), data['templates']):
+                store._append(str(name), trajectory)
+        return store
+
+
+class TrajectoryDetector(DynamicGestureDetector):
+    """轨迹模板手势检测器"""
+
+    def __init__(self, templates: TrajectoryTemplateStore, window_lengths: Sequence[int] = (20, 30, 45),
+                 match_threshold: float = 0.35, min_motion: float = 1.0, stride: int = 2):
+        """
+        Args:
+            templates: 轨迹模板库
+            window_lengths: 参与匹配的窗口长度（帧），适应不同速度的动作
+            match_threshold: 最大匹配距离（每步均方根距离，单位为手掌基准长度）
+            min_motion: 窗口内的最小运动量（手掌基准长度），静止的手不参与匹配
+            stride: 每隔多少帧匹配一次
+        """
+        self.window_lengths = sorted(int(n) for n in window_lengths)
+        super().__init__("Trajectory", self.window_lengths[-1])
+        self.templates = templates
+        self.match_threshold = match_threshold
+        self.min_motion = min_motion
+        self.stride = max(1, int(stride))
+        self.frame_counters: Dict[str, int] = {}
+        self.match_stats = {'windows': 0, 'lower_bounds': 0, 'dtw_evaluated': 0, 'dtw_abandoned': 0}
+
+    def detect(self, landmarks: List[List[int]], hand_id: str, hand_type: str) -> Optional[Dict[str, Any]]:
+        """
+        检测轨迹手势
+        Args:
+            landmarks: 手部关键点列表
+            hand_id: 手部ID
+            hand_type: 手部类型
+        Returns:
+            检测结果字典或None
+        """
+        if len(landmarks) < 21 or len(self.templates) == 0:
+            return None
+
+        if hand_id not in self.history:
+            self.history[hand_id] = deque(maxlen=self.history_length)
+            self.frame_counters[hand_id] = 0
+        history = self.history[hand_id]
+        history.append(extract_frame_features(np.asarray([landmarks]), self.templates.fingertips)[0])
+        self.frame_counters[hand_id] += 1
+
+        if len(history) < self.window_lengths[0] or self.frame_counters[hand_id] % self.stride:
+            return None
+
+        match = self.match(np.asarray(history))
+        if match is None:
+            return None
+
+        # 清空历史记录避免同一动作重复检测
+        self.reset(hand_id)
+        name, distance, window = match
+        confidence = 50.0 + 50.0 * max(0.0, 1.0 - distance / self.match_threshold)
+        return {
+            'gesture': name,
+            'hand_type': hand_type,
+            'confidence': confidence,
+            'details': {
+                'distance': distance,
+                'window_frames': window
+            }
+        }
+
+    def match(self, frame_features: np.ndarray) -> Optional[Tuple[str, float, int]]:
+        """
+        将最近的原始特征与所有模板匹配
+        Args:
+            frame_features: 最近若干帧的原始特征（时间顺序）
+        Returns:
+            (手势名称, 距离, 窗口长度)；没有模板在阈值内时返回None
+        """
+        store = self.templates
+        best_distance = self.match_threshold
+        best = None
+        for window in self.window_lengths:
+            if window > len(frame_features):
+                break
+            trajectory = normalize_window(frame_features[-window:])
+            if motion_amount(trajectory[:, :2]) + motion_amount(trajectory[:, 2:]) < self.min_motion:
+                continue
+            query = resample(trajectory, store.length)
+            self.match_stats['windows'] += 1
+
+            # 双向 LB_Keogh 取较大值，只对下界小于阈值的模板计算DTW
+            query_upper, query_lower = envelope(query, store.band)
+            bounds = np.maximum(lb_keogh(query, store.upper, store.lower),
+                                lb_keogh(store.templates, query_upper[None], query_lower[None]))
+            self.match_stats['lower_bounds'] += len(bounds)
+            candidates = np.flatnonzero(bounds < best_distance)
+            if len(candidates) == 0:
+                continue
+            self.match_stats['dtw_evaluated'] += len(candidates)
+            distances = dtw_distances(query, store.templates[candidates], store.band, best_distance)
+            self.match_stats['dtw_abandoned'] += int(np.isinf(distances).sum())
+            index = int(np.argmin(distances))
+            if distances[index] < best_distance:
+                best_distance = float(distances[index])
+                best = (store.names[candidates[index]], best_distance, window)
+        return best
+
+    def reset(self, hand_id: Optional[str] = None):
+        """重置检测器状态"""
+        if hand_id:
+            self.history.pop(hand_id, None)
+            self.frame_counters.pop(hand_id, None)
+        else:
+            self.history.clear()
+            self.frame_counters.clear()
+
+    def get_display_message(self, gesture_result: Dict[str, Any]) -> str:
+        """获取轨迹手势的显示消息"""
+        return f"{gesture_result['hand_type']} Hand: {gesture_result['gesture']} " \
+               f"(Trajectory, {gesture_result['confidence']:.1f}%)"
@@ -4,5 +4,6 @@
 
 from .peace_sign import PeaceSignDetector
 from .thumbs import ThumbsDetector
+from .pose_classifier import PoseClassifier, PoseClassifierDetector
 
-__all__ = ['PeaceSignDetector', 'ThumbsDetector']
\ No newline at end of file
+__all__ = ['PeaceSignDetector', 'ThumbsDetector', 'PoseClassifier', 'PoseClassifierDetector']
\ No newline at end of file
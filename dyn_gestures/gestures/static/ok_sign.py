@@ -2,17 +2,21 @@
 OK手势检测器 - 检测拇指和食指形成圆圈的手势
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import math
+import numpy as np
 from ..base import StaticGestureDetector
 from hand_utils import HandUtils
 
 
 class OKSignDetector(StaticGestureDetector):
     """OK手势检测器"""
+
+    supports_batch = True
     
-    def __init__(self, circle_threshold: float = 0.15, other_fingers_threshold: float = 0.6, required_frames: int = 15):
-        super().__init__("OKSign", required_frames)
+    def __init__(self, circle_threshold: float = 0.15, other_fingers_threshold: float = 0.6, required_frames: int = 15,
+                 temporal: Optional[Dict[str, Any]] = None):
+        super().__init__("OKSign", required_frames, temporal)
         self.circle_threshold = circle_threshold  # 圆圈检测阈值（相对于手掌基准长度）
         self.other_fingers_threshold = other_fingers_threshold  # 其他手指伸展阈值
     
@@ -66,6 +70,9 @@ class OKSignDetector(StaticGestureDetector):
                         'circle_ratio': thumb_index_distance / palm_length
                     }
                 }
+        elif self.temporal_config['mode'] != 'consecutive':
+            # decay / k_of_n 模式下不满足的帧参与衰减；consecutive 模式保持原有行为，不满足的帧不打断计数
+            self.register_miss(hand_id)
         
         return None
     
@@ -104,6 +111,36 @@ class OKSignDetector(StaticGestureDetector):
         
         return min(100, base_confidence)
     
+    def match_batch(self, landmarks: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """批量判断OK手势基础条件并计算置信度，与 detect/_calculate_confidence 逐帧一致"""
+        palm_length = HandUtils.calculate_palm_base_length_batch(landmarks)
+        valid_palm = palm_length > 0
+        safe_length = np.where(valid_palm, palm_length, 1.0)
+        
+        thumb_index_distance = HandUtils.calculate_distance_batch(landmarks[:, 4], landmarks[:, 8])
+        circle_formed = thumb_index_distance < palm_length * self.circle_threshold
+        
+        extensions = np.hypot(landmarks[:, [12, 16, 20], 0] - landmarks[:, [10, 14, 18], 0],
+                              landmarks[:, [12, 16, 20], 1] - landmarks[:, [10, 14, 18], 1])
+        other_fingers_extended = (extensions > palm_length[:, None] * self.other_fingers_threshold).all(axis=1)
+        
+        circle_ratio = thumb_index_distance / safe_length
+        confidence = np.maximum(0, 100 - circle_ratio * 200) + 20 * other_fingers_extended
+        # 手掌长度为0时逐帧路径计算置信度会出错，视为未检测到
+        match = valid_palm & circle_formed & other_fingers_extended
+        return match, np.minimum(100, confidence)
+    
+    def temporal_batch(self, match: np.ndarray, resets: Optional[np.ndarray] = None) -> np.ndarray:
+        """consecutive 模式下按累计满足帧数判断（与逐帧路径一致，不满足的帧不清零），其他模式同基类"""
+        if self.temporal_config['mode'] != 'consecutive':
+            return super().temporal_batch(match, resets)
+        
+        counts = np.cumsum(match)
+        if resets is not None:
+            # 减去最近一次重置之前的累计帧数
+            counts = counts - np.maximum.accumulate(np.where(resets, counts - match, 0))
+        return match & (counts >= self.required_frames)
+    
     def reset(self, hand_id: Optional[str] = None):
         """重置检测器状态"""
         super().reset(hand_id)
@@ -2,16 +2,20 @@
 V字手势（胜利手势）检测器 - 静态手势
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
 from ..base import StaticGestureDetector
 from hand_utils import HandUtils
 
 
 class PeaceSignDetector(StaticGestureDetector):
     """V字手势（胜利手势）检测器"""
+
+    supports_batch = True
     
-    def __init__(self, distance_threshold_percent: float = 0.6, required_frames: int = 30):
-        super().__init__("PeaceSign", required_frames)
+    def __init__(self, distance_threshold_percent: float = 0.6, required_frames: int = 30,
+                 temporal: Optional[Dict[str, Any]] = None):
+        super().__init__("PeaceSign", required_frames, temporal)
         self.distance_threshold_percent = distance_threshold_percent
     
     def detect(self, landmarks: List[List[int]], hand_id: str, hand_type: str) -> Optional[Dict[str, Any]]:
@@ -57,8 +61,8 @@ class PeaceSignDetector(StaticGestureDetector):
                     }
                 }
         else:
-            # 如果不满足基础条件，重置该手的检测历史
-            self.reset_detection_history(hand_id)
+            # 不满足基础条件，交给时间累积器处理（consecutive 模式下重置计数）
+            self.register_miss(hand_id)
         
         return None
     
@@ -96,6 +100,26 @@ class PeaceSignDetector(StaticGestureDetector):
         
         return min(100, base_confidence)
     
+    def match_batch(self, landmarks: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """批量判断V字手势基础条件并计算置信度，与 detect/_calculate_confidence 逐帧一致"""
+        match = (
+            HandUtils.is_finger_extended_batch(landmarks, 8, 6, 5, self.distance_threshold_percent) &
+            HandUtils.is_finger_extended_batch(landmarks, 12, 10, 9, self.distance_threshold_percent) &
+            HandUtils.is_finger_bent_batch(landmarks, 16, 14) &
+            HandUtils.is_finger_bent_batch(landmarks, 20, 18) &
+            HandUtils.check_fingers_spread_batch(landmarks, 8, 12, 0.3)
+        )
+        thumb_close = HandUtils.is_thumb_close_to_palm_batch(landmarks, 0.5)
+        match &= thumb_close
+        
+        wrist_y = landmarks[:, 0, 1]
+        palm_base_length = HandUtils.calculate_palm_base_length_batch(landmarks)
+        fingers_high = ((wrist_y - landmarks[:, 8, 1] > palm_base_length * 0.5) &
+                        (wrist_y - landmarks[:, 12, 1] > palm_base_length * 0.5))
+        others_low = (landmarks[:, 16, 1] - wrist_y > 0) & (landmarks[:, 20, 1] - wrist_y > 0)
+        confidence = 85 + 10 * fingers_high + 5 * others_low + 5 * thumb_close
+        return match, np.minimum(100, confidence).astype(np.float64)
+    
     def reset(self, hand_id: Optional[str] = None):
         """重置静态手势检测状态"""
         self.reset_detection_history(hand_id)
@@ -0,0 +1,340 @@
+"""
+学习型静态手势分类器 - 用离线训练的小模型代替逐条编写的规则
+
+关键点以手腕为原点、手掌基准长度为单位归一化，左手镜像为右手，并旋转到手腕→中指根部朝上，
+得到与位置、尺度、旋转无关的手型特征；手掌朝向（cos, sin）作为单独的特征按权重附加，
+这样竖大拇指和倒竖大拇指这类只有朝向不同的手势仍然可以区分（权重为0时完全旋转无关）。
+
+模型为最近质心或 k 近邻（向量化暴力搜索，特征维数较高时 KD 树并不比暴力搜索快），
+训练和推理只依赖 numpy，保存为 .npz 文件。一次分类即可覆盖所有训练过的手势，
+不需要依次运行每个规则检测器。训练见 session/train_pose_classifier.py。
+"""
+
+import os
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from ..base import StaticGestureDetector
+
+
+# 背景类别（不属于任何手势）
+BACKGROUND = ""
+
+
+def pose_features(landmarks: np.ndarray, left_hands: Optional[np.ndarray] = None,
+                  rotation_invariant: bool = True, orientation_weight: float = 1.0) -> np.ndarray:
+    """
+    提取归一化的手型特征
+    Args:
+        landmarks: 形状 (N, 21, 3) 的关键点数组
+        left_hands: 形状 (N,) 的布尔数组，为 True 的手沿 x 轴镜像
+        rotation_invariant: 是否将手掌方向旋转到统一朝向
+        orientation_weight: 手掌朝向特征的权重
+    Returns:
+        形状 (N, 42) 的特征数组：20个关键点的 (x, y) 加手掌朝向 (cos, sin)
+    """
+    # 以复数 x + iy 表示二维坐标，旋转和缩放都只是一次复数乘法
+    landmarks = np.asarray(landmarks, dtype=np.float64)
+    points = np.ascontiguousarray(landmarks[:, :, :2]).view(np.complex128)[:, :, 0]
+    points = points[:, 1:] - points[:, :1]
+    if left_hands is not None:
+        # 沿 x 轴镜像：x + iy -> -x + iy
+        points = np.where(np.asarray(left_hands)[:, None], -points.conj(), points)
+
+    # 手腕→中指根部的向量作为手掌基准（长度为0时退化为单位向量）
+    axis = points[:, 8]
+    axis = axis + (axis == 0)
+    length = np.abs(axis)
+
+    if rotation_invariant:
+        # 乘以 -i/axis：手腕→中指根部旋转到 (0, -1)（图像坐标中向上），同时除以基准长度
+        points = points * (-1j / axis)[:, None]
+    else:
+        points = points / length[:, None]
+
+    features = np.empty((len(points), 42))
+    features[:, :40] = points.view(np.float64)
+    features[:, 40:] = (axis / length)[:, None].view(np.float64) * orientation_weight
+    return features
+
+
+class PoseClassifier:
+    """最近质心 / k 近邻手型分类器"""
+
+    def __init__(self, method: str, classes: List[str], references: np.ndarray, reference_labels: np.ndarray,
+                 mean: np.ndarray, std: np.ndarray, k: int = 5, max_distance: float = float('inf'),
+                 rotation_invariant: bool = True, orientation_weight: float = 1.0):
+        """
+        Args:
+            method: centroid（最近质心）或 knn（k 近邻）
+            classes: 类别名称，BACKGROUND 表示背景
+            references: 标准化后的质心或训练样本
+            reference_labels: references 对应的类别索引
+            mean: 特征均值（标准化用）
+            std: 特征标准差（标准化用）
+            k: knn 的近邻数
+            max_distance: 超过该距离的样本视为背景
+            rotation_invariant: 特征是否旋转无关
+            orientation_weight: 手掌朝向特征的权重
+        """
+        if method not in ('centroid', 'knn'):
+            raise ValueError(f"未知的分类方法: {method}")
+        self.method = method
+        self.classes = list(classes)
+        self.references = references
+        self.reference_labels = reference_labels.astype(np.int64)
+        self.mean = mean
+        self.std = std
+        self.k = min(k, len(references))
+        self.max_distance = max_distance
+        self.rotation_invariant = rotation_invariant
+        self.orientation_weight = orientation_weight
+        self._prepare()
+        self._class_range = np.arange(len(self.classes))
+        self._background = self.classes.index(BACKGROUND) if BACKGROUND in self.classes else None
+
+    @property
+    def gesture_names(self) -> List[str]:
+        """模型覆盖的手势名称（不含背景）"""
+        return [name for name in self.classes if name != BACKGROUND]
+
+    def features(self, landmarks: np.ndarray, left_hands: Optional[np.ndarray] = None) -> np.ndarray:
+        """按模型的特征设置提取特征"""
+        return pose_features(landmarks, left_hands, self.rotation_invariant, self.orientation_weight)
+
+    def _prepare(self):
+        """预先计算推理用的常量：标准化折叠进参考点，距离只需一次矩阵乘法"""
+        self._inv_std = 1.0 / self.std
+        self._shifted = self.references + self.mean * self._inv_std
+        self._shifted_norms = (self._shifted * self._shifted).sum(axis=1)
+        self._shifted_t = np.ascontiguousarray(self._shifted.T)
+
+    def _squared_distances(self, features: np.ndarray) -> np.ndarray:
+        """到所有参考点的标准化欧氏距离的平方，形状 (N, R)"""
+        scaled = features * self._inv_std
+        squared = (scaled * scaled).sum(axis=1)[:, None] - 2.0 * (scaled @ self._shifted_t) + self._shifted_norms
+        return np.maximum(squared, 0.0)
+
+    def predict(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        批量分类
+        Args:
+            features: 形状 (N, F) 的特征（features() 的输出）
+        Returns:
+            (类别索引, 距离, 置信度 0-100)，形状均为 (N,)；超出 max_distance 的样本归为背景
+        """
+        return self._decide(self._squared_distances(features))
+
+    def _decide(self, squared: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """根据到参考点的距离平方分类，返回值同 predict"""
+        if self.method == 'centroid':
+            labels = self.reference_labels[np.argmin(squared, axis=1)]
+            best = squared.min(axis=1)
+            # 置信度为按距离平方的 softmax 概率
+            confidence = 100.0 / np.exp(0.5 * (best[:, None] - squared)).sum(axis=1)
+        else:
+            nearest = np.argpartition(squared, self.k - 1, axis=1)[:, :self.k]
+            neighbor_labels = self.reference_labels[nearest]
+            votes = (neighbor_labels[:, :, None] == self._class_range).sum(axis=1)
+            labels = np.argmax(votes, axis=1)
+            confidence = votes.max(axis=1) * (100.0 / self.k)
+            # 距离取获胜类别中最近的近邻
+            best = np.where(neighbor_labels == labels[:, None],
+                            np.take_along_axis(squared, nearest, axis=1), np.inf).min(axis=1)
+
+        distance = np.sqrt(best)
+        if self._background is not None:
+            labels = np.where(distance > self.max_distance, self._background, labels)
+        return labels, distance, confidence
+
+    @classmethod
+    def train(cls, features: np.ndarray, labels: List[str], method: str = 'knn', k: int = 5,
+              max_samples_per_class: int = 100, distance_percentile: float = 99.0,
+              rotation_invariant: bool = True, orientation_weight: float = 1.0,
+              seed: int = 0) -> 'PoseClassifier':
+        """
+        训练分类器
+        Args:
+            features: 形状 (N, F) 的特征（需与 rotation_invariant / orientation_weight 一致）
+            labels: 每个样本的类别名称，BACKGROUND 表示背景
+            method: centroid 或 knn
+            k: knn 的近邻数
+            max_samples_per_class: knn 每个类别最多保留的样本数（控制推理开销）
+            distance_percentile: 手势样本距离的该百分位数作为背景拒识阈值
+            seed: 子采样随机种子
+        Returns:
+            训练好的分类器
+        """
+        classes = sorted(set(labels))
+        label_index = np.array([classes.index(name) for name in labels], dtype=np.int64)
+        mean = features.mean(axis=0)
+        std = np.maximum(features.std(axis=0), 1e-6)
+        standardized = (features - mean) / std
+
+        if method == 'centroid':
+            references = np.stack([standardized[label_index == c].mean(axis=0) for c in range(len(classes))])
+            reference_labels = np.arange(len(classes))
+            keep = None
+        else:
+            rng = np.random.default_rng(seed)
+            keep = []
+            for c in range(len(classes)):
+                members = np.flatnonzero(label_index == c)
+                if len(members) > max_samples_per_class:
+                    members = rng.choice(members, max_samples_per_class, replace=False)
+                keep.append(members)
+            keep = np.sort(np.concatenate(keep))
+            references = standardized[keep]
+            reference_labels = label_index[keep]
+
+        model = cls(method, classes, references, reference_labels, mean, std, k,
+                    rotation_invariant=rotation_invariant, orientation_weight=orientation_weight)
+
+        # 背景拒识阈值：手势样本到所属类别的距离分布（knn 排除样本自身，即留一法）
+        if BACKGROUND in classes:
+            gesture_rows = np.flatnonzero(label_index != classes.index(BACKGROUND))
+            squared = model._squared_distances(features[gesture_rows])
+            if keep is not None:
+                position = np.searchsorted(keep, gesture_rows)
+                is_reference = (position < len(keep)) & (keep[np.minimum(position, len(keep) - 1)] == gesture_rows)
+                squared[np.flatnonzero(is_reference), position[is_reference]] = np.inf
+            predicted, distance, _ = model._decide(squared)
+            correct = predicted == label_index[gesture_rows]
+            if correct.any():
+                model.max_distance = float(np.percentile(distance[correct], distance_percentile))
+        return model
+
+    def save(self, path: str):
+        """保存为 .npz 文件"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez_compressed(
+            path,
+            method=self.method,
+            classes=np.array(self.classes, dtype=str),
+            references=self.references,
+            reference_labels=self.reference_labels,
+            mean=self.mean,
+            std=self.std,
+            k=self.k,
+            max_distance=self.max_distance,
+            rotation_invariant=self.rotation_invariant,
+            orientation_weight=self.orientation_weight
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'PoseClassifier':
+        """从 .npz 文件加载"""
+        with np.load(path) as data:
+            return cls(
+                str(data['method']),
+                [str(name) for name in data['classes'].tolist()],
+                data['references'],
+                data['reference_labels'],
+                data['mean'],
+                data['std'],
+                int(data['k']),
+                float(data['max_distance']),
+                bool(data['rotation_invariant']),
+                float(data['orientation_weight'])
+            )
+
+
+class PoseClassifierDetector(StaticGestureDetector):
+    """学习型静态手势检测器，一次分类覆盖模型中的所有手势"""
+
+    supports_batch = True
+
+    def __init__(self, model: PoseClassifier, required_frames: int = 15, min_confidence: float = 60.0,
+                 temporal: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            model: 手型分类器
+            required_frames: consecutive 模式下需要连续检测的帧数
+            min_confidence: 最低分类置信度（0-100），低于该值视为不满足
+            temporal: 时间累积配置，见 config.TEMPORAL_DEFAULTS
+        """
+        super().__init__("PoseClassifier", required_frames, temporal)
+        self.model = model
+        self.min_confidence = min_confidence
+
+    def classify(self, landmarks: np.ndarray, left_hands: Optional[np.ndarray] = None
+                 ) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        批量分类
+        Args:
+            landmarks: 形状 (N, 21, 3) 的关键点数组
+            left_hands: 形状 (N,) 的布尔数组，标记左手
+        Returns:
+            (手势名称列表，背景或置信度不足时为 BACKGROUND, 距离, 置信度)
+        """
+        labels, distance, confidence = self.model.predict(self.model.features(landmarks, left_hands))
+        names = [self.model.classes[label] if score >= self.min_confidence else BACKGROUND
+                 for label, score in zip(labels, confidence)]
+        return names, distance, confidence
+
+    @property
+    def batch_gesture_names(self) -> List[str]:
+        """模型覆盖的手势名称"""
+        return self.model.gesture_names
+
+    def batch_gestures(self, landmarks: np.ndarray, resets: Optional[np.ndarray] = None,
+                       left_hands: Optional[np.ndarray] = None) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """
+        批量检测同一只手的连续帧，结果与逐帧调用 detect 一致
+        Args:
+            landmarks: 形状 (N, 21, 3) 的关键点数组，按时间顺序排列
+            resets: 形状 (N,) 的布尔数组，为 True 的帧之前检测历史被清空
+            left_hands: 形状 (N,) 的布尔数组，标记左手
+        Returns:
+            {手势名称: (形状 (N,) 的布尔数组, 形状 (N,) 的置信度数组)}，只包含出现过的手势
+        """
+        names, _, confidence = self.classify(np.asarray(landmarks, dtype=np.float64), left_hands)
+        names = np.asarray(names, dtype=object)
+        is_gesture = names != BACKGROUND
+        resets = np.zeros(len(names), dtype=bool) if resets is None else np.asarray(resets, dtype=bool)
+
+        results = {}
+        for gesture_name in set(names[is_gesture]):
+            match = names == gesture_name
+            # 逐帧路径中分类结果变为其他手势时累积状态被重置，变为背景时只记一次未满足
+            switched = is_gesture & ~match
+            results[gesture_name] = (self.temporal_batch(match, resets | switched), confidence)
+        return results
+
+    def detect(self, landmarks: List[List[int]], hand_id: str, hand_type: str) -> Optional[Dict[str, Any]]:
+        """
+        检测静态手势
+        Args:
+            landmarks: 手部关键点列表
+            hand_id: 手部ID
+            hand_type: 手部类型
+        Returns:
+            检测结果字典或None
+        """
+        names, distance, confidence = self.classify(np.asarray([landmarks]), np.array([hand_type == "Left"]))
+        gesture_name = names[0]
+        if gesture_name == BACKGROUND:
+            # 不属于任何手势，交给时间累积器处理（consecutive 模式下重置计数）
+            self.register_miss(hand_id)
+            return None
+
+        # 分类结果变化时 check_continuous_detection 会重置累积状态
+        if self.check_continuous_detection(hand_id, gesture_name, float(confidence[0])):
+            return {
+                'gesture': gesture_name,
+                'hand_type': hand_type,
+                'confidence': float(confidence[0]),
+                'details': {
+                    'classifier': self.model.method,
+                    'distance': float(distance[0]),
+                    'frames_detected': self.detection_history[hand_id]['count']
+                }
+            }
+        return None
+
+    def reset(self, hand_id: Optional[str] = None):
+        """重置静态手势检测状态"""
+        self.reset_detection_history(hand_id)
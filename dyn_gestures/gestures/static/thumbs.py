@@ -2,21 +2,25 @@
 大拇指手势检测器 - 静态手势
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
 from ..base import StaticGestureDetector
 from hand_utils import HandUtils
 
 
 class ThumbsDetector(StaticGestureDetector):
     """大拇指手势检测器 - 优化版本"""
+
+    supports_batch = True
     
     def __init__(self, thumb_distance_threshold: float = 0.8, 
                  other_fingers_threshold: float = 0.45,
                  thumb_angle_threshold: float = 30.0,
                  thumb_isolation_threshold: float = 0.6,  # 大拇指与其他手指PIP的最小距离阈值
                  required_frames: int = 15,
-                 type: str = "ThumbsUp"):
-        super().__init__(type, required_frames)
+                 type: str = "ThumbsUp",
+                 temporal: Optional[Dict[str, Any]] = None):
+        super().__init__(type, required_frames, temporal)
         self.type = type  # 手势类型
         self.thumb_distance_threshold = thumb_distance_threshold      # 大拇指距离掌心阈值
         self.other_fingers_threshold = other_fingers_threshold        # 其他手指距离掌心阈值
@@ -114,8 +118,8 @@ class ThumbsDetector(StaticGestureDetector):
                     }
                 }
         else:
-            # 如果不满足基础条件，重置该手的检测历史
-            self.reset_detection_history(hand_id)
+            # 不满足基础条件，交给时间累积器处理（consecutive 模式下重置计数）
+            self.register_miss(hand_id)
         
         return None
     
@@ -165,6 +169,56 @@ class ThumbsDetector(StaticGestureDetector):
         
         return min(100, base_confidence)
     
+    def match_batch(self, landmarks: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """批量判断大拇指手势基础条件并计算置信度，与 detect/_calculate_confidence 逐帧一致"""
+        palm_center = HandUtils.calculate_palm_center_batch(landmarks)
+        palm_base_length = HandUtils.calculate_palm_base_length_batch(landmarks)
+        valid_palm = palm_base_length > 0
+        safe_length = np.where(valid_palm, palm_base_length, 1.0)
+        
+        # 1. 大拇指方向和角度
+        tip_y, ip_y, mcp_y = landmarks[:, 4, 1], landmarks[:, 3, 1], landmarks[:, 2, 1]
+        if self.type == "ThumbsUp":
+            thumb_direction = (tip_y < ip_y) & (ip_y < mcp_y)
+        else:
+            thumb_direction = (tip_y > ip_y) & (ip_y > mcp_y)
+        thumb_angle = HandUtils.calculate_thumb_angle_batch(landmarks)
+        
+        # 2. 大拇指伸出程度
+        thumb_distance_ratio = np.where(
+            valid_palm, HandUtils.calculate_distance_batch(landmarks[:, 4], palm_center) / safe_length, 0.0)
+        
+        # 3. 其他手指贴近掌心，形状 (N, 4)
+        tip_distances = np.hypot(landmarks[:, [8, 12, 16, 20], 0] - palm_center[:, None, 0],
+                                 landmarks[:, [8, 12, 16, 20], 1] - palm_center[:, None, 1])
+        finger_ratios = np.where(valid_palm[:, None], tip_distances / safe_length[:, None], 0.0)
+        fingers_close = finger_ratios < self.other_fingers_threshold
+        
+        # 4. 大拇指与其他手指PIP的最小距离
+        pip_distances = np.hypot(landmarks[:, [6, 10, 14, 18], 0] - landmarks[:, 4, None, 0],
+                                 landmarks[:, [6, 10, 14, 18], 1] - landmarks[:, 4, None, 1])
+        thumb_isolated = valid_palm & (pip_distances.min(axis=1) / safe_length > self.thumb_isolation_threshold)
+        
+        match = (thumb_direction & (thumb_angle < self.thumb_angle_threshold) &
+                 (thumb_distance_ratio > self.thumb_distance_threshold) &
+                 fingers_close.all(axis=1) & thumb_isolated)
+        
+        # 置信度
+        confidence = np.full(len(landmarks), 80.0)
+        confidence += np.select(
+            [thumb_distance_ratio > self.thumb_distance_threshold * 1.3,
+             thumb_distance_ratio > self.thumb_distance_threshold * 1.1,
+             thumb_distance_ratio > self.thumb_distance_threshold],
+            [15, 10, 5], 0)
+        confidence += np.select([thumb_angle < 15, thumb_angle < 25], [10, 5], 0)
+        confidence += fingers_close.sum(axis=1) * 3
+        avg_finger_ratio = finger_ratios.mean(axis=1)
+        confidence += np.select(
+            [avg_finger_ratio < self.other_fingers_threshold * 0.8,
+             avg_finger_ratio < self.other_fingers_threshold * 0.9],
+            [8, 5], 0)
+        return match, np.minimum(100, confidence)
+    
     def reset(self, hand_id: Optional[str] = None):
         """重置静态手势检测状态"""
         self.reset_detection_history(hand_id)
@@ -14,6 +14,15 @@ class HandUtils:
     # 手部关键点索引常量
     FINGERTIPS = [4, 8, 12, 16, 20]  # 拇指尖、食指尖、中指尖、无名指尖、小指尖
     PALM_POINTS = [0, 1, 5, 9, 13, 17]  # 手腕、拇指根、食指根、中指根、无名指根、小指根
+    # 手部骨架连线，按折线分组，便于一次 cv2.polylines 调用绘制全部连线
+    HAND_CONNECTION_CHAINS = [
+        np.array([0, 1, 2, 3, 4]),      # 拇指
+        np.array([0, 5, 6, 7, 8]),      # 食指
+        np.array([9, 10, 11, 12]),      # 中指
+        np.array([13, 14, 15, 16]),     # 无名指
+        np.array([0, 17, 18, 19, 20]),  # 小指
+        np.array([5, 9, 13, 17])        # 掌根横线
+    ]
     
     @staticmethod
     def calculate_palm_center(landmarks: List[List[int]]) -> Tuple[int, int]:
@@ -208,6 +217,27 @@ class HandUtils:
         # 如果手指间距离大于手掌基准长度的指定比例，认为是张开的
         return fingers_distance > palm_base_length * reference_length_ratio
     
+    @staticmethod
+    def draw_landmarks(img, landmarks: List[List[int]], 
+                       connection_color: Tuple[int, int, int] = (224, 224, 224),
+                       point_color: Tuple[int, int, int] = (0, 0, 255),
+                       thickness: int = 2, radius: int = 4):
+        """
+        在图像上绘制手部关键点和骨架连线（直接使用像素坐标，无需构造protobuf）
+        Args:
+            img: 图像
+            landmarks: 手部关键点列表（像素坐标）
+            connection_color: 连线颜色 (B, G, R)
+            point_color: 关键点颜色 (B, G, R)
+            thickness: 连线粗细
+            radius: 关键点半径
+        """
+        points = np.asarray(landmarks, dtype=np.int32)[:, :2]
+        chains = [points[chain] for chain in HandUtils.HAND_CONNECTION_CHAINS]
+        cv2.polylines(img, chains, False, connection_color, thickness, cv2.LINE_AA)
+        for x, y in points:
+            cv2.circle(img, (int(x), int(y)), radius, point_color, -1)
+    
     @staticmethod
     def draw_palm_center(img, palm_center: Tuple[int, int], color: Tuple[int, int, int] = (0, 255, 255)):
         """
@@ -296,4 +326,76 @@ class HandUtils:
         distance_ratio = thumb_to_palm_distance / palm_base_length if palm_base_length > 0 else 1.0
         
         # 如果距离小于阈值，认为拇指靠近掌心
-        return distance_ratio < distance_threshold_percent
\ No newline at end of file
+        return distance_ratio < distance_threshold_percent
+
+    # ---- 批量计算（landmarks 为形状 (N, 21, 3) 的数组，返回逐帧结果，与单帧方法逐帧一致） ----
+    
+    @staticmethod
+    def calculate_palm_center_batch(landmarks: np.ndarray) -> np.ndarray:
+        """
+        批量计算手掌中心
+        Args:
+            landmarks: 形状 (N, 21, 3) 的关键点数组
+        Returns:
+            形状 (N, 2) 的手掌中心坐标（与单帧方法一样取整）
+        """
+        return np.trunc(landmarks[:, HandUtils.PALM_POINTS, :2].mean(axis=1))
+    
+    @staticmethod
+    def calculate_distance_batch(p1: np.ndarray, p2: np.ndarray) -> np.ndarray:
+        """
+        批量计算两点之间的距离（只使用x, y）
+        Args:
+            p1: 形状 (N, 2+) 的点数组
+            p2: 形状 (N, 2+) 的点数组
+        Returns:
+            形状 (N,) 的距离
+        """
+        return np.hypot(p1[:, 0] - p2[:, 0], p1[:, 1] - p2[:, 1])
+    
+    @staticmethod
+    def calculate_palm_base_length_batch(landmarks: np.ndarray) -> np.ndarray:
+        """批量计算手掌基准长度（手腕到中指根部的距离）"""
+        return HandUtils.calculate_distance_batch(landmarks[:, 0], landmarks[:, 9])
+    
+    @staticmethod
+    def is_finger_extended_batch(landmarks: np.ndarray, finger_tip_index: int,
+                                 finger_pip_index: int, finger_mcp_index: int,
+                                 distance_threshold_percent: float = 0.6) -> np.ndarray:
+        """批量判断手指是否伸直且朝上，参数含义同 is_finger_extended"""
+        tip_y = landmarks[:, finger_tip_index, 1]
+        pip_y = landmarks[:, finger_pip_index, 1]
+        mcp_y = landmarks[:, finger_mcp_index, 1]
+        tip_to_wrist_dist = HandUtils.calculate_distance_batch(landmarks[:, finger_tip_index], landmarks[:, 0])
+        extended = tip_to_wrist_dist > HandUtils.calculate_palm_base_length_batch(landmarks) * distance_threshold_percent
+        return extended & (tip_y < pip_y) & (pip_y < mcp_y)
+    
+    @staticmethod
+    def is_finger_bent_batch(landmarks: np.ndarray, finger_tip_index: int, finger_pip_index: int) -> np.ndarray:
+        """批量判断手指是否弯曲（指尖Y坐标大于PIP关节）"""
+        return landmarks[:, finger_tip_index, 1] > landmarks[:, finger_pip_index, 1]
+    
+    @staticmethod
+    def calculate_thumb_angle_batch(landmarks: np.ndarray) -> np.ndarray:
+        """批量计算大拇指与垂直方向的夹角（度），拇指长度为0时为90度"""
+        vector = landmarks[:, 4, :2] - landmarks[:, 2, :2]
+        length = np.hypot(vector[:, 0], vector[:, 1])
+        safe_length = np.where(length == 0, 1.0, length)
+        cos_angle = np.minimum(1.0, np.abs(vector[:, 1]) / safe_length)
+        return np.where(length == 0, 90.0, np.degrees(np.arccos(cos_angle)))
+    
+    @staticmethod
+    def check_fingers_spread_batch(landmarks: np.ndarray, finger1_index: int,
+                                   finger2_index: int, reference_length_ratio: float = 0.3) -> np.ndarray:
+        """批量检查两个手指是否分开，参数含义同 check_fingers_spread"""
+        fingers_distance = HandUtils.calculate_distance_batch(landmarks[:, finger1_index], landmarks[:, finger2_index])
+        return fingers_distance > HandUtils.calculate_palm_base_length_batch(landmarks) * reference_length_ratio
+    
+    @staticmethod
+    def is_thumb_close_to_palm_batch(landmarks: np.ndarray, distance_threshold_percent: float = 0.4) -> np.ndarray:
+        """批量判断拇指是否靠近掌心，参数含义同 is_thumb_close_to_palm"""
+        palm_center = HandUtils.calculate_palm_center_batch(landmarks)
+        palm_base_length = HandUtils.calculate_palm_base_length_batch(landmarks)
+        distance = HandUtils.calculate_distance_batch(landmarks[:, 4], palm_center)
+        ratio = np.divide(distance, palm_base_length, out=np.ones_like(distance), where=palm_base_length > 0)
+        return ratio < distance_threshold_percent
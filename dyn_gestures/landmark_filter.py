@@ -0,0 +1,131 @@
+"""
+关键点平滑 - 对每只手的 21x3 关键点整体做 One-Euro 滤波
+
+One-Euro 滤波器的截止频率随运动速度自适应：手静止时截止频率低、抖动被压住；
+手快速移动时截止频率升高、延迟很小。静态手势检测器因此不会因为单帧抖动而中断连续计数，
+可以用更少的 required_frames 达到相同的稳定性。
+"""
+
+import math
+from typing import List, Dict, Optional
+
+import numpy as np
+
+import config
+
+
+class OneEuroFilter:
+    """向量化 One-Euro 滤波器，一次处理整个关键点数组"""
+
+    def __init__(self, min_cutoff: float, beta: float, d_cutoff: float, default_dt: float):
+        """
+        Args:
+            min_cutoff: 最小截止频率（Hz），越小静止时越平滑
+            beta: 速度系数，越大快速运动时延迟越小
+            d_cutoff: 速度估计的截止频率（Hz）
+            default_dt: 时间戳无效（不递增）时使用的帧间隔（秒）
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.default_dt = default_dt
+        self.x_prev: Optional[np.ndarray] = None
+        self.dx_prev: Optional[np.ndarray] = None
+        self.t_prev = 0.0
+
+    @staticmethod
+    def _alpha(cutoff, dt: float):
+        """由截止频率和帧间隔计算平滑系数"""
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, x: np.ndarray, timestamp: float) -> np.ndarray:
+        """
+        滤波一帧
+        Args:
+            x: 关键点数组（float64）
+            timestamp: 时间戳（秒）
+        Returns:
+            平滑后的关键点数组
+        """
+        if self.x_prev is None:
+            self.x_prev = x
+            self.dx_prev = np.zeros_like(x)
+            self.t_prev = timestamp
+            return x
+
+        dt = timestamp - self.t_prev
+        if dt <= 0:
+            dt = self.default_dt
+        self.t_prev = timestamp
+
+        dx = (x - self.x_prev) / dt
+        dx_hat = self.dx_prev + self._alpha(self.d_cutoff, dt) * (dx - self.dx_prev)
+        cutoff = self.min_cutoff + self.beta * np.abs(dx_hat)
+        x_hat = self.x_prev + self._alpha(cutoff, dt) * (x - self.x_prev)
+
+        self.x_prev = x_hat
+        self.dx_prev = dx_hat
+        return x_hat
+
+
+class LandmarkSmoother:
+    """按手部ID维护滤波状态的关键点平滑器"""
+
+    def __init__(self, smoothing_config: Optional[Dict] = None):
+        """
+        Args:
+            smoothing_config: 平滑参数，默认使用 config.SMOOTHING_CONFIG
+        """
+        self.config = smoothing_config or config.SMOOTHING_CONFIG
+        self.filters: Dict[str, OneEuroFilter] = {}
+
+    def _create_filter(self) -> OneEuroFilter:
+        return OneEuroFilter(
+            self.config['min_cutoff'],
+            self.config['beta'],
+            self.config['d_cutoff'],
+            1.0 / config.CAMERA_FPS
+        )
+
+    def filter(self, landmarks: List[List[int]], hand_id: str, timestamp: float) -> List[List[int]]:
+        """
+        平滑一只手的一帧关键点
+        Args:
+            landmarks: 手部关键点列表
+            hand_id: 手部ID
+            timestamp: 时间戳（秒）
+        Returns:
+            平滑后的关键点列表（整数像素坐标，与 findHands 输出格式一致）
+        """
+        hand_filter = self.filters.get(hand_id)
+        if hand_filter is None:
+            hand_filter = self.filters[hand_id] = self._create_filter()
+        smoothed = hand_filter(np.asarray(landmarks, dtype=np.float64), timestamp)
+        return np.rint(smoothed).astype(int).tolist()
+
+    def filter_sequence(self, landmarks: np.ndarray, timestamps: np.ndarray,
+                        resets: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        平滑同一只手的连续帧（离线批量检测用，不影响实时状态），结果与逐帧调用 filter 一致
+        Args:
+            landmarks: 形状 (N, 21, 3) 的关键点数组
+            timestamps: 形状 (N,) 的时间戳
+            resets: 形状 (N,) 的布尔数组，为 True 的帧重新开始滤波
+        Returns:
+            形状 (N, 21, 3) 的平滑结果（已取整）
+        """
+        output = np.empty(landmarks.shape, dtype=np.float64)
+        hand_filter = self._create_filter()
+        for i in range(len(landmarks)):
+            if resets is not None and resets[i]:
+                hand_filter = self._create_filter()
+            output[i] = hand_filter(np.asarray(landmarks[i], dtype=np.float64), float(timestamps[i]))
+        return np.rint(output)
+
+    def reset(self, hand_id: Optional[str] = None):
+        """重置滤波状态"""
+        if hand_id is None:
+            self.filters.clear()
+        else:
+            self.filters.pop(hand_id, None)
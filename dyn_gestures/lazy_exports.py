@@ -0,0 +1,31 @@
+"""
+按需导入 - 包的 __init__ 只声明导出的名称，首次访问时才导入对应子模块
+
+用法（在包的 __init__.py 中）：
+
+    _EXPORTS = {'ActionExecutor': '.action_executor'}
+    __getattr__ = lazy_exports(__name__, _EXPORTS)
+"""
+
+import importlib
+import sys
+from typing import Any, Callable, Dict
+
+
+def lazy_exports(package_name: str, exports: Dict[str, str]) -> Callable[[str], Any]:
+    """
+    创建模块级 __getattr__（PEP 562）
+    Args:
+        package_name: 包名（__name__）
+        exports: {导出名称: 相对子模块名}
+    Returns:
+        __getattr__ 函数；导入后把结果写回包的属性，之后的访问不再经过它
+    """
+    def __getattr__(name: str) -> Any:
+        if name not in exports:
+            raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(exports[name], package_name), name)
+        setattr(sys.modules[package_name], name, value)
+        return value
+
+    return __getattr__
@@ -2,11 +2,22 @@
 使用模块化架构的手势检测应用
 """
 
+import time
+
+# 进程启动时间，启动指标从这里开始计时（包含下面导入 mediapipe / OpenCV 的冷启动耗时）
+_start_time = time.time()
+
 from cvzone.HandTrackingModule import HandDetector
 import cv2
-import time
 from gesture_manager import GestureManager
-from hand_utils import HandUtils
+from gesture_events import STARTED, HELD
+from overlay import HandOverlay
+from motion_gate import MotionGate
+from frame_governor import FrameGovernor
+from frame_buffers import FrameBufferPool
+from frame_ring import open_capture
+from startup_metrics import StartupMetrics
+from session import SessionRecorder
 import config
 
 
@@ -14,14 +25,18 @@ class HandGestureApp:
     """手势检测应用主类"""
     
     def __init__(self):
-        # 初始化摄像头
-        self.cap = cv2.VideoCapture(config.CAMERA_INDEX)
-        # 设置摄像头分辨率
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, config.CAMERA_FRAME_WIDTH)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config.CAMERA_FRAME_HEIGHT)
+        # 启动耗时指标（启动到检测器就绪、到第一个手势）
+        self.startup = StartupMetrics("main", _start_time)
+        
+        # 初始化摄像头并设置分辨率和FPS（CAPTURE_PROCESS_CONFIG 启用时在独立进程中采集）
+        self.cap = open_capture(config.CAMERA_INDEX)
+        
+        # 采集和翻转复用图像缓冲区
+        self.frame_buffers = FrameBufferPool()
         
-        # 设置摄像头FPS
-        self.cap.set(cv2.CAP_PROP_FPS, config.CAMERA_FPS)
+        # 镜像显示时只镜像关键点坐标，整帧翻转推迟到渲染阶段
+        self.flip_image = config.DISPLAY_CONFIG['flip_image']
+        self.mirror_landmarks = self.flip_image and config.DISPLAY_CONFIG['mirror_landmarks']
         
         # 初始化手部检测器
         self.detector = HandDetector(
@@ -31,10 +46,26 @@ class HandGestureApp:
             detectionCon=config.HAND_DETECTION_CONFIG['detection_confidence'],
             minTrackCon=config.HAND_DETECTION_CONFIG['min_tracking_confidence']
         )
+        # 启动时预热模型，第一次举手时不再等待模型初始化
+        self.detector.warm_up()
+        self.startup.detector_ready(self.detector)
         
         # 初始化手势管理器
         self.gesture_manager = GestureManager()
         
+        # 画面静止且没有手时跳过推理
+        self.motion_gate = MotionGate()
+        
+        # 会话录制（可选）
+        self.recorder = SessionRecorder.create_default("camera") if config.RECORDING_CONFIG['enabled'] else None
+        
+        # 叠加层只在显示摄像头窗口时渲染
+        self.overlay = HandOverlay(self.detector)
+        self.show_window = config.DISPLAY_CONFIG['show_camera_window']
+        
+        # 按延迟预算调整采集帧率、推理分辨率、最大手数和叠加层帧率
+        self.governor = FrameGovernor(self.cap, self.detector, self.overlay if self.show_window else None)
+        
         # 显示状态
         self.gesture_message = ""
         self.gesture_timer = 0
@@ -42,9 +73,6 @@ class HandGestureApp:
         # 运行状态
         self.running = True
         
-        # 静态手势输出控制 - 避免重复刷屏
-        self.last_printed_gesture = None  # 记录上一次打印的任何手势 (gesture_key)
-        
         # FPS计算相关
         self.fps_counter = 0
         self.fps_start_time = time.time()
@@ -67,104 +95,86 @@ class HandGestureApp:
             self.fps_start_time = current_time
     
     def process_frame(self, img):
-        """处理单帧图像"""
+        """
+        处理单帧图像
+        Returns:
+            需要显示的图像；本帧不需要渲染时返回None
+        """
         # 更新FPS计算
         self.update_fps()
         
-        # 左右翻转摄像头画面（如果配置启用）
-        if config.DISPLAY_CONFIG['flip_image']:
-            img = cv2.flip(img, 1)
+        # 左右翻转摄像头画面（如果配置启用且不使用关键点镜像）
+        if self.flip_image and not self.mirror_landmarks:
+            img = self.frame_buffers.flip(img, 1)
         
-        # 检测手部
-        hands, img = self.detector.findHands(
-            img, 
-            draw=config.DISPLAY_CONFIG['show_landmarks'], 
-            flipType=not config.DISPLAY_CONFIG['flip_image']
-        )
+        # 检测手部（绘制交给叠加层阶段），空闲且画面静止时跳过
+        hands = []
+        if self.motion_gate.should_infer(img):
+            hands, img = self.detector.findHands(
+                img, 
+                draw=False, 
+                flipType=self.mirror_landmarks or not self.flip_image,
+                mirror=self.mirror_landmarks
+            )
+            self.motion_gate.update(bool(hands))
+        self.governor.mark('inference')
         
+        recorded_hands = []
         if hands:  
             for i, hand in enumerate(hands):
                 hand_id = f"hand_{i}"
                 landmarks = hand["lmList"]
                 hand_type = hand["type"]
                 
-                # 使用手势管理器检测手势
-                detected_gestures = self.gesture_manager.detect_gestures(
+                # 使用手势管理器检测手势，并转换为 started / held / released 事件
+                detected_gestures, events = self.gesture_manager.detect_events(
                     landmarks, hand_id, hand_type
                 )
+                recorded_hands.append({
+                    'hand_id': hand_id, 'hand_type': hand_type, 'landmarks': landmarks,
+                    'gestures': [gesture['gesture'] for gesture in detected_gestures]
+                })
 
-                if detected_gestures:
-                    # 处理检测到的手势
-                    for gesture in detected_gestures:
-                        self.handle_gesture_result(gesture)
-                else:
-                    self.last_printed_gesture = None
-                
-                # 绘制手部信息
-                self.draw_hand_info(img, hand, i)
+                for event in events:
+                    self.handle_gesture_event(event)
         else:
             # 没有检测到手时，重置静态手势跟踪和检测历史
-            self.last_printed_gesture = None
-            self.gesture_manager.on_all_hands_lost()
+            for event in self.gesture_manager.on_all_hands_lost():
+                self.handle_gesture_event(event)
+        
+        if self.recorder:
+            self.recorder.record_frame(time.time(), recorded_hands)
+        self.governor.mark('gestures')
         
-        # 绘制手势消息
+        # 手势消息按检测帧计时，与是否渲染无关
+        gesture_message = self.gesture_message if self.gesture_timer > 0 else ""
         if self.gesture_timer > 0:
-            HandUtils.draw_gesture_message(img, self.gesture_message, config.COLORS['gesture_message'])
             self.gesture_timer -= 1
         
-        # 绘制FPS（如果配置启用）
-        if config.DISPLAY_CONFIG['show_fps']:
-            HandUtils.draw_fps(img, self.current_fps, config.COLORS['fps_text'])
+        # 没有窗口或未到渲染时间时跳过所有绘制
+        if not self.show_window or not self.overlay.should_render():
+            return None
         
-        return img
+        if self.mirror_landmarks:
+            img = self.frame_buffers.flip(img, 1)
+        return self.overlay.render(img, hands, gesture_message, self.current_fps)
     
-    def handle_gesture_result(self, gesture_result):
-        """处理手势检测结果"""
-        gesture_name = gesture_result['gesture']
-        hand_type = gesture_result['hand_type']
-        confidence = gesture_result.get('confidence', 0)
+    def handle_gesture_event(self, event):
+        """处理手势事件：started 另起一行打印，held 用 \r 覆盖同一行，released 只结束显示"""
+        self.startup.gesture_event(event)
+        if event.type not in (STARTED, HELD):
+            return
         
         # 使用检测器提供的显示消息
-        self.gesture_message = gesture_result.get('display_message', f"{hand_type} Hand: {gesture_name}")
+        self.gesture_message = event.display_message or f"{event.hand_type} Hand: {event.gesture}"
         self.gesture_timer = config.DISPLAY_CONFIG['gesture_message_duration']
 
-        gesture_key = f"{hand_type}_{gesture_name}"
-        message = f"检测到手势: {gesture_name}, 手部: {hand_type}, 置信度: {confidence:.1f}%"
-
-        if self.last_printed_gesture == gesture_key and gesture_name in config.GESTURE_TYPES['static_gestures']:
-            # 连续相同的静态手势，用 \r 覆盖
-            print(f"\r{message}", end='', flush=True)
+        message = f"检测到手势: {event.gesture}, 手部: {event.hand_type}, 置信度: {event.confidence:.1f}%"
+        if event.type == HELD:
+            print(f"\r{message}, 已保持 {event.duration:.1f}s", end='', flush=True)
         else:
             print()
             print(message, end='', flush=True)
-
-        self.last_printed_gesture = gesture_key
-    
-    def draw_hand_info(self, img, hand, hand_index):
-        """绘制手部信息"""
-        landmarks = hand["lmList"]
-        hand_type = hand["type"]
-        
-        # 计算并绘制手掌中心
-        palm_center = HandUtils.calculate_palm_center(landmarks)
-        if config.DISPLAY_CONFIG['show_palm_center']:
-            HandUtils.draw_palm_center(img, palm_center, config.COLORS['palm_center'])
-        
-        # 计算手指数量（使用cvzone的方法）
-        fingers = self.detector.fingersUp(hand)
-        finger_count = fingers.count(1)
-        
-        # 准备显示信息
-        info_dict = {
-            'Fingers': finger_count,
-            'Palm': f'({palm_center[0]}, {palm_center[1]})'
-        }
-        
-        # 绘制信息
-        HandUtils.draw_text_info(
-            img, hand_type, info_dict, 
-            position_offset=hand_index * 120
-        )
     
     def handle_window_events(self):
         """处理窗口事件"""
@@ -200,7 +210,9 @@ class HandGestureApp:
         
         while self.running:
             # 读取帧
-            success, img = self.cap.read()
+            self.governor.begin_frame()
+            success, img = self.frame_buffers.read(self.cap)
+            self.governor.mark('capture')
             if not success:
                 print("无法读取摄像头数据")
                 continue
@@ -212,8 +224,9 @@ class HandGestureApp:
             self.update_fps()
             
             # 显示图像（如果配置启用）
-            if config.DISPLAY_CONFIG['show_camera_window']:
-                cv2.imshow(config.DISPLAY_CONFIG['window_name'], img)
+            if self.show_window:
+                if img is not None:
+                    cv2.imshow(config.DISPLAY_CONFIG['window_name'], img)
                 # 处理窗口事件
                 self.handle_window_events()
             else:
@@ -221,6 +234,8 @@ class HandGestureApp:
                 key = cv2.waitKey(1) & 0xFF
                 if key == ord('q'):
                     self.running = False
+            self.governor.mark('overlay')
+            self.governor.end_frame()
         
         self.cleanup()
     
@@ -229,6 +244,9 @@ class HandGestureApp:
         print("\n正在关闭应用...")
         self.cap.release()
         
+        if self.recorder:
+            self.recorder.close()
+        
         # 只有在显示窗口时才需要销毁窗口
         if config.DISPLAY_CONFIG['show_camera_window']:
             cv2.destroyAllWindows()
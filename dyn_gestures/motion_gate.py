@@ -0,0 +1,105 @@
+"""
+运动门控 - 画面静止且没有手时跳过手部关键点推理
+
+连续一段时间没有检测到手后进入空闲模式：每帧只计算一张很小的灰度缩略图并与上一帧做差分，
+画面出现运动时当帧立即恢复全速推理；画面完全静止时按低频探测推理，
+以发现缓慢或静止进入画面的手。检测到手后回到全速模式。
+"""
+
+import time
+from typing import Dict, Any, Optional
+
+import cv2
+import numpy as np
+
+from clock import Clock
+import config
+
+
+class MotionGate:
+    """基于缩略图帧差的推理门控"""
+
+    def __init__(self, gate_config: Optional[Dict[str, Any]] = None, clock: Optional[Clock] = None):
+        """
+        Args:
+            gate_config: 门控配置，缺省项使用 config.MOTION_GATE_CONFIG
+            clock: 时间源，默认使用 time.monotonic
+        """
+        gate_config = {**config.MOTION_GATE_CONFIG, **(gate_config or {})}
+        self.enabled = gate_config['enabled']
+        self.idle_delay = gate_config['idle_delay']
+        self.probe_interval = 1.0 / gate_config['probe_rate'] if gate_config['probe_rate'] > 0 else float('inf')
+        self.thumbnail_size = tuple(gate_config['thumbnail_size'])
+        self.pixel_threshold = gate_config['pixel_threshold']
+        self.min_changed_pixels = gate_config['motion_ratio'] * self.thumbnail_size[0] * self.thumbnail_size[1]
+        self.clock = clock or time.monotonic
+
+        self.idle = False
+        self.last_active_time = self.clock()
+        self.last_inference_time = float('-inf')
+        self.previous_thumbnail = None
+        self.stats = {'inferred': 0, 'skipped': 0, 'motion_wakeups': 0, 'probes': 0}
+
+    def should_infer(self, img) -> bool:
+        """
+        判断本帧是否需要做手部推理
+        Args:
+            img: BGR 图像
+        Returns:
+            是否推理；返回 False 时调用方按“没有手”处理本帧
+        """
+        if not self.enabled:
+            return self._infer(self.clock())
+
+        now = self.clock()
+        if not self.idle:
+            if now - self.last_active_time < self.idle_delay:
+                return self._infer(now)
+            self.idle = True
+            self.previous_thumbnail = None
+
+        thumbnail = self._thumbnail(img)
+        previous, self.previous_thumbnail = self.previous_thumbnail, thumbnail
+        if previous is not None and self._has_motion(previous, thumbnail):
+            # 画面有运动，当帧恢复全速推理
+            self.idle = False
+            self.last_active_time = now
+            self.stats['motion_wakeups'] += 1
+            return self._infer(now)
+
+        if now - self.last_inference_time >= self.probe_interval:
+            self.stats['probes'] += 1
+            return self._infer(now)
+
+        self.stats['skipped'] += 1
+        return False
+
+    def update(self, hands_found: bool):
+        """
+        报告推理结果
+        Args:
+            hands_found: 本帧是否检测到手
+        """
+        if hands_found:
+            self.idle = False
+            self.last_active_time = self.clock()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """门控统计：推理/跳过帧数、运动唤醒和低频探测次数"""
+        return {**self.stats, 'idle': self.idle}
+
+    def _infer(self, now: float) -> bool:
+        """记录一次推理"""
+        self.last_inference_time = now
+        self.stats['inferred'] += 1
+        return True
+
+    def _thumbnail(self, img) -> np.ndarray:
+        """缩小为灰度缩略图（双线性采样比区域平均快一个数量级，传感器噪声由 pixel_threshold 吸收）"""
+        small = cv2.resize(img, self.thumbnail_size, interpolation=cv2.INTER_LINEAR)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+
+    def _has_motion(self, previous: np.ndarray, current: np.ndarray) -> bool:
+        """变化超过阈值的像素数是否足够多"""
+        changed = np.count_nonzero(cv2.absdiff(previous, current) > self.pixel_threshold)
+        return changed >= self.min_changed_pixels
@@ -0,0 +1,346 @@
+"""
+多摄像头采集 - 每个摄像头一个采集+推理 worker 进程，关键点经共享内存汇总到融合进程
+
+每个 worker 进程独立运行 cv2.VideoCapture、运动门控和 HandDetector（各自持有一个 landmarker，互不受 GIL 限制），
+每帧把手部关键点写入自己的共享内存槽（multiprocessing.shared_memory，定长 numpy 结构，读写由锁保护）。
+融合进程（守护进程主循环）按 fusion_fps 读取各槽的最新结果，去除被多个摄像头同时看到的同一只手，
+再交给唯一的 GestureManager。
+
+去重依据：不同摄像头、左右手相同、归一化手型（旋转和尺度无关）足够接近时视为同一只手，
+保留上一轮已在使用的观测，否则保留包围框最大（离摄像头最近、最清晰）的观测。
+两个人在不同摄像头前用同一只手做同一个手型时也会被合并，这是不做摄像头标定时的取舍。
+
+    python daemon.py --sources 0 1 2
+"""
+
+import multiprocessing
+import time
+from multiprocessing import shared_memory
+from typing import List, Dict, Any, Optional, Sequence, Set
+
+import cv2
+import numpy as np
+
+from gestures.static.pose_classifier import pose_features
+from session.recorder import encode_hand_type, decode_hand_type
+import config
+
+
+# worker 状态
+STARTING = 0
+RUNNING = 1
+FAILED = 2
+STOPPED = 3
+
+STATE_NAMES = {STARTING: 'starting', RUNNING: 'running', FAILED: 'failed', STOPPED: 'stopped'}
+
+
+def slot_dtype(max_hands: int) -> np.dtype:
+    """共享内存槽的定长结构"""
+    return np.dtype([
+        ('sequence', '<u8'),                     # 每写入一帧加1
+        ('timestamp', '<f8'),                    # 采集时间（time.time）
+        ('frame', '<u8'),                        # 帧序号
+        ('state', 'u1'),                         # worker 状态
+        ('count', 'u1'),                         # 本帧手数
+        ('hand_type', 'u1', (max_hands,)),       # 0=Left, 1=Right
+        ('bbox', '<i4', (max_hands, 4)),         # 包围框 (x, y, w, h)
+        ('landmarks', '<f4', (max_hands, 21, 3)) # 关键点像素坐标
+    ])
+
+
+def parse_source(source):
+    """命令行中的数字视为摄像头编号，其余视为视频文件或流地址"""
+    return int(source) if isinstance(source, str) and source.isdigit() else source
+
+
+class CameraSlot:
+    """一个摄像头 worker 的共享内存结果槽"""
+
+    def __init__(self, max_hands: int, lock, name: Optional[str] = None):
+        """
+        Args:
+            max_hands: 每帧最多保存的手数
+            lock: 跨进程锁（multiprocessing.Lock）
+            name: 已有共享内存的名称，None 时新建
+        """
+        self.max_hands = max_hands
+        self.lock = lock
+        self.dtype = slot_dtype(max_hands)
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=self.dtype.itemsize)
+        self.array = np.ndarray((1,), dtype=self.dtype, buffer=self.shm.buf)
+        if self.owner:
+            self.array[0] = np.zeros((), dtype=self.dtype)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def set_state(self, state: int):
+        """设置 worker 状态"""
+        with self.lock:
+            self.array['state'][0] = state
+
+    def write(self, hands: List[Dict[str, Any]], timestamp: float, frame: int):
+        """
+        写入一帧结果
+        Args:
+            hands: findHands 返回的手部列表
+            timestamp: 采集时间
+            frame: 帧序号
+        """
+        count = min(len(hands), self.max_hands)
+        with self.lock:
+            record = self.array
+            for i in range(count):
+                record['hand_type'][0, i] = encode_hand_type(hands[i]["type"])
+                record['bbox'][0, i] = hands[i]["bbox"]
+                record['landmarks'][0, i] = hands[i]["lmList"]
+            record['count'][0] = count
+            record['timestamp'][0] = timestamp
+            record['frame'][0] = frame
+            record['sequence'][0] += 1
+
+    def read(self) -> np.void:
+        """复制一份当前结果（锁内只做一次内存拷贝）"""
+        with self.lock:
+            return self.array[0].copy()
+
+    def close(self):
+        """关闭共享内存，创建者同时释放它"""
+        self.array = None
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def camera_worker(camera_index: int, source, slot_name: str, max_hands: int, lock, stop_event):
+    """
+    摄像头 worker 进程：采集、运动门控、手部推理，把关键点写入共享内存槽
+    Args:
+        camera_index: 摄像头序号（用于日志）
+        source: cv2.VideoCapture 的参数
+        slot_name: 共享内存名称
+        max_hands: 最大检测手数
+        lock: 共享内存槽的锁
+        stop_event: 停止事件
+    """
+    from motion_gate import MotionGate
+    from frame_buffers import FrameBufferPool
+
+    slot = CameraSlot(max_hands, lock, slot_name)
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        print(f"摄像头 {camera_index} 无法打开: {source}")
+        slot.set_state(FAILED)
+        slot.close()
+        return
+
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, config.CAMERA_FRAME_WIDTH)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config.CAMERA_FRAME_HEIGHT)
+    cap.set(cv2.CAP_PROP_FPS, config.CAMERA_FPS)
+    try:
+        from cvzone.HandTrackingModule import HandDetector
+        detector = HandDetector(
+            maxHands=max_hands,
+            detectionCon=config.HAND_DETECTION_CONFIG['detection_confidence'],
+            minTrackCon=config.HAND_DETECTION_CONFIG['min_tracking_confidence']
+        )
+        detector.warm_up()
+    except Exception as e:
+        print(f"摄像头 {camera_index} 初始化检测器失败: {e}")
+        slot.set_state(FAILED)
+        cap.release()
+        slot.close()
+        return
+
+    motion_gate = MotionGate()
+    buffers = FrameBufferPool()
+    flip_image = config.DISPLAY_CONFIG['flip_image']
+    mirror = flip_image and config.DISPLAY_CONFIG['mirror_landmarks']
+    slot.set_state(RUNNING)
+    frame = 0
+    failures = 0
+    max_failures = config.MULTI_CAMERA_CONFIG['max_read_failures']
+    try:
+        while not stop_event.is_set():
+            success, img = buffers.read(cap)
+            if not success:
+                failures += 1
+                if failures >= max_failures:
+                    print(f"摄像头 {camera_index} 连续 {failures} 次读取失败，停止采集")
+                    break
+                time.sleep(0.01)
+                continue
+            failures = 0
+            if flip_image and not mirror:
+                img = buffers.flip(img, 1)
+
+            hands = []
+            if motion_gate.should_infer(img):
+                hands, _ = detector.findHands(img, draw=False, flipType=mirror or not flip_image, mirror=mirror)
+                motion_gate.update(bool(hands))
+            frame += 1
+            slot.write(hands, time.time(), frame)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        slot.set_state(STOPPED)
+        cap.release()
+        slot.close()
+
+
+class HandFusion:
+    """合并多个摄像头的手部观测，去除重复的同一只手"""
+
+    def __init__(self, duplicate_threshold: float):
+        """
+        Args:
+            duplicate_threshold: 归一化手型的均方根距离（手掌基准长度为单位）小于该值视为同一只手
+        """
+        self.duplicate_threshold = duplicate_threshold
+        self.previous_ids: Set[str] = set()
+        self.duplicates = 0
+
+    def fuse(self, observations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Args:
+            observations: 手部观测列表，每项包含 hand_id、camera、type、lmList、bbox
+        Returns:
+            去重后的手部列表（保持输入顺序）
+        """
+        if len(observations) > 1 and len({obs['camera'] for obs in observations}) > 1:
+            landmarks = np.array([obs['lmList'] for obs in observations], dtype=np.float64)
+            left = np.array([obs['type'] == 'Left' for obs in observations])
+            shapes = pose_features(landmarks, left, rotation_invariant=True, orientation_weight=0.0)[:, :40]
+
+            # 上一轮在用的观测优先（手势状态不因切换摄像头而中断），其次包围框大的
+            order = sorted(range(len(observations)),
+                           key=lambda i: (observations[i]['hand_id'] not in self.previous_ids,
+                                          -observations[i]['bbox'][2] * observations[i]['bbox'][3]))
+            kept = []
+            for i in order:
+                if not any(observations[j]['camera'] != observations[i]['camera']
+                           and observations[j]['type'] == observations[i]['type']
+                           and np.sqrt(((shapes[i] - shapes[j]) ** 2).sum() / 20) < self.duplicate_threshold
+                           for j in kept):
+                    kept.append(i)
+            self.duplicates += len(observations) - len(kept)
+            observations = [observations[i] for i in sorted(kept)]
+
+        self.previous_ids = {obs['hand_id'] for obs in observations}
+        return observations
+
+
+class MultiCameraPipeline:
+    """多摄像头 worker 进程管理与结果融合"""
+
+    def __init__(self, sources: Sequence, camera_config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            sources: 每个摄像头的 cv2.VideoCapture 参数（编号或路径）
+            camera_config: 多摄像头配置，缺省项使用 config.MULTI_CAMERA_CONFIG
+        """
+        self.camera_config = {**config.MULTI_CAMERA_CONFIG, **(camera_config or {})}
+        self.sources = [parse_source(source) for source in sources]
+        self.max_hands = self.camera_config['max_hands']
+        self.fusion_interval = 1.0 / self.camera_config['fusion_fps']
+        self.stale_timeout = self.camera_config['stale_timeout']
+        self.fusion = HandFusion(self.camera_config['duplicate_threshold'])
+
+        self.context = multiprocessing.get_context('spawn')
+        self.stop_event = None
+        self.slots: List[CameraSlot] = []
+        self.processes = []
+        self.last_sequences: List[int] = []
+        self.last_fusion = 0.0
+        self.fusions = 0
+
+    def start(self):
+        """为每个摄像头创建共享内存槽并启动 worker 进程"""
+        self.stop_event = self.context.Event()
+        for index, source in enumerate(self.sources):
+            slot = CameraSlot(self.max_hands, self.context.Lock())
+            process = self.context.Process(
+                target=camera_worker,
+                args=(index, source, slot.name, self.max_hands, slot.lock, self.stop_event),
+                name=f"CameraWorker-{index}",
+                daemon=True
+            )
+            process.start()
+            self.slots.append(slot)
+            self.processes.append(process)
+        self.last_sequences = [0] * len(self.slots)
+        print(f"已启动 {len(self.processes)} 个摄像头进程")
+
+    def poll(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        到达融合时间且有摄像头产生新帧时，返回融合后的手部列表，否则返回None
+        Returns:
+            手部列表（包含 hand_id、camera、type、lmList、bbox），None 表示本次无需处理
+        """
+        now = time.monotonic()
+        if now - self.last_fusion < self.fusion_interval:
+            return None
+
+        records = [slot.read() for slot in self.slots]
+        sequences = [int(record['sequence']) for record in records]
+        if sequences == self.last_sequences:
+            return None
+        self.last_sequences = sequences
+        self.last_fusion = now
+        self.fusions += 1
+
+        observations = []
+        wall_time = time.time()
+        for camera, record in enumerate(records):
+            if record['state'] != RUNNING or wall_time - record['timestamp'] > self.stale_timeout:
+                continue
+            for i in range(int(record['count'])):
+                observations.append({
+                    'hand_id': f"cam{camera}_hand_{i}",
+                    'camera': camera,
+                    'type': decode_hand_type(int(record['hand_type'][i])),
+                    'lmList': record['landmarks'][i].tolist(),
+                    'bbox': tuple(int(v) for v in record['bbox'][i])
+                })
+        return self.fusion.fuse(observations)
+
+    def alive(self) -> bool:
+        """是否还有 worker 进程在运行"""
+        return any(process.is_alive() for process in self.processes)
+
+    def stop(self, timeout: Optional[float] = None):
+        """停止所有 worker 进程并释放共享内存"""
+        if timeout is None:
+            timeout = self.camera_config['stop_timeout']
+        if self.stop_event is not None:
+            self.stop_event.set()
+        for process in self.processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join(1.0)
+        for slot in self.slots:
+            slot.close()
+        self.processes = []
+        self.slots = []
+
+    def get_stats(self) -> Dict[str, Any]:
+        """各摄像头的状态、帧数、手数和结果延迟，以及融合统计"""
+        cameras = []
+        wall_time = time.time()
+        for index, slot in enumerate(self.slots):
+            record = slot.read()
+            cameras.append({
+                'source': str(self.sources[index]),
+                'state': STATE_NAMES.get(int(record['state']), 'unknown'),
+                'frames': int(record['frame']),
+                'hands': int(record['count']),
+                'age_ms': round((wall_time - record['timestamp']) * 1000, 1) if record['timestamp'] else None
+            })
+        return {'cameras': cameras, 'fusions': self.fusions, 'duplicates_removed': self.fusion.duplicates}
@@ -0,0 +1,100 @@
+"""
+叠加层渲染 - 将关键点、手部信息、手势消息和FPS的绘制从检测流程中分离
+
+检测流程只负责推理和手势识别；只有存在可见的画面消费者（OpenCV窗口、
+Qt预览）时才调用本模块绘制，并且绘制频率受 overlay_max_fps 限制，
+与检测帧率无关。
+"""
+
+import time
+from typing import List, Dict, Any, Optional
+
+from hand_utils import HandUtils
+import config
+
+
+class HandOverlay:
+    """手部叠加层渲染器"""
+
+    def __init__(self, detector, max_fps: Optional[float] = None):
+        """
+        Args:
+            detector: HandDetector 实例，用于绘制手部骨架和计算伸出手指数
+            max_fps: 最大渲染帧率，None 时使用 DISPLAY_CONFIG['overlay_max_fps']，0 表示不限制
+        """
+        self.detector = detector
+        if max_fps is None:
+            max_fps = config.DISPLAY_CONFIG['overlay_max_fps']
+        self.set_max_fps(max_fps)
+        self.last_render_time = 0.0
+
+    def set_max_fps(self, max_fps: float):
+        """设置最大渲染帧率，0 表示不限制"""
+        self.max_fps = max_fps
+        self.min_interval = 1.0 / max_fps if max_fps and max_fps > 0 else 0.0
+
+    def should_render(self, now: Optional[float] = None) -> bool:
+        """
+        判断本帧是否需要渲染（按最大渲染帧率节流）
+        Args:
+            now: 当前时间，默认使用 time.monotonic()
+        Returns:
+            是否渲染
+        """
+        if now is None:
+            now = time.monotonic()
+        if now - self.last_render_time < self.min_interval:
+            return False
+        self.last_render_time = now
+        return True
+
+    def render(self, img, hands: List[Dict[str, Any]], gesture_message: str = "",
+               fps: Optional[float] = None):
+        """
+        在图像上绘制完整叠加层
+        Args:
+            img: 图像（原地绘制）
+            hands: findHands 返回的手部列表
+            gesture_message: 底部显示的手势消息，为空时不绘制
+            fps: 当前FPS，None 时不绘制
+        Returns:
+            绘制后的图像
+        """
+        for i, hand in enumerate(hands):
+            if config.DISPLAY_CONFIG['show_landmarks']:
+                self.detector.draw_hand(img, hand)
+            self.draw_hand_info(img, hand, i)
+
+        if gesture_message:
+            HandUtils.draw_gesture_message(img, gesture_message, config.COLORS['gesture_message'])
+
+        if fps is not None and config.DISPLAY_CONFIG['show_fps']:
+            HandUtils.draw_fps(img, fps, config.COLORS['fps_text'])
+
+        return img
+
+    def draw_hand_info(self, img, hand: Dict[str, Any], hand_index: int):
+        """绘制手部信息"""
+        landmarks = hand["lmList"]
+        hand_type = hand["type"]
+
+        # 计算并绘制手掌中心
+        palm_center = HandUtils.calculate_palm_center(landmarks)
+        if config.DISPLAY_CONFIG['show_palm_center']:
+            HandUtils.draw_palm_center(img, palm_center, config.COLORS['palm_center'])
+
+        # 计算手指数量（使用cvzone的方法）
+        fingers = self.detector.fingersUp(hand)
+        finger_count = fingers.count(1)
+
+        # 准备显示信息
+        info_dict = {
+            'Fingers': finger_count,
+            'Palm': f'({palm_center[0]}, {palm_center[1]})'
+        }
+
+        # 绘制信息
+        HandUtils.draw_text_info(
+            img, hand_type, info_dict,
+            position_offset=hand_index * 120
+        )
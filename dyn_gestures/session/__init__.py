@@ -0,0 +1,14 @@
+"""
+会话录制与回放模块
+"""
+
+from .recorder import SessionRecorder, SessionReader, RECORD_DTYPE
+from .replay import ReplayEngine, replay_session
+
+__all__ = [
+    'SessionRecorder',
+    'SessionReader',
+    'RECORD_DTYPE',
+    'ReplayEngine',
+    'replay_session'
+]
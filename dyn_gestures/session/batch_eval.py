@@ -0,0 +1,333 @@
+"""
+批量离线评估 - 将录制会话和参数组合分片到多个进程并行回放，统计每种手势的精确率、召回率和检测延迟
+
+标注文件与录制文件同名，后缀为 .labels.json：
+
+    {
+        "labels": [
+            {"gesture": "ThumbsUp", "start": 1712.40, "end": 1714.10},
+            {"gesture": "SwipeLeft", "start": 1720.05, "end": 1720.90}
+        ]
+    }
+
+start/end 为录制时间戳（秒）。静态手势触发后每帧都会输出，因此先把同一只手同一手势的连续输出
+合并为一次检测（间隔超过 GESTURE_EVENT_CONFIG['release_timeout'] 视为新的一次，与手势事件的 started 对应），
+每次检测只计一次：与尚未命中的同名标注区间（含结束后 match_tolerance 秒）重叠记为命中，否则记为误报
+（包括同一区间内的重复触发）；没有任何检测的区间记为漏检。
+
+命令行用法：
+
+    python -m session.batch_eval recordings/ --params params.json --workers 8
+"""
+
+import argparse
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from gesture_manager import GestureManager
+from .recorder import SessionReader, FILE_EXTENSION
+from .replay import ReplayEngine
+from .batch_score import evaluate_session_batch
+import config
+
+
+LABELS_SUFFIX = '.labels.json'
+
+
+@dataclass
+class GestureScore:
+    """单个手势的评估统计"""
+    true_positives: int = 0         # 命中的标注区间数
+    false_positives: int = 0        # 误报次数（按检测次数，不按帧）
+    false_negatives: int = 0        # 漏检的标注区间数
+    latencies: List[float] = field(default_factory=list)  # 每次命中的检测延迟（秒，相对标注开始）
+
+    @property
+    def precision(self) -> float:
+        detected = self.true_positives + self.false_positives
+        return self.true_positives / detected if detected else 0.0
+
+    @property
+    def recall(self) -> float:
+        labeled = self.true_positives + self.false_negatives
+        return self.true_positives / labeled if labeled else 0.0
+
+    def merge(self, other: 'GestureScore'):
+        """合并另一份统计"""
+        self.true_positives += other.true_positives
+        self.false_positives += other.false_positives
+        self.false_negatives += other.false_negatives
+        self.latencies.extend(other.latencies)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为报告字典（没有命中时延迟为None）"""
+        latencies = np.asarray(self.latencies)
+        has_hits = len(latencies) > 0
+        return {
+            'true_positives': self.true_positives,
+            'false_positives': self.false_positives,
+            'false_negatives': self.false_negatives,
+            'precision': self.precision,
+            'recall': self.recall,
+            'latency_mean': float(latencies.mean()) if has_hits else None,
+            'latency_p50': float(np.percentile(latencies, 50)) if has_hits else None,
+            'latency_p90': float(np.percentile(latencies, 90)) if has_hits else None
+        }
+
+
+def labels_path(session_path: str) -> str:
+    """获取录制文件对应的标注文件路径"""
+    return os.path.splitext(session_path)[0] + LABELS_SUFFIX
+
+
+def load_labels(session_path: str) -> List[Dict[str, Any]]:
+    """
+    加载录制文件的标注
+    Returns:
+        标注区间列表，每项包含 gesture, start, end；没有标注文件时返回空列表
+    """
+    path = labels_path(session_path)
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('labels', [])
+
+
+def group_episodes(detections: List[Dict[str, Any]],
+                   release_timeout: Optional[float] = None) -> List[Tuple[str, List[float]]]:
+    """
+    将逐帧的手势结果合并为检测次数
+    Args:
+        detections: 回放得到的手势结果（含 gesture, timestamp 和 hand_id）
+        release_timeout: 同一只手同一手势两次输出的最大间隔（秒），超过即视为新的一次，
+                         默认使用 GESTURE_EVENT_CONFIG['release_timeout']
+    Returns:
+        [(手势名称, 该次检测各帧的时间戳)]，按开始时间排序
+    """
+    if release_timeout is None:
+        release_timeout = config.GESTURE_EVENT_CONFIG['release_timeout']
+
+    episodes: List[Tuple[str, List[float]]] = []
+    open_episodes: Dict[Tuple[Any, str], List[float]] = {}
+    for detection in sorted(detections, key=lambda d: d['timestamp']):
+        key = (detection.get('hand_id'), detection['gesture'])
+        timestamp = detection['timestamp']
+        timestamps = open_episodes.get(key)
+        if timestamps is None or timestamp - timestamps[-1] > release_timeout:
+            timestamps = open_episodes[key] = []
+            episodes.append((detection['gesture'], timestamps))
+        timestamps.append(timestamp)
+    return episodes
+
+
+def score_detections(detections: List[Dict[str, Any]], labels: List[Dict[str, Any]],
+                     tolerance: float, release_timeout: Optional[float] = None) -> Dict[str, GestureScore]:
+    """
+    将检测结果与标注区间匹配，每次检测（而不是每帧输出）计一次命中或误报
+    Args:
+        detections: 回放得到的手势结果（含 gesture, timestamp 和 hand_id）
+        labels: 标注区间列表
+        tolerance: 区间结束后的匹配容差（秒）
+        release_timeout: 合并连续输出的最大间隔（秒），见 group_episodes
+    Returns:
+        {手势名称: 评估统计}
+    """
+    scores: Dict[str, GestureScore] = {}
+    matched = [False] * len(labels)
+
+    for gesture_name, timestamps in group_episodes(detections, release_timeout):
+        score = scores.setdefault(gesture_name, GestureScore())
+
+        label_index = None
+        for i, label in enumerate(labels):
+            if (not matched[i] and label['gesture'] == gesture_name
+                    and timestamps[0] <= label['end'] + tolerance and timestamps[-1] >= label['start']):
+                label_index = i
+                break
+
+        if label_index is None:
+            score.false_positives += 1
+        else:
+            matched[label_index] = True
+            score.true_positives += 1
+            start = labels[label_index]['start']
+            first_hit = next(t for t in timestamps if t >= start)
+            score.latencies.append(first_hit - start)
+
+    for label, hit in zip(labels, matched):
+        if not hit:
+            scores.setdefault(label['gesture'], GestureScore()).false_negatives += 1
+
+    return scores
+
+
+# 每个工作进程只缓存最近一组参数的回放引擎（及手势管理器）：同一组参数连续评估多个录制文件时复用，
+# 阈值搜索中每个候选都是新参数，不保留旧的引擎
+_worker_engine: Tuple[Optional[str], Optional[ReplayEngine]] = (None, None)
+
+
+def evaluate_session(session_path: str, gesture_config: Optional[Dict[str, Dict[str, Any]]] = None,
+                     tolerance: Optional[float] = None) -> Dict[str, GestureScore]:
+    """
+    用指定参数回放单个录制文件并评估
+    Args:
+        session_path: 录制文件路径（以内存映射方式打开，不在进程间传递数据）
+        gesture_config: 覆盖 config.GESTURE_CONFIG 的手势参数
+        tolerance: 匹配容差（秒），默认使用 EVALUATION_CONFIG['match_tolerance']
+    Returns:
+        {手势名称: 评估统计}
+    """
+    if tolerance is None:
+        tolerance = config.EVALUATION_CONFIG['match_tolerance']
+
+    global _worker_engine
+    key = json.dumps(gesture_config or {}, sort_keys=True)
+    cached_key, engine = _worker_engine
+    if cached_key != key or engine is None:
+        engine = ReplayEngine(GestureManager(gesture_config=gesture_config))
+        _worker_engine = (key, engine)
+
+    reader = SessionReader(session_path)
+    try:
+        detections = engine.run(reader)
+    finally:
+        reader.close()
+    return score_detections(detections, load_labels(session_path), tolerance)
+
+
+def find_sessions(paths: List[str]) -> List[str]:
+    """展开目录和通配符，返回录制文件列表"""
+    sessions = []
+    for path in paths:
+        if os.path.isdir(path):
+            sessions.extend(sorted(glob.glob(os.path.join(path, f'*{FILE_EXTENSION}'))))
+        else:
+            sessions.extend(sorted(glob.glob(path)) or [path])
+    return sessions
+
+
+class BatchEvaluator:
+    """批量评估器，按 (参数组合, 录制文件) 分片到进程池"""
+
+    def __init__(self, session_paths: List[str], max_workers: Optional[int] = None,
+                 tolerance: Optional[float] = None, vectorized: bool = False):
+        """
+        Args:
+            session_paths: 录制文件路径列表
+            max_workers: 进程数，默认使用 EVALUATION_CONFIG['max_workers']（0为CPU核心数）；
+                         为1时在当前进程内顺序执行，便于调试
+            tolerance: 匹配容差（秒）
+            vectorized: 是否使用静态检测器的 batch_gestures 向量化打分（只评估静态手势，速度快得多）
+        """
+        self.session_paths = list(session_paths)
+        if max_workers is None:
+            max_workers = config.EVALUATION_CONFIG['max_workers']
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.tolerance = tolerance
+        self.evaluate_fn = evaluate_session_batch if vectorized else evaluate_session
+        self.executor = None
+
+    def evaluate(self, param_sets: List[Optional[Dict[str, Dict[str, Any]]]]) -> List[Dict[str, GestureScore]]:
+        """
+        评估多组参数
+        Args:
+            param_sets: 参数组合列表，每项为 GestureManager 的 gesture_config 覆盖
+        Returns:
+            与 param_sets 一一对应的 {手势名称: 评估统计}，已汇总所有录制文件
+        """
+        reports: List[Dict[str, GestureScore]] = [{} for _ in param_sets]
+
+        def merge(index: int, scores: Dict[str, GestureScore]):
+            for gesture_name, score in scores.items():
+                reports[index].setdefault(gesture_name, GestureScore()).merge(score)
+
+        if self.max_workers == 1:
+            for index, params in enumerate(param_sets):
+                for path in self.session_paths:
+                    merge(index, self.evaluate_fn(path, params, self.tolerance))
+            return reports
+
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+        futures = {
+            self.executor.submit(self.evaluate_fn, path, params, self.tolerance): index
+            for index, params in enumerate(param_sets)
+            for path in self.session_paths
+        }
+        for future in as_completed(futures):
+            merge(futures[future], future.result())
+        return reports
+
+    def close(self):
+        """关闭进程池"""
+        if self.executor:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _rjust(text: str, width: int) -> str:
+    """按显示宽度右对齐（中文字符占两列）"""
+    display_width = sum(2 if ord(ch) > 0x2E80 else 1 for ch in text)
+    return " " * max(width - display_width, 0) + text
+
+
+def format_report(scores: Dict[str, GestureScore]) -> str:
+    """将评估统计格式化为文本表格"""
+    columns = [("TP", 6), ("FP", 6), ("FN", 6), ("精确率", 10), ("召回率", 10),
+               ("延迟均值", 12), ("P50", 8), ("P90", 8)]
+    lines = ["手势".ljust(10) + "".join(_rjust(name, width) for name, width in columns)]
+    for gesture_name in sorted(scores):
+        row = scores[gesture_name].to_dict()
+        latencies = [row[key] for key in ('latency_mean', 'latency_p50', 'latency_p90')]
+        values = [
+            str(row['true_positives']), str(row['false_positives']), str(row['false_negatives']),
+            f"{row['precision']:.1%}", f"{row['recall']:.1%}"
+        ] + [f"{latency * 1000:.0f}ms" if latency is not None else "-" for latency in latencies]
+        lines.append(f"{gesture_name:<12}" + "".join(_rjust(value, width) for value, (_, width) in zip(values, columns)))
+    return "\n".join(lines)
+
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="批量离线评估录制会话")
+    parser.add_argument("sessions", nargs="+", help="录制文件、目录或通配符")
+    parser.add_argument("--params", help="参数组合JSON文件（单个覆盖字典或覆盖字典列表）")
+    parser.add_argument("--workers", type=int, help="并行进程数")
+    parser.add_argument("--tolerance", type=float, help="匹配容差（秒）")
+    parser.add_argument("--vectorized", action="store_true", help="使用向量化批量检测（只评估静态手势）")
+    args = parser.parse_args()
+
+    sessions = find_sessions(args.sessions)
+    if not sessions:
+        print("未找到录制文件")
+        raise SystemExit(1)
+
+    param_sets: List[Optional[Dict[str, Any]]] = [None]
+    if args.params:
+        with open(args.params, 'r', encoding='utf-8') as f:
+            loaded = json.load(f)
+        param_sets = loaded if isinstance(loaded, list) else [loaded]
+
+    with BatchEvaluator(sessions, args.workers, args.tolerance, args.vectorized) as evaluator:
+        reports = evaluator.evaluate(param_sets)
+
+    for params, scores in zip(param_sets, reports):
+        print(f"\n参数: {json.dumps(params or {}, ensure_ascii=False)}  ({len(sessions)} 个录制文件)")
+        print(format_report(scores))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+向量化会话打分 - 用静态手势检测器的 batch_gestures 一次处理整段录制，代替逐帧回放
+（规则检测器通过 match_batch + detect_batch，学习型分类器一次批量分类覆盖模型中的所有手势）
+
+逐帧路径中每只手的检测历史按 hand_id 保存，所有手丢失（无手帧）时清空；
+这里按 hand_id 取出该手的全部记录，并在两次出现之间夹有无手帧的位置标记重置，
+因此结果与 ReplayEngine 逐帧回放静态手势检测器完全一致。修改检测器后可用命令行验证两条路径是否一致：
+
+    python -m session.batch_score recordings/ --params params.json
+"""
+
+import argparse
+import json
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+
+import numpy as np
+
+from gesture_manager import GestureManager
+from gestures import StaticGestureDetector
+from landmark_filter import LandmarkSmoother
+from .recorder import SessionReader, NO_HAND
+from .replay import ReplayEngine
+import config
+
+
+def build_batch_pipeline(gesture_config: Optional[Dict[str, Dict[str, Any]]] = None,
+                         smoothing_config: Optional[Dict[str, Any]] = None
+                         ) -> Tuple[List[StaticGestureDetector], Optional[LandmarkSmoother]]:
+    """
+    按参数创建支持批量检测（supports_batch 为 True）的静态手势检测器和关键点平滑器（与 GestureManager 的默认配置相同）
+    Returns:
+        (静态手势检测器列表, 平滑器，未启用平滑时为None)
+    """
+    manager = GestureManager(gesture_config=gesture_config, smoothing_config=smoothing_config)
+    detectors = [d for d in manager.detectors if isinstance(d, StaticGestureDetector) and d.supports_batch]
+    skipped = [d.name for d in manager.detectors if isinstance(d, StaticGestureDetector) and not d.supports_batch]
+    if skipped:
+        print(f"以下静态手势检测器不支持批量检测，不参与向量化打分: {', '.join(skipped)}")
+    return detectors, manager.smoother
+
+
+def batch_gesture_names(detectors: List[StaticGestureDetector]) -> set:
+    """批量检测器可能输出的全部手势名称"""
+    return {name for detector in detectors for name in detector.batch_gesture_names}
+
+
+def iter_hand_tracks(reader: SessionReader) -> Iterator[Tuple[str, np.ndarray, np.ndarray]]:
+    """
+    按 hand_id 拆分录制记录
+    Yields:
+        (hand_id, 该手记录在 reader.records 中的索引, 重置标记数组)
+    """
+    records = reader.records
+    if len(records) == 0:
+        return
+
+    hand_types = records['hand_type']
+    no_hand_frames = np.sort(records['frame'][hand_types == NO_HAND]).astype(np.int64)
+    hand_rows = np.flatnonzero(hand_types != NO_HAND)
+    hand_ids = records['hand_id'][hand_rows]
+
+    for hand_id in np.unique(hand_ids):
+        rows = hand_rows[hand_ids == hand_id]
+        frames = records['frame'][rows].astype(np.int64)
+        # 两次出现之间有无手帧时，逐帧路径已清空检测历史
+        lost_before = np.searchsorted(no_hand_frames, frames)
+        resets = np.empty(len(rows), dtype=bool)
+        resets[0] = True
+        resets[1:] = lost_before[1:] > lost_before[:-1]
+        yield hand_id.decode('utf-8'), rows, resets
+
+
+def detect_session_batch(reader: SessionReader, detectors: List[StaticGestureDetector],
+                         smoother: Optional[LandmarkSmoother] = None) -> List[Dict[str, Any]]:
+    """
+    用 batch_gestures 对整段录制做静态手势检测
+    Args:
+        reader: 会话读取器
+        detectors: 静态手势检测器
+        smoother: 关键点平滑器，与逐帧路径一样在检测前平滑
+    Returns:
+        手势结果列表（含 gesture, hand_type, confidence, frame, timestamp），按帧排序
+    """
+    records = reader.records
+    results = []
+    for hand_id, rows, resets in iter_hand_tracks(reader):
+        # 逐帧路径使用整数坐标
+        landmarks = records['landmarks'][rows].astype(np.int32).astype(np.float64)
+        if smoother:
+            landmarks = smoother.filter_sequence(landmarks, records['timestamp'][rows], resets)
+        left_hands = records['hand_type'][rows] == 0
+        for detector in detectors:
+            for gesture_name, (mask, confidence) in detector.batch_gestures(landmarks, resets, left_hands).items():
+                for i in np.flatnonzero(mask):
+                    row = records[rows[i]]
+                    results.append({
+                        'gesture': gesture_name,
+                        'hand_id': hand_id,
+                        'hand_type': 'Left' if row['hand_type'] == 0 else 'Right',
+                        'confidence': float(confidence[i]),
+                        'frame': int(row['frame']),
+                        'timestamp': float(row['timestamp'])
+                    })
+    results.sort(key=lambda r: (r['frame'], r['gesture']))
+    return results
+
+
+def check_consistency(reader: SessionReader,
+                      gesture_config: Optional[Dict[str, Dict[str, Any]]] = None,
+                      smoothing_config: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, int]]:
+    """
+    对比逐帧回放与批量检测的静态手势输出
+    Returns:
+        {手势名称: {'per_frame': 逐帧路径输出数, 'batch': 批量路径输出数,
+                    'mismatched': 输出或置信度不一致的 (帧, 手) 数}}
+    """
+    detectors, smoother = build_batch_pipeline(gesture_config, smoothing_config)
+    names = batch_gesture_names(detectors)
+
+    engine = ReplayEngine(GestureManager(gesture_config=gesture_config, smoothing_config=smoothing_config))
+    per_frame = [g for g in engine.run(reader) if g['gesture'] in names]
+    batch = detect_session_batch(reader, detectors, smoother)
+
+    report = {}
+    for name in sorted(names):
+        outputs_a = {(g['frame'], g['hand_id']): g['confidence'] for g in per_frame if g['gesture'] == name}
+        outputs_b = {(g['frame'], g['hand_id']): g['confidence'] for g in batch if g['gesture'] == name}
+        mismatched = set(outputs_a) ^ set(outputs_b)
+        mismatched.update(key for key in set(outputs_a) & set(outputs_b)
+                          if abs(outputs_a[key] - outputs_b[key]) > 1e-6)
+        report[name] = {
+            'per_frame': len(outputs_a),
+            'batch': len(outputs_b),
+            'mismatched': len(mismatched)
+        }
+    return report
+
+
+def evaluate_session_batch(session_path: str, gesture_config: Optional[Dict[str, Dict[str, Any]]] = None,
+                           tolerance: Optional[float] = None):
+    """
+    向量化评估单个录制文件（只评估静态手势，其他手势的标注被忽略）
+    Returns:
+        {手势名称: GestureScore}
+    """
+    from .batch_eval import score_detections, load_labels
+
+    if tolerance is None:
+        tolerance = config.EVALUATION_CONFIG['match_tolerance']
+
+    detectors, smoother = build_batch_pipeline(gesture_config)
+    names = batch_gesture_names(detectors)
+    reader = SessionReader(session_path)
+    try:
+        detections = detect_session_batch(reader, detectors, smoother)
+    finally:
+        reader.close()
+    labels = [label for label in load_labels(session_path) if label['gesture'] in names]
+    return score_detections(detections, labels, tolerance)
+
+
+def main():
+    """命令行入口：检查逐帧路径与批量路径的一致性"""
+    from .batch_eval import find_sessions
+
+    parser = argparse.ArgumentParser(description="检查静态手势逐帧检测与批量检测的一致性")
+    parser.add_argument("sessions", nargs="+", help="录制文件、目录或通配符")
+    parser.add_argument("--params", help="手势参数覆盖JSON文件")
+    args = parser.parse_args()
+
+    gesture_config = None
+    if args.params:
+        with open(args.params, 'r', encoding='utf-8') as f:
+            gesture_config = json.load(f)
+
+    failed = False
+    for path in find_sessions(args.sessions):
+        reader = SessionReader(path)
+        report = check_consistency(reader, gesture_config)
+        reader.close()
+        for name, counts in report.items():
+            status = "一致" if counts['mismatched'] == 0 else f"不一致 {counts['mismatched']} 处"
+            failed = failed or counts['mismatched'] > 0
+            print(f"{path}  {name:<12} 逐帧 {counts['per_frame']:5d}  批量 {counts['batch']:5d}  {status}")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+手部关键点会话录制 - 定长记录的列式二进制文件，可直接 np.memmap 随机访问
+
+文件格式：
+    [0, HEADER_SIZE)     文件头：魔数 + 头部JSON长度 + 头部JSON（手势名称表等），其余补零
+    [HEADER_SIZE, ...)   RECORD_DTYPE 定长记录，每只手一条；没有手的帧写一条 hand_type=NO_HAND 的标记记录
+
+录制时主线程只把数据写入预分配的内存块，写满后交给后台线程写盘，
+每帧开销仅为几次 numpy 赋值。
+"""
+
+import json
+import os
+import queue
+import struct
+import threading
+import time
+from typing import List, Dict, Any, Optional, Iterator, Tuple, Sequence
+
+import numpy as np
+
+import config
+
+
+MAGIC = b'GESTREC1'
+HEADER_SIZE = 4096
+FORMAT_VERSION = 1
+FILE_EXTENSION = '.lmrec'
+
+# 手部类型编码
+HAND_TYPES = ('Left', 'Right')
+NO_HAND = 255
+
+# 每只手一条定长记录
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),            # 时间戳（秒）
+    ('frame', '<u4'),                # 帧序号
+    ('hand_type', 'u1'),             # 0=Left, 1=Right, 255=本帧无手
+    ('hand_id', 'S15'),              # 手部ID
+    ('gestures', '<u4'),             # 检测到的手势位掩码（对应文件头中的手势名称表）
+    ('landmarks', '<f4', (21, 3))    # 21个关键点像素坐标 [x, y, z]
+])
+
+MAX_GESTURE_NAMES = 32
+
+
+def encode_hand_type(hand_type: str) -> int:
+    """将手部类型字符串编码为整数"""
+    return HAND_TYPES.index(hand_type) if hand_type in HAND_TYPES else NO_HAND
+
+
+def decode_hand_type(code: int) -> Optional[str]:
+    """将整数解码为手部类型字符串"""
+    return HAND_TYPES[code] if code < len(HAND_TYPES) else None
+
+
+def default_gesture_names() -> List[str]:
+    """默认手势名称表（静态手势 + 动态手势）"""
+    return list(config.GESTURE_TYPES['static_gestures']) + list(config.GESTURE_TYPES['dynamic_gestures'])
+
+
+class SessionRecorder:
+    """会话录制器，将每帧的手部关键点和手势结果追加写入录制文件"""
+
+    def __init__(self, path: str, source: str = "camera", chunk_records: Optional[int] = None):
+        """
+        Args:
+            path: 录制文件路径
+            source: 数据来源（camera / bluetooth），写入文件头
+            chunk_records: 每个内存块的记录数，写满后交给后台线程写盘
+        """
+        self.path = path
+        self.source = source
+        self.chunk_records = chunk_records or config.RECORDING_CONFIG['chunk_records']
+        self.gesture_names = default_gesture_names()
+        self.gesture_bits = {name: 1 << i for i, name in enumerate(self.gesture_names)}
+        self.created = time.time()
+
+        self.frame_index = 0
+        self.record_count = 0
+        self.buffer = np.zeros(self.chunk_records, dtype=RECORD_DTYPE)
+        self.buffer_count = 0
+        self.closed = False
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, 'wb')
+        self._write_header()
+
+        # 后台写盘线程
+        self.write_queue = queue.Queue()
+        self.writer_thread = threading.Thread(target=self._write_worker, name="SessionRecorder", daemon=True)
+        self.writer_thread.start()
+
+    @classmethod
+    def create_default(cls, source: str = "camera") -> 'SessionRecorder':
+        """在配置的录制目录下按时间创建录制文件"""
+        file_name = f"{source}_{time.strftime('%Y%m%d_%H%M%S')}{FILE_EXTENSION}"
+        return cls(os.path.join(config.RECORDING_CONFIG['output_dir'], file_name), source)
+
+    def _header_dict(self) -> Dict[str, Any]:
+        """构造文件头信息"""
+        return {
+            'version': FORMAT_VERSION,
+            'record_size': RECORD_DTYPE.itemsize,
+            'source': self.source,
+            'created': self.created,
+            'gestures': self.gesture_names,
+            'records': self.record_count
+        }
+
+    def _write_header(self):
+        """写入（或重写）文件头"""
+        header_json = json.dumps(self._header_dict(), ensure_ascii=False).encode('utf-8')
+        header = MAGIC + struct.pack('<I', len(header_json)) + header_json
+        if len(header) > HEADER_SIZE:
+            raise ValueError("录制文件头过大")
+        self.file.seek(0)
+        self.file.write(header.ljust(HEADER_SIZE, b'\0'))
+
+    def _gesture_mask(self, gestures: Sequence[str]) -> int:
+        """将手势名称列表编码为位掩码，遇到新名称时追加到名称表"""
+        mask = 0
+        for name in gestures:
+            bit = self.gesture_bits.get(name)
+            if bit is None:
+                if len(self.gesture_names) >= MAX_GESTURE_NAMES:
+                    continue
+                bit = 1 << len(self.gesture_names)
+                self.gesture_names.append(name)
+                self.gesture_bits[name] = bit
+            mask |= bit
+        return mask
+
+    def record_frame(self, timestamp: float, hands: List[Dict[str, Any]]):
+        """
+        记录一帧
+        Args:
+            timestamp: 帧时间戳（秒）
+            hands: 手部列表，每项包含 hand_id, hand_type, landmarks, gestures（手势名称列表）；
+                   为空时写入一条无手标记记录
+        """
+        if self.closed:
+            return
+
+        if not hands:
+            row = self._next_row()
+            row['timestamp'] = timestamp
+            row['frame'] = self.frame_index
+            row['hand_type'] = NO_HAND
+        else:
+            for hand in hands:
+                row = self._next_row()
+                row['timestamp'] = timestamp
+                row['frame'] = self.frame_index
+                row['hand_type'] = encode_hand_type(hand['hand_type'])
+                row['hand_id'] = hand['hand_id'].encode('utf-8')[:15]
+                row['gestures'] = self._gesture_mask(hand.get('gestures', ()))
+                row['landmarks'] = hand['landmarks']
+
+        self.frame_index += 1
+
+    def _next_row(self):
+        """取得内存块中的下一条记录，块写满时交给后台线程"""
+        if self.buffer_count >= self.chunk_records:
+            self._flush_buffer()
+        row = self.buffer[self.buffer_count]
+        self.buffer_count += 1
+        self.record_count += 1
+        return row
+
+    def _flush_buffer(self):
+        """将当前内存块交给后台线程，并换用新的内存块"""
+        if self.buffer_count == 0:
+            return
+        self.write_queue.put(self.buffer[:self.buffer_count])
+        self.buffer = np.zeros(self.chunk_records, dtype=RECORD_DTYPE)
+        self.buffer_count = 0
+
+    def _write_worker(self):
+        """后台写盘线程"""
+        while True:
+            chunk = self.write_queue.get()
+            if chunk is None:
+                break
+            try:
+                self.file.write(chunk.tobytes())
+            except Exception as e:
+                print(f"写入录制文件失败: {e}")
+
+    def close(self):
+        """写出剩余数据并关闭文件"""
+        if self.closed:
+            return
+        self.closed = True
+        self._flush_buffer()
+        self.write_queue.put(None)
+        self.writer_thread.join()
+
+        # 更新文件头中的手势名称表和记录数
+        self._write_header()
+        self.file.close()
+        print(f"会话录制已保存: {self.path} ({self.record_count} 条记录, {self.frame_index} 帧)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class SessionReader:
+    """会话读取器，以 np.memmap 方式打开录制文件"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            prefix = f.read(HEADER_SIZE)
+        if len(prefix) < len(MAGIC) + 4 or prefix[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"不是有效的录制文件: {path}")
+
+        header_len = struct.unpack('<I', prefix[len(MAGIC):len(MAGIC) + 4])[0]
+        self.header = json.loads(prefix[len(MAGIC) + 4:len(MAGIC) + 4 + header_len].decode('utf-8'))
+        if self.header.get('record_size') != RECORD_DTYPE.itemsize:
+            raise ValueError(f"录制文件记录格式不兼容: {path}")
+
+        self.gesture_names: List[str] = self.header['gestures']
+
+        # 以文件实际长度为准，异常退出未更新文件头时也能读取已写入的记录
+        record_count = (os.path.getsize(path) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+        if record_count > 0:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode='r',
+                                     offset=HEADER_SIZE, shape=(record_count,))
+        else:
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    @property
+    def duration(self) -> float:
+        """录制时长（秒）"""
+        if len(self.records) == 0:
+            return 0.0
+        return float(self.records['timestamp'][-1] - self.records['timestamp'][0])
+
+    def decode_gestures(self, mask: int) -> List[str]:
+        """将手势位掩码解码为手势名称列表"""
+        return [name for i, name in enumerate(self.gesture_names) if mask & (1 << i)]
+
+    def gesture_bit(self, gesture_name: str) -> int:
+        """获取手势在位掩码中的位，不存在时返回0"""
+        if gesture_name not in self.gesture_names:
+            return 0
+        return 1 << self.gesture_names.index(gesture_name)
+
+    def frame_bounds(self) -> np.ndarray:
+        """
+        计算每帧记录的起止索引
+        Returns:
+            形状为 (帧数+1,) 的数组，第 i 帧对应 records[bounds[i]:bounds[i+1]]
+        """
+        frames = self.records['frame']
+        if len(frames) == 0:
+            return np.zeros(1, dtype=np.int64)
+        starts = np.flatnonzero(np.diff(frames)) + 1
+        return np.concatenate(([0], starts, [len(frames)]))
+
+    def iter_frames(self) -> Iterator[Tuple[float, np.ndarray]]:
+        """
+        按帧遍历录制内容
+        Yields:
+            (时间戳, 该帧的记录数组)；无手帧的记录数组中 hand_type 为 NO_HAND
+        """
+        bounds = self.frame_bounds()
+        for i in range(len(bounds) - 1):
+            rows = self.records[bounds[i]:bounds[i + 1]]
+            yield float(rows['timestamp'][0]), rows
+
+    def close(self):
+        """释放内存映射（映射在最后一个引用释放时关闭）"""
+        self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
@@ -0,0 +1,97 @@
+"""
+离线回放引擎 - 按录制时间戳将会话帧送入手势管理器，按CPU速度运行
+
+回放时检测器的时间源被替换为 ManualClock，每帧开始前设置为该帧的录制时间戳，
+因此回放结果与回放速度无关：相同的录制文件和相同的检测参数总是得到相同的手势输出。
+"""
+
+import time
+from typing import List, Dict, Any, Optional, Callable
+
+import numpy as np
+
+from clock import ManualClock
+from gesture_manager import GestureManager
+from .recorder import SessionReader, NO_HAND, decode_hand_type
+
+
+class ReplayEngine:
+    """离线回放引擎"""
+
+    def __init__(self, gesture_manager: Optional[GestureManager] = None, disable_guard: bool = True):
+        """
+        Args:
+            gesture_manager: 手势管理器，默认新建一个；其时间源会被替换为回放时钟
+            disable_guard: 是否关闭检测器保护。检测器降频/熔断取决于实际耗时，
+                           会使回放结果随机器负载变化，默认关闭
+        """
+        self.clock = ManualClock()
+        self.gesture_manager = gesture_manager or GestureManager(clock=self.clock)
+        self.gesture_manager.set_clock(self.clock)
+        if disable_guard:
+            self.gesture_manager.guard_config = dict(self.gesture_manager.guard_config, enabled=False)
+        self.last_run: Dict[str, Any] = {}
+
+    def reset(self):
+        """重置手势管理器的所有检测状态，使每次回放从相同的初始状态开始"""
+        self.gesture_manager.reset_all_detectors()
+        self.gesture_manager.on_all_hands_lost()
+        self.gesture_manager.reset_detector_stats()
+
+    def run(self, reader: SessionReader,
+            on_gesture: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        """
+        回放整个会话
+        Args:
+            reader: 会话读取器
+            on_gesture: 每检测到一个手势时的回调（可选）
+        Returns:
+            检测到的手势结果列表，每项附加 frame, timestamp 和 hand_id
+        """
+        self.reset()
+        results = []
+        frame_count = 0
+        start_time = time.perf_counter()
+
+        for timestamp, rows in reader.iter_frames():
+            self.clock.set(timestamp)
+            frame_count += 1
+
+            if rows['hand_type'][0] == NO_HAND:
+                self.gesture_manager.on_all_hands_lost()
+                continue
+
+            landmarks_batch = rows['landmarks'].astype(np.int32).tolist()
+            for row, landmarks in zip(rows, landmarks_batch):
+                hand_id = row['hand_id'].decode('utf-8')
+                hand_type = decode_hand_type(row['hand_type'])
+                for gesture in self.gesture_manager.detect_gestures(landmarks, hand_id, hand_type):
+                    gesture['frame'] = int(row['frame'])
+                    gesture['timestamp'] = timestamp
+                    gesture['hand_id'] = hand_id
+                    results.append(gesture)
+                    if on_gesture:
+                        on_gesture(gesture)
+
+        elapsed = time.perf_counter() - start_time
+        self.last_run = {
+            'frames': frame_count,
+            'records': len(reader),
+            'gestures': len(results),
+            'duration': reader.duration,
+            'elapsed': elapsed,
+            'speedup': reader.duration / elapsed if elapsed > 0 else 0.0
+        }
+        return results
+
+
+def replay_session(reader: SessionReader, gesture_manager: Optional[GestureManager] = None) -> List[Dict[str, Any]]:
+    """
+    将录制内容按帧回放给手势管理器（不等待，按CPU速度回放）
+    Args:
+        reader: 会话读取器
+        gesture_manager: 手势管理器，默认新建一个
+    Returns:
+        回放过程中检测到的手势结果列表，每项附加 frame, timestamp 和 hand_id
+    """
+    return ReplayEngine(gesture_manager).run(reader)
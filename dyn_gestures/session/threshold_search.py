@@ -0,0 +1,259 @@
+"""
+阈值自动搜索 - 在带标注的录制会话上评估候选手势参数，输出检测延迟与误报之间的帕累托最优配置
+
+候选参数由网格搜索或随机搜索按需生成，每次取 chunk_size 个通过 BatchEvaluator 并行回放评估。
+网格候选数为各参数取值个数的乘积，超过 max_grid_candidates 时拒绝运行（减少 --steps 或参数个数，或改用随机搜索）。
+召回率低于 min_recall 的候选不进入帕累托前沿，避免“完全不检测”这种零误报配置胜出。
+
+带 --vectorized 时使用静态检测器的 batch_gestures 对整段录制一次性打分，只搜索静态手势参数，
+速度比逐帧回放快一个数量级以上。
+
+命令行用法：
+
+    python -m session.threshold_search recordings/ --method random --samples 100 --output pareto.json
+    python -m session.threshold_search recordings/ --space space.json --method grid --gesture ThumbsUp
+    python -m session.threshold_search recordings/ --vectorized --samples 500
+"""
+
+import argparse
+import itertools
+import json
+import math
+import random
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator
+
+import numpy as np
+
+from .batch_eval import BatchEvaluator, GestureScore, find_sessions
+import config
+
+
+# 支持向量化打分的静态手势配置项
+STATIC_GESTURE_KEYS = ('peace_sign', 'thumbs_up', 'thumbs_down', 'ok_sign', 'pose_classifier')
+
+
+@dataclass
+class Candidate:
+    """一组候选参数及其评估结果"""
+    params: Dict[str, Dict[str, Any]]   # GestureManager 的 gesture_config 覆盖
+    false_positives: int = 0
+    latency: float = math.inf           # 平均检测延迟（秒），没有命中时为无穷大
+    recall: float = 0.0
+    precision: float = 0.0
+
+    def dominates(self, other: 'Candidate') -> bool:
+        """判断是否在延迟和误报两个目标上都不差于另一个候选，且至少一项更好"""
+        return (self.latency <= other.latency and self.false_positives <= other.false_positives and
+                (self.latency < other.latency or self.false_positives < other.false_positives))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为报告字典"""
+        return {
+            'params': self.params,
+            'false_positives': self.false_positives,
+            'latency': self.latency if math.isfinite(self.latency) else None,
+            'recall': self.recall,
+            'precision': self.precision
+        }
+
+
+def parse_key(key: str) -> Tuple[str, str]:
+    """将 '手势配置名.参数名' 拆分为 (手势配置名, 参数名)"""
+    gesture_key, _, param = key.partition('.')
+    if gesture_key not in config.GESTURE_CONFIG or not param:
+        raise ValueError(f"无效的搜索参数: {key}")
+    return gesture_key, param
+
+
+def spec_values(spec, steps: int) -> List[Any]:
+    """获取网格搜索时某个参数的取值列表"""
+    if isinstance(spec, list):
+        return spec
+    values = np.linspace(spec['min'], spec['max'], steps)
+    if spec.get('type') == 'int':
+        return sorted(set(int(round(v)) for v in values))
+    return [round(float(v), 4) for v in values]
+
+
+def spec_sample(spec, rng: random.Random) -> Any:
+    """随机搜索时为某个参数采样一个取值"""
+    if isinstance(spec, list):
+        return rng.choice(spec)
+    if spec.get('type') == 'int':
+        return rng.randint(int(spec['min']), int(spec['max']))
+    return round(rng.uniform(spec['min'], spec['max']), 4)
+
+
+def build_overrides(assignment: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    将 {'手势配置名.参数名': 值} 转换为 gesture_config 覆盖字典，
+    参数名可以继续用点号指定嵌套项，如 'thumbs_up.temporal.mode'
+    """
+    overrides: Dict[str, Dict[str, Any]] = {}
+    for key, value in assignment.items():
+        gesture_key, param = parse_key(key)
+        target = overrides.setdefault(gesture_key, {})
+        *parents, leaf = param.split('.')
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[leaf] = value
+    return overrides
+
+
+def grid_size(space: Dict[str, Any], steps: int) -> int:
+    """网格搜索的候选数（各参数取值个数的乘积）"""
+    return math.prod(len(spec_values(spec, steps)) for spec in space.values())
+
+
+def grid_candidates(space: Dict[str, Any], steps: int) -> Iterator[Dict[str, Dict[str, Any]]]:
+    """按需生成网格搜索的候选"""
+    keys = list(space)
+    grids = [spec_values(space[key], steps) for key in keys]
+    for values in itertools.product(*grids):
+        yield build_overrides(dict(zip(keys, values)))
+
+
+def random_candidates(space: Dict[str, Any], samples: int, seed: int) -> Iterator[Dict[str, Dict[str, Any]]]:
+    """按需生成随机搜索的候选（第一个候选为当前配置，作为基线）"""
+    rng = random.Random(seed)
+    if samples > 0:
+        yield {}
+    for _ in range(max(samples - 1, 0)):
+        yield build_overrides({key: spec_sample(spec, rng) for key, spec in space.items()})
+
+
+def pareto_front(candidates: List[Candidate], min_recall: float) -> List[Candidate]:
+    """
+    计算帕累托前沿
+    Args:
+        candidates: 已评估的候选
+        min_recall: 最低召回率，低于该值的候选不参与
+    Returns:
+        按延迟升序排列的非支配候选
+    """
+    eligible = [c for c in candidates if c.recall >= min_recall and math.isfinite(c.latency)]
+    front = [c for c in eligible if not any(other.dominates(c) for other in eligible)]
+    return sorted(front, key=lambda c: (c.latency, c.false_positives))
+
+
+class ThresholdSearch:
+    """阈值搜索器"""
+
+    def __init__(self, evaluator: BatchEvaluator, gestures: Optional[List[str]] = None,
+                 min_recall: Optional[float] = None):
+        """
+        Args:
+            evaluator: 批量评估器
+            gestures: 参与打分的手势名称（如 ThumbsUp），默认全部
+            min_recall: 进入帕累托前沿的最低召回率
+        """
+        self.evaluator = evaluator
+        self.gestures = gestures
+        self.min_recall = config.THRESHOLD_SEARCH_CONFIG['min_recall'] if min_recall is None else min_recall
+
+    def summarize(self, params: Dict[str, Dict[str, Any]], scores: Dict[str, GestureScore]) -> Candidate:
+        """将各手势的评估统计汇总为一个候选的目标值"""
+        total = GestureScore()
+        for gesture_name, score in scores.items():
+            if self.gestures is None or gesture_name in self.gestures:
+                total.merge(score)
+        return Candidate(
+            params=params,
+            false_positives=total.false_positives,
+            latency=float(np.mean(total.latencies)) if total.latencies else math.inf,
+            recall=total.recall,
+            precision=total.precision
+        )
+
+    def run(self, param_sets: Iterable[Dict[str, Dict[str, Any]]],
+            chunk_size: Optional[int] = None) -> Tuple[List[Candidate], List[Candidate]]:
+        """
+        评估全部候选
+        Args:
+            param_sets: 候选参数（可以是生成器，每次只展开 chunk_size 个）
+            chunk_size: 每批评估的候选数，默认使用 THRESHOLD_SEARCH_CONFIG['chunk_size']
+        Returns:
+            (全部候选, 帕累托前沿)
+        """
+        chunk_size = chunk_size or config.THRESHOLD_SEARCH_CONFIG['chunk_size']
+        candidates = []
+        iterator = iter(param_sets)
+        while True:
+            chunk = list(itertools.islice(iterator, chunk_size))
+            if not chunk:
+                break
+            reports = self.evaluator.evaluate(chunk)
+            candidates.extend(self.summarize(params, scores) for params, scores in zip(chunk, reports))
+        return candidates, pareto_front(candidates, self.min_recall)
+
+
+def main():
+    """命令行入口"""
+    search_config = config.THRESHOLD_SEARCH_CONFIG
+    parser = argparse.ArgumentParser(description="手势阈值自动搜索")
+    parser.add_argument("sessions", nargs="+", help="带标注的录制文件、目录或通配符")
+    parser.add_argument("--space", help="搜索空间JSON文件，默认使用 THRESHOLD_SEARCH_CONFIG['space']")
+    parser.add_argument("--method", choices=["grid", "random"], default=search_config['method'])
+    parser.add_argument("--samples", type=int, default=search_config['samples'], help="随机搜索候选数")
+    parser.add_argument("--steps", type=int, default=search_config['grid_steps'], help="网格搜索每个参数的取值个数")
+    parser.add_argument("--seed", type=int, default=search_config['seed'])
+    parser.add_argument("--gesture", action="append", help="只按指定手势打分（可重复）")
+    parser.add_argument("--min-recall", type=float, help="进入帕累托前沿的最低召回率")
+    parser.add_argument("--workers", type=int, help="并行进程数")
+    parser.add_argument("--vectorized", action="store_true",
+                        help="使用向量化批量检测打分（只搜索和评估静态手势参数）")
+    parser.add_argument("--output", help="将帕累托前沿写入JSON文件")
+    args = parser.parse_args()
+
+    sessions = find_sessions(args.sessions)
+    if not sessions:
+        print("未找到录制文件")
+        raise SystemExit(1)
+
+    space = search_config['space']
+    if args.space:
+        with open(args.space, 'r', encoding='utf-8') as f:
+            space = json.load(f)
+
+    if args.vectorized:
+        dropped = [key for key in space if parse_key(key)[0] not in STATIC_GESTURE_KEYS]
+        if dropped:
+            print(f"向量化打分只支持静态手势，忽略参数: {', '.join(dropped)}")
+        space = {key: spec for key, spec in space.items() if key not in dropped}
+
+    if args.method == "grid":
+        total = grid_size(space, args.steps)
+        if total > search_config['max_grid_candidates']:
+            print(f"网格搜索共 {total} 组参数，超过上限 {search_config['max_grid_candidates']}"
+                  f"（max_grid_candidates）。请减少 --steps 或搜索参数个数，或使用 --method random")
+            raise SystemExit(1)
+        param_sets = grid_candidates(space, args.steps)
+    else:
+        total = args.samples
+        param_sets = random_candidates(space, args.samples, args.seed)
+    print(f"评估 {total} 组参数 × {len(sessions)} 个录制文件")
+
+    with BatchEvaluator(sessions, args.workers, vectorized=args.vectorized) as evaluator:
+        search = ThresholdSearch(evaluator, args.gesture, args.min_recall)
+        candidates, front = search.run(param_sets)
+
+    print(f"\n帕累托前沿（召回率 >= {search.min_recall:.0%}）：")
+    for candidate in front:
+        print(f"  延迟 {candidate.latency * 1000:6.0f}ms  误报 {candidate.false_positives:4d}  "
+              f"召回率 {candidate.recall:6.1%}  精确率 {candidate.precision:6.1%}  "
+              f"{json.dumps(candidate.params, ensure_ascii=False)}")
+    if not front:
+        print("  没有满足召回率要求的候选")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'pareto_front': [c.to_dict() for c in front],
+                'candidates': [c.to_dict() for c in candidates]
+            }, f, ensure_ascii=False, indent=2)
+        print(f"结果已保存到 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+静态手势分类器训练 - 用标注过的录制会话离线训练 PoseClassifier，只需要CPU
+
+标注区间（见 batch_eval 的 .labels.json 格式）内的手部记录作为该手势的样本，
+距离所有标注区间超过 --background-margin 秒的记录作为背景样本（用于拒识不属于任何手势的手型）。
+
+命令行用法：
+
+    python -m session.train_pose_classifier recordings/ --method knn --output pose_classifier.npz
+    python -m session.train_pose_classifier recordings/train/ --test recordings/test/
+"""
+
+import argparse
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from gestures.static.pose_classifier import PoseClassifier, pose_features, BACKGROUND
+from .recorder import SessionReader, NO_HAND, decode_hand_type
+from .batch_eval import find_sessions, load_labels
+import config
+
+
+def collect_samples(paths: Sequence[str], gestures: Optional[Sequence[str]] = None,
+                    background_margin: float = 0.5) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """
+    从录制会话中收集训练样本
+    Args:
+        paths: 录制文件路径
+        gestures: 要使用的手势名称，None 表示所有标注
+        background_margin: 背景样本与标注区间的最小时间间隔（秒）
+    Returns:
+        (形状 (N, 21, 3) 的关键点, 形状 (N,) 的左手标记, 类别名称列表)
+    """
+    all_landmarks, all_left, all_labels = [], [], []
+    for path in paths:
+        labels = [label for label in load_labels(path) if not gestures or label['gesture'] in gestures]
+        reader = SessionReader(path)
+        records = reader.records
+        rows = np.flatnonzero(records['hand_type'] != NO_HAND)
+        timestamps = records['timestamp'][rows]
+
+        names = np.full(len(rows), BACKGROUND, dtype=object)
+        near_label = np.zeros(len(rows), dtype=bool)
+        for label in labels:
+            inside = (timestamps >= label['start']) & (timestamps <= label['end'])
+            names[inside] = label['gesture']
+            near_label |= ((timestamps >= label['start'] - background_margin) &
+                           (timestamps <= label['end'] + background_margin) & ~inside)
+
+        keep = ~near_label
+        all_landmarks.append(np.asarray(records['landmarks'][rows[keep]], dtype=np.float64))
+        all_left.append(np.array([decode_hand_type(code) == 'Left'
+                                  for code in records['hand_type'][rows[keep]]], dtype=bool))
+        all_labels.extend(names[keep].tolist())
+        reader.close()
+
+    if not all_landmarks:
+        return np.zeros((0, 21, 3)), np.zeros(0, dtype=bool), []
+    return np.concatenate(all_landmarks), np.concatenate(all_left), all_labels
+
+
+def balance_background(labels: List[str], ratio: float, seed: int = 0) -> np.ndarray:
+    """
+    限制背景样本数量，避免背景类别淹没手势类别
+    Returns:
+        保留的样本索引
+    """
+    labels_array = np.asarray(labels, dtype=object)
+    background = np.flatnonzero(labels_array == BACKGROUND)
+    gesture_rows = np.flatnonzero(labels_array != BACKGROUND)
+    gesture_names = set(labels_array[gesture_rows].tolist())
+    limit = int(ratio * len(gesture_rows) / max(1, len(gesture_names)))
+    if len(background) > limit:
+        background = np.random.default_rng(seed).choice(background, limit, replace=False)
+    return np.sort(np.concatenate([gesture_rows, background]))
+
+
+def report_accuracy(model: PoseClassifier, landmarks: np.ndarray, left: np.ndarray, labels: List[str],
+                    title: str):
+    """打印整体和每个类别的准确率"""
+    start = time.perf_counter()
+    predicted, _, _ = model.predict(model.features(landmarks, left))
+    elapsed = time.perf_counter() - start
+    predicted_names = np.array([model.classes[i] for i in predicted], dtype=object)
+    truth = np.asarray(labels, dtype=object)
+
+    print(f"{title}: 准确率 {np.mean(predicted_names == truth):.1%} ({len(truth)} 个样本, "
+          f"每个样本 {elapsed / max(1, len(truth)) * 1e6:.1f}us)")
+    for name in sorted(set(labels)):
+        rows = truth == name
+        display = name or "(背景)"
+        print(f"  {display:<12} 召回率 {np.mean(predicted_names[rows] == name):6.1%}  样本 {rows.sum()}")
+
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="用标注过的录制会话训练静态手势分类器")
+    parser.add_argument("sessions", nargs="+", help="训练用录制文件、目录或通配符")
+    parser.add_argument("--test", nargs="*", help="测试用录制文件、目录或通配符")
+    parser.add_argument("--output", default=config.GESTURE_CONFIG['pose_classifier']['model_file'],
+                        help="模型文件路径")
+    parser.add_argument("--method", choices=["knn", "centroid"], default="knn", help="分类方法")
+    parser.add_argument("--k", type=int, default=5, help="knn 的近邻数")
+    parser.add_argument("--max-samples", type=int, default=100, help="knn 每个类别最多保留的样本数")
+    parser.add_argument("--gestures", nargs="*", help="只使用这些手势的标注（默认为所有标注）")
+    parser.add_argument("--background-margin", type=float, default=0.5,
+                        help="背景样本与标注区间的最小时间间隔（秒）")
+    parser.add_argument("--background-ratio", type=float, default=2.0,
+                        help="背景样本数最多为平均每个手势样本数的多少倍")
+    parser.add_argument("--orientation-weight", type=float, default=1.0,
+                        help="手掌朝向特征的权重，0 表示完全旋转无关（无法区分竖/倒竖大拇指）")
+    parser.add_argument("--no-rotation-invariance", action="store_true", help="不将手掌旋转到统一朝向")
+    args = parser.parse_args()
+
+    landmarks, left, labels = collect_samples(find_sessions(args.sessions), args.gestures,
+                                              args.background_margin)
+    if not any(name != BACKGROUND for name in labels):
+        print("没有找到手势标注样本")
+        raise SystemExit(1)
+
+    keep = balance_background(labels, args.background_ratio)
+    landmarks, left = landmarks[keep], left[keep]
+    labels = [labels[i] for i in keep]
+
+    rotation_invariant = not args.no_rotation_invariance
+    features = pose_features(landmarks, left, rotation_invariant, args.orientation_weight)
+    model = PoseClassifier.train(features, labels, args.method, args.k, args.max_samples,
+                                 rotation_invariant=rotation_invariant,
+                                 orientation_weight=args.orientation_weight)
+    model.save(args.output)
+    print(f"模型已保存: {args.output} ({args.method}, {len(model.references)} 个参考点, "
+          f"类别: {', '.join(model.gesture_names)})")
+
+    report_accuracy(model, landmarks, left, labels, "训练集")
+    if args.test:
+        test_landmarks, test_left, test_labels = collect_samples(find_sessions(args.test), args.gestures,
+                                                                 args.background_margin)
+        report_accuracy(model, test_landmarks, test_left, test_labels, "测试集")
+
+
+if __name__ == "__main__":
+    main()
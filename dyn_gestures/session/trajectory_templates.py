@@ -0,0 +1,97 @@
+"""
+轨迹模板生成 - 从标注过的录制会话中截取手势片段，生成 TrajectoryDetector 使用的模板文件
+
+每个标注区间（见 batch_eval 的 .labels.json 格式）生成一个模板，区间内出现多只手时取帧数最多的那只。
+默认只使用内置手势以外的标注（如 Circle、Wave、PinchZoom），也可以用 --gestures 指定。
+
+命令行用法：
+
+    python -m session.trajectory_templates recordings/ --output trajectory_templates.npz
+"""
+
+import argparse
+import os
+from typing import Optional, Sequence
+
+import numpy as np
+
+from gestures.dynamic.trajectory import TrajectoryTemplateStore, DEFAULT_FINGERTIPS
+from .recorder import SessionReader, NO_HAND, default_gesture_names
+from .batch_eval import find_sessions, load_labels
+import config
+
+
+MIN_TEMPLATE_FRAMES = 5
+
+
+def add_session_templates(store: TrajectoryTemplateStore, path: str,
+                          gestures: Optional[Sequence[str]] = None) -> int:
+    """
+    从一个录制会话中截取模板加入模板库
+    Args:
+        store: 模板库
+        path: 录制文件路径
+        gestures: 要使用的手势名称，None 表示内置手势以外的所有标注
+    Returns:
+        添加的模板数
+    """
+    builtin = set(default_gesture_names())
+    labels = [label for label in load_labels(path)
+              if (label['gesture'] in gestures if gestures else label['gesture'] not in builtin)]
+    if not labels:
+        return 0
+
+    reader = SessionReader(path)
+    records = reader.records
+    added = 0
+    for label in labels:
+        in_range = (records['timestamp'] >= label['start']) & (records['timestamp'] <= label['end'])
+        rows = np.flatnonzero(in_range & (records['hand_type'] != NO_HAND))
+        if len(rows) == 0:
+            continue
+        hand_ids, counts = np.unique(records['hand_id'][rows], return_counts=True)
+        rows = rows[records['hand_id'][rows] == hand_ids[np.argmax(counts)]]
+        if len(rows) < MIN_TEMPLATE_FRAMES:
+            print(f"{path}: {label['gesture']} 片段只有 {len(rows)} 帧，已跳过")
+            continue
+        store.add(label['gesture'], np.asarray(records['landmarks'][rows]))
+        added += 1
+    reader.close()
+    return added
+
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="从标注过的录制会话生成轨迹模板")
+    parser.add_argument("sessions", nargs="+", help="录制文件、目录或通配符")
+    parser.add_argument("--output", default=config.GESTURE_CONFIG['trajectory']['template_file'],
+                        help="模板文件路径")
+    parser.add_argument("--gestures", nargs="*", help="只使用这些手势的标注（默认为内置手势以外的标注）")
+    parser.add_argument("--length", type=int, default=32, help="模板长度（帧）")
+    parser.add_argument("--band-ratio", type=float, default=0.1, help="DTW带宽占模板长度的比例")
+    parser.add_argument("--append", action="store_true", help="追加到已有的模板文件")
+    args = parser.parse_args()
+
+    if args.append and os.path.exists(args.output):
+        store = TrajectoryTemplateStore.load(args.output)
+    else:
+        store = TrajectoryTemplateStore(args.length, DEFAULT_FINGERTIPS, args.band_ratio)
+
+    total = 0
+    for path in find_sessions(args.sessions):
+        count = add_session_templates(store, path, args.gestures)
+        if count:
+            print(f"{path}: {count} 个模板")
+        total += count
+
+    if total == 0:
+        print("没有找到可用的标注片段")
+        raise SystemExit(1)
+
+    store.save(args.output)
+    summary = ", ".join(f"{name} x{store.names.count(name)}" for name in store.gesture_names())
+    print(f"模板已保存: {args.output} ({len(store)} 个模板: {summary})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+启动耗时指标 - 从启动到检测器就绪、到识别出第一个手势的时间
+
+检测器就绪时记录模型创建和预热耗时、使用的 delegate 以及是否命中 delegate 缓存；
+第一个手势开始时记录启动到首个手势的时间。两项都会打印，并以 JSON 行追加到 metrics_file。
+时间从进程启动算起（入口模块在导入 mediapipe / OpenCV 之前记录），包含导入和模型加载的冷启动耗时；
+界面中检测由用户点击开始，run_start_s 记录进程启动到开始检测的时间，可从总时间中扣除。
+"""
+
+import json
+import os
+import time
+from typing import Dict, Any, Optional
+
+from gesture_events import GestureEvent, STARTED
+import config
+
+
+class StartupMetrics:
+    """记录一次启动的耗时指标"""
+
+    def __init__(self, source: str, start_time: Optional[float] = None, run_start: Optional[float] = None):
+        """
+        Args:
+            source: 启动来源（main / daemon / ui）
+            start_time: 进程启动时间（time.time，在入口模块导入其他模块之前记录），默认为创建时
+            run_start: 开始检测的时间，与进程启动不同时（如界面中点击开始）记录两者之差
+        """
+        self.source = source
+        self.start_time = start_time if start_time is not None else time.time()
+        self.run_start_s = run_start - self.start_time if run_start is not None else 0.0
+        self.ready_s: Optional[float] = None
+        self.first_gesture_s: Optional[float] = None
+        self.detector_stats: Dict[str, Any] = {}
+
+    def detector_ready(self, detector):
+        """检测器创建并预热完成时调用"""
+        self.ready_s = time.time() - self.start_time
+        self.detector_stats = dict(getattr(detector, 'startup_stats', {}))
+        stats = self.detector_stats
+        cached = "，使用缓存的探测结果" if stats.get('delegate_cached') else ""
+        if self.run_start_s:
+            cached += f"，其中 {self.run_start_s:.2f}s 为开始检测前的等待"
+        print(f"检测器就绪: {self.ready_s:.2f}s（{stats.get('delegate', '?')} delegate{cached}，"
+              f"创建 {stats.get('create_ms')}ms，预热 {stats.get('warmup_ms')}ms）")
+        self._write('ready')
+
+    def gesture_event(self, event: GestureEvent) -> bool:
+        """
+        每个手势事件调用一次
+        Returns:
+            是否为启动后的第一个手势
+        """
+        if self.first_gesture_s is not None or event.type != STARTED:
+            return False
+        self.first_gesture_s = time.time() - self.start_time
+        print(f"启动到首个手势: {self.first_gesture_s:.2f}s（{event.gesture}）")
+        self._write('first_gesture', gesture=event.gesture)
+        return True
+
+    def _write(self, stage: str, **extra):
+        """追加一条指标记录"""
+        metrics_file = config.LANDMARKER_CONFIG['startup_metrics_file']
+        if not metrics_file:
+            return
+        record = {'timestamp': time.time(), 'source': self.source, 'stage': stage, **self.get_stats(), **extra}
+        try:
+            directory = os.path.dirname(metrics_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(metrics_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        except OSError as e:
+            print(f"写入启动指标失败: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """启动到就绪、到首个手势的秒数，以及检测器的创建和预热信息"""
+        return {
+            'run_start_s': round(self.run_start_s, 3),
+            'ready_s': round(self.ready_s, 3) if self.ready_s is not None else None,
+            'first_gesture_s': round(self.first_gesture_s, 3) if self.first_gesture_s is not None else None,
+            'detector': self.detector_stats
+        }
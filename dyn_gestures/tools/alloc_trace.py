@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+逐帧内存分配追踪 - 用 tracemalloc 检查采集/翻转/推理/手势检测流程在稳定运行时的内存分配
+
+预热若干帧后开始追踪，报告每帧的临时分配峰值、净增长和净增长最多的代码位置。
+使用 --no-reuse 可以对比不复用缓冲区（每帧分配新图像）时的结果。
+
+    python tools/alloc_trace.py --source 0 --frames 300
+    python tools/alloc_trace.py --source clip.mp4 --no-inference --no-reuse
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+
+import cv2
+
+# 添加项目路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_buffers import FrameBufferPool
+from gesture_manager import GestureManager
+import config
+
+
+def open_source(source: str):
+    """打开摄像头编号或视频文件"""
+    cap = cv2.VideoCapture(int(source) if source.isdigit() else source)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, config.CAMERA_FRAME_WIDTH)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config.CAMERA_FRAME_HEIGHT)
+    return cap
+
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="追踪每帧处理流程的内存分配")
+    parser.add_argument("--source", default=str(config.CAMERA_INDEX), help="摄像头编号或视频文件路径")
+    parser.add_argument("--frames", type=int, default=300, help="追踪的帧数")
+    parser.add_argument("--warmup", type=int, default=60, help="开始追踪前的预热帧数")
+    parser.add_argument("--no-inference", action="store_true", help="不运行手部推理（只追踪采集和翻转）")
+    parser.add_argument("--no-reuse", action="store_true", help="不复用缓冲区，作为对比")
+    parser.add_argument("--top", type=int, default=10, help="显示净增长最多的代码位置数")
+    args = parser.parse_args()
+
+    cap = open_source(args.source)
+    if not cap.isOpened():
+        print(f"无法打开: {args.source}")
+        raise SystemExit(1)
+
+    detector = None
+    if not args.no_inference:
+        from cvzone.HandTrackingModule import HandDetector
+        detector = HandDetector(maxHands=config.HAND_DETECTION_CONFIG['max_hands'])
+    gesture_manager = GestureManager()
+    buffers = FrameBufferPool()
+    flip = config.DISPLAY_CONFIG['flip_image']
+
+    def process_one() -> bool:
+        if args.no_reuse:
+            success, img = cap.read()
+        else:
+            success, img = buffers.read(cap)
+        if not success:
+            return False
+        if flip:
+            img = cv2.flip(img, 1) if args.no_reuse else buffers.flip(img, 1)
+        if detector is not None:
+            hands, _ = detector.findHands(img, draw=False, flipType=not flip)
+            for i, hand in enumerate(hands):
+                gesture_manager.detect_events(hand["lmList"], f"hand_{i}", hand["type"])
+            if not hands:
+                gesture_manager.on_all_hands_lost()
+        return True
+
+    for _ in range(args.warmup):
+        if not process_one():
+            print("预热阶段读取帧失败")
+            raise SystemExit(1)
+
+    tracemalloc.start()
+    start_snapshot = tracemalloc.take_snapshot()
+    frames = 0
+    max_peak = 0
+    for _ in range(args.frames):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        if not process_one():
+            break
+        _, peak = tracemalloc.get_traced_memory()
+        max_peak = max(max_peak, peak - current)
+        frames += 1
+    end_snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    cap.release()
+
+    if frames == 0:
+        print("没有读取到帧")
+        raise SystemExit(1)
+
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    stats = end_snapshot.filter_traces(filters).compare_to(start_snapshot.filter_traces(filters), 'lineno')
+    growth = sum(stat.size_diff for stat in stats)
+
+    mode = "不复用缓冲区" if args.no_reuse else "复用缓冲区"
+    print(f"{mode}，{frames} 帧:")
+    print(f"  每帧临时分配峰值: {max_peak / 1024:.1f} KiB")
+    print(f"  净增长: {growth / 1024:.1f} KiB（每帧 {growth / frames:.0f} B）")
+    print("  净增长最多的位置:")
+    for stat in stats[:args.top]:
+        if stat.size_diff:
+            print(f"    {stat.traceback}: {stat.size_diff / 1024:+.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
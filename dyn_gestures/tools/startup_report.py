@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+启动耗时报告 - 用 python -X importtime 分析导入某个模块的耗时构成
+
+在子进程中导入目标模块（默认是 Qt 应用入口 app，只导入不运行），按顶层包汇总所有层级模块的自身耗时
+（各包之和等于总耗时，被嵌套导入的 cv2、numpy 等计入它们自己的包），同时给出每个包最外层导入的累计耗时，
+并列出自身耗时最多的模块。--preload 同时导入窗口显示后在后台预加载的模块，
+可以对比哪些耗时已经移出了窗口显示之前的关键路径。
+
+    python tools/startup_report.py
+    python tools/startup_report.py --module daemon --top 20
+    python tools/startup_report.py --preload
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+# ui.threads 的子模块都是按需导入的，这里只取预加载列表，不会导入 PyQt6
+from ui.threads import BACKEND_MODULES
+
+
+def run_importtime(modules: List[str]) -> Tuple[List[Tuple[int, int, int, str]], str]:
+    """
+    在子进程中导入模块并解析 -X importtime 输出
+    Returns:
+        ([(嵌套层级, 自身耗时us, 累计耗时us, 模块名)], 子进程错误输出中的非 importtime 行)
+    """
+    statements = "\n".join(
+        f"try:\n    import {name}\nexcept Exception as e:\n    print('导入 {name} 失败:', e, file=sys.stderr)"
+        for name in modules
+    )
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import sys\n{statements}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+
+    entries = []
+    other_lines = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            other_lines.append(line)
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue    # 表头
+        name_field = fields[2]
+        stripped = name_field.lstrip()
+        level = (len(name_field) - len(stripped) - 1) // 2
+        entries.append((level, int(fields[0]), int(fields[1]), stripped))
+    return entries, "\n".join(other_lines)
+
+
+def summarize_packages(entries: List[Tuple[int, int, int, str]]) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """
+    按顶层包汇总 importtime 数据
+    Args:
+        entries: run_importtime 解析出的条目（子模块在父模块之前输出）
+    Returns:
+        ({包名: 所有层级模块的自身耗时之和us}, {包名: 该包最外层导入的累计耗时之和us})
+    """
+    self_times = defaultdict(int)
+    cumulative_times = defaultdict(int)
+    ancestors: List[str] = []   # 逆序遍历时当前条目各层祖先所属的包
+    for level, self_us, cumulative, name in reversed(entries):
+        package = name.split('.')[0]
+        del ancestors[level:]
+        self_times[package] += self_us
+        if package not in ancestors:
+            cumulative_times[package] += cumulative
+        ancestors.append(package)
+    return self_times, cumulative_times
+
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="分析导入耗时的构成")
+    parser.add_argument("--module", default="app", help="要分析的模块（默认 app）")
+    parser.add_argument("--preload", action="store_true", help="同时导入窗口显示后在后台预加载的模块")
+    parser.add_argument("--top", type=int, default=15, help="列出自身耗时最多的模块数")
+    args = parser.parse_args()
+
+    modules = [args.module] + (list(BACKEND_MODULES) if args.preload else [])
+    entries, errors = run_importtime(modules)
+    if errors.strip():
+        print(errors.strip())
+    if not entries:
+        print("没有得到 importtime 数据")
+        raise SystemExit(1)
+
+    self_times, cumulative_times = summarize_packages(entries)
+    total = sum(self_times.values())
+
+    print(f"导入 {' + '.join(modules)}: 共 {total / 1000:.1f}ms，{len(entries)} 个模块")
+    print("\n按顶层包汇总（自身耗时之和；累计为该包最外层导入的耗时，包含它导入的其他包）:")
+    for name, self_us in sorted(self_times.items(), key=lambda item: -item[1]):
+        if self_us >= total * 0.01:
+            print(f"  {self_us / 1000:8.1f}ms  {self_us / total:6.1%}  (累计 {cumulative_times[name] / 1000:.1f}ms)  {name}")
+
+    print(f"\n自身耗时最多的 {args.top} 个模块:")
+    for _, self_us, cumulative, name in sorted(entries, key=lambda entry: -entry[1])[:args.top]:
+        print(f"  {self_us / 1000:8.1f}ms  (累计 {cumulative / 1000:.1f}ms)  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+# -*- coding: gbk -*-
 """
 UIת - .uiļתΪPython
 """
@@ -77,21 +78,39 @@ def watch_ui_file(ui_file, py_file=None, pyqt_version=6):
     except KeyboardInterrupt:
         print("\n? ֹͣ")
 
+def build_forms(force=False):
+    """
+    Ӧʱصıģ飨¼.uiļϣʱ.uiļ
+    """
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from ui.form_loader import build_forms as build
+    
+    built = build(force)
+    print("" if built == 0 else f" {built} ")
+
 def main():
     """"""
     import argparse
     
     parser = argparse.ArgumentParser(description="UIļת")
-    parser.add_argument("ui_file", help=".uiļ·")
+    parser.add_argument("ui_file", nargs="?", help=".uiļ·")
     parser.add_argument("-o", "--output", help=".pyļ·")
     parser.add_argument("-v", "--version", type=int, choices=[5, 6], default=6, 
                        help="PyQt汾 (56Ĭ6)")
     parser.add_argument("-w", "--watch", action="store_true", 
                        help="ļ仯Զת")
+    parser.add_argument("--build", action="store_true",
+                       help="Ӧʱʹõıģ飨.uiļδ޸ʱ")
+    parser.add_argument("--force", action="store_true",
+                       help=" --build һʹãǿ")
     
     args = parser.parse_args()
     
-    if args.watch:
+    if args.build:
+        build_forms(args.force)
+    elif args.ui_file is None:
+        parser.error("Ҫָ.uiļ·ʹ --build")
+    elif args.watch:
         watch_ui_file(args.ui_file, args.output, args.version)
     else:
         ui_to_py(args.ui_file, args.output, args.version)
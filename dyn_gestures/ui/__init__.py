@@ -1,13 +1,23 @@
 """
 UI模块 - 包含所有图形界面相关的代码
+
+子模块按需导入：导入 ui.main_window_ui 时不会连带加载检测线程、OpenCV 和蓝牙模块。
 """
 
-from .main_window import MainWindow
-from .widgets.binding_config import GestureBindingDialog
-from .threads.gesture_detection import GestureDetectionThread
+from lazy_exports import lazy_exports
+
+_EXPORTS = {
+    'MainWindow': '.main_window',
+    'GestureBindingDialog': '.widgets.binding_config',
+    'GestureDetectionThread': '.threads.gesture_detection',
+    'BackendPreloader': '.threads.backend_preload'
+}
 
 __all__ = [
     'MainWindow',
     'GestureBindingDialog', 
-    'GestureDetectionThread'
-] 
\ No newline at end of file
+    'GestureDetectionThread',
+    'BackendPreloader'
+]
+
+__getattr__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,152 @@
+"""
+界面表单加载 - 使用由 .ui 文件预先生成的 Python 表单类，启动时不再解析 XML
+
+生成的模块第一行记录 .ui 文件的 SHA-256，启动时只比较哈希：
+一致时直接导入生成的表单类；.ui 文件修改过或表单尚未生成时先用 PyQt6.uic.compileUi 重新生成。
+打包或部署前可在项目根目录运行 python -m ui.form_loader 预先生成（--force 忽略哈希强制重新生成）。
+"""
+
+import argparse
+import hashlib
+import importlib
+import importlib.util
+import os
+import sys
+from typing import Optional
+
+UI_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(UI_DIR)
+HASH_PREFIX = '# ui-hash: '
+
+# 生成的表单模块 -> .ui 文件
+FORMS = {
+    'ui.main_window_form': os.path.join(UI_DIR, 'main_window.ui'),
+}
+
+
+def form_path(module_name: str) -> str:
+    """生成的表单模块文件路径"""
+    return os.path.join(PROJECT_ROOT, *module_name.split('.')) + '.py'
+
+
+def ui_file_hash(ui_file: str) -> str:
+    """计算 .ui 文件内容的 SHA-256"""
+    with open(ui_file, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def generated_hash(py_file: str) -> Optional[str]:
+    """读取生成模块第一行记录的 .ui 哈希，文件不存在或没有记录时返回None"""
+    try:
+        with open(py_file, 'r', encoding='utf-8') as f:
+            first_line = f.readline()
+    except OSError:
+        return None
+    return first_line[len(HASH_PREFIX):].strip() if first_line.startswith(HASH_PREFIX) else None
+
+
+def is_up_to_date(module_name: str) -> bool:
+    """生成的表单是否与 .ui 文件一致（.ui 文件不存在时以已生成的表单为准）"""
+    ui_file = FORMS[module_name]
+    py_file = form_path(module_name)
+    if not os.path.exists(ui_file):
+        return os.path.exists(py_file)
+    return generated_hash(py_file) == ui_file_hash(ui_file)
+
+
+def compile_form(module_name: str):
+    """用 PyQt6.uic 把 .ui 文件编译为 Python 表单模块，并记录 .ui 哈希"""
+    from PyQt6 import uic
+
+    ui_file = FORMS[module_name]
+    py_file = form_path(module_name)
+    temp_file = py_file + '.tmp'
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        f.write(f"{HASH_PREFIX}{ui_file_hash(ui_file)}\n")
+        uic.compileUi(ui_file, f)
+    # 写完后再替换，避免并发启动时导入到不完整的文件
+    os.replace(temp_file, py_file)
+    # 同一秒内重新生成时字节码缓存可能仍被视为有效，直接删除
+    try:
+        os.remove(importlib.util.cache_from_source(py_file))
+    except OSError:
+        pass
+
+
+def build_forms(force: bool = False) -> int:
+    """
+    生成所有过期的表单模块（构建步骤）
+    Args:
+        force: 是否忽略哈希强制重新生成
+    Returns:
+        重新生成的表单数量
+    """
+    built = 0
+    for module_name in FORMS:
+        if force or not is_up_to_date(module_name):
+            compile_form(module_name)
+            print(f"已生成表单: {FORMS[module_name]} -> {form_path(module_name)}")
+            built += 1
+    return built
+
+
+def load_form_class(module_name: str):
+    """
+    加载生成的表单类，.ui 文件修改过时先重新生成
+    Returns:
+        Ui_* 表单类；无法生成（如安装目录只读）时返回None
+    """
+    try:
+        regenerated = not is_up_to_date(module_name)
+        if regenerated:
+            print(f"表单未生成或界面文件已修改，重新生成: {form_path(module_name)}")
+            compile_form(module_name)
+            importlib.invalidate_caches()
+        module = importlib.import_module(module_name)
+        if regenerated and module_name in sys.modules:
+            module = importlib.reload(module)
+    except Exception as e:
+        print(f"加载生成的表单失败，改为运行时解析 .ui 文件: {e}")
+        return None
+
+    for name, value in vars(module).items():
+        if name.startswith('Ui_') and isinstance(value, type):
+            return value
+    return None
+
+
+def setup_form(widget, module_name: str):
+    """
+    在 widget 上创建表单中的控件，并把控件设为 widget 的属性（与 uic.loadUi(ui_file, widget) 效果相同）
+    Args:
+        widget: 表单的顶层控件（如 QMainWindow 实例）
+        module_name: 生成的表单模块名，见 FORMS
+    """
+    form_class = load_form_class(module_name)
+    if form_class is None:
+        ui_file = FORMS[module_name]
+        if not os.path.exists(ui_file):
+            raise FileNotFoundError(f"UI文件不存在: {ui_file}")
+        from PyQt6 import uic
+        uic.loadUi(ui_file, widget)
+        return
+
+    form = form_class()
+    form.setupUi(widget)
+    for name, value in vars(form).items():
+        setattr(widget, name, value)
+
+
+def main():
+    """命令行入口：生成过期的表单模块"""
+    parser = argparse.ArgumentParser(description="生成 .ui 文件对应的表单模块")
+    parser.add_argument("--force", action="store_true", help="忽略哈希强制重新生成")
+    args = parser.parse_args()
+
+    built = build_forms(args.force)
+    if not built:
+        print("表单已是最新")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+日志缓冲 - 固定容量的界面日志模型
+
+消息先进入缓冲区，由界面定时器批量取出并一次性追加到日志控件，避免每条消息都触发一次重排和滚动。
+相同消息在 duplicate_window 秒内重复出现时只累计次数，窗口结束或出现新消息时补记一行重复次数。
+"""
+
+import time
+from collections import deque
+from datetime import datetime
+from typing import List, Optional
+
+import config
+
+
+class LogBuffer:
+    """固定容量的日志环形缓冲区，带重复消息抑制"""
+
+    def __init__(self, capacity: Optional[int] = None, duplicate_window: Optional[float] = None):
+        """
+        Args:
+            capacity: 保留的最大行数，默认取 LOG_VIEW_CONFIG
+            duplicate_window: 重复消息的合并窗口（秒），默认取 LOG_VIEW_CONFIG
+        """
+        view_config = config.LOG_VIEW_CONFIG
+        self.capacity = capacity if capacity is not None else view_config['capacity']
+        self.duplicate_window = (duplicate_window if duplicate_window is not None
+                                 else view_config['duplicate_window'])
+
+        self.pending = deque(maxlen=self.capacity)   # 尚未刷新到界面的日志行（界面控件按 capacity 保留已显示的行）
+        self.dropped = 0                             # 两次刷新之间因超出容量被丢弃的行数
+        self.suppressed = 0                          # 累计被合并的重复消息数
+
+        self._last_message: Optional[str] = None
+        self._last_time = 0.0
+        self._repeat_count = 0
+
+    def add(self, message: str, now: Optional[float] = None):
+        """
+        添加一条日志消息
+        Args:
+            message: 消息文本（不含时间戳）
+            now: 当前时间（time.time），默认取当前时间
+        """
+        now = time.time() if now is None else now
+        if message == self._last_message and now - self._last_time < self.duplicate_window:
+            self._repeat_count += 1
+            self.suppressed += 1
+            return
+
+        self._flush_repeats(now)
+        self._last_message = message
+        self._last_time = now
+        self._append(message, now)
+
+    def take_pending(self, now: Optional[float] = None) -> List[str]:
+        """
+        取出尚未显示的日志行
+        Args:
+            now: 当前时间（time.time），默认取当前时间
+        Returns:
+            按时间顺序排列的日志行
+        """
+        now = time.time() if now is None else now
+        if self._repeat_count and now - self._last_time >= self.duplicate_window:
+            self._flush_repeats(now)
+
+        lines = list(self.pending)
+        if self.dropped:
+            lines.insert(0, self._format(f"（日志过多，已省略 {self.dropped} 条）", now))
+            self.dropped = 0
+        self.pending.clear()
+        return lines
+
+    def clear(self):
+        """清空缓冲区"""
+        self.pending.clear()
+        self.dropped = 0
+        self._last_message = None
+        self._repeat_count = 0
+
+    def _flush_repeats(self, now: float):
+        """补记上一条消息的重复次数"""
+        if self._repeat_count:
+            self._append(f"（上条消息重复 {self._repeat_count} 次）", now)
+            self._repeat_count = 0
+
+    def _append(self, message: str, now: float):
+        """追加一行带时间戳的日志"""
+        line = self._format(message, now)
+        if len(self.pending) == self.pending.maxlen:
+            self.dropped += 1
+        self.pending.append(line)
+
+    @staticmethod
+    def _format(message: str, now: float) -> str:
+        """添加时间戳"""
+        return f"[{datetime.fromtimestamp(now).strftime('%H:%M:%S')}] {message}"
@@ -6,14 +6,15 @@ import sys
 import cv2
 import numpy as np
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QLabel, QPushButton, QTextEdit, QTabWidget, 
+                             QLabel, QPushButton, QPlainTextEdit, QTabWidget, 
                              QGroupBox, QSplitter, QFrame, QScrollArea,
                              QGridLayout, QSpacerItem, QSizePolicy, QMessageBox)
-from PyQt6.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve, pyqtProperty
+from PyQt6.QtCore import Qt, QTimer, QEvent, QPropertyAnimation, QEasingCurve, pyqtProperty
 from PyQt6.QtGui import QPixmap, QImage, QFont, QPalette, QColor, QLinearGradient, QPainter
 
 from .widgets.binding_config import GestureBindingDialog
 from .threads.gesture_detection import GestureDetectionThread
+from .log_buffer import LogBuffer
 from core.gesture_bindings import GestureBindings
 from core.action_executor import ActionExecutor
 from bluetooth.manager import BluetoothManager
@@ -147,6 +148,7 @@ class MainWindow(QMainWindow):
         self.action_executor = ActionExecutor()
         self.detection_thread = None
         self.bluetooth_manager = None
+        self.log_buffer = LogBuffer()
         
         self.init_ui()
         self.setup_detection()
@@ -354,8 +356,10 @@ class MainWindow(QMainWindow):
         log_layout.addLayout(log_header)
         
         # 日志显示区域
-        self.log_text = QTextEdit()
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
+        self.log_text.setUndoRedoEnabled(False)
+        self.log_text.setMaximumBlockCount(self.log_buffer.capacity)
         self.log_text.setMaximumHeight(300)
         self.log_text.setObjectName("modernLogText")
         log_layout.addWidget(self.log_text)
@@ -441,8 +445,8 @@ class MainWindow(QMainWindow):
     def setup_detection(self):
         """设置检测线程"""
         self.detection_thread = GestureDetectionThread()
-        self.detection_thread.gesture_detected.connect(self.on_gesture_detected)
-        self.detection_thread.frame_processed.connect(self.on_frame_processed)
+        self.detection_thread.gesture_event.connect(self.on_gesture_event)
+        self.detection_thread.preview_ready.connect(self.on_preview_ready)
         self.detection_thread.status_updated.connect(self.on_status_updated)
     
     def setup_bluetooth(self):
@@ -455,9 +459,6 @@ class MainWindow(QMainWindow):
                 self.bluetooth_manager.bluetooth_gesture_detected.connect(
                     self.on_bluetooth_gesture_detected
                 )
-                self.bluetooth_manager.bluetooth_hand_data_received.connect(
-                    self.on_bluetooth_hand_data_received
-                )
                 self.bluetooth_manager.bluetooth_status_changed.connect(
                     self.on_bluetooth_status_changed
                 )
@@ -481,6 +482,9 @@ class MainWindow(QMainWindow):
         """开始检测"""
         if self.detection_thread and not self.detection_thread.running:
             self.detection_thread.running = True
+            label_size = self.camera_label.size()
+            self.detection_thread.set_preview_size(label_size.width(), label_size.height())
+            self.detection_thread.set_preview_enabled(not self.isMinimized())
             self.detection_thread.start()
             
             self.start_btn.setEnabled(False)
@@ -504,42 +508,31 @@ class MainWindow(QMainWindow):
         if self.bluetooth_manager:
             self.bluetooth_manager.stop_bluetooth_server()
     
-    def on_gesture_detected(self, gesture_name: str, hand_type: str, confidence: float):
-        """手势检测回调"""
-        # 更新最近检测的手势显示
-        gesture_text = f"{hand_type}手: {gesture_name}\n置信度: {confidence:.1f}%"
-        self.recent_gesture_label.setText(gesture_text)
-        
-        # 记录日志
-        self.add_log_message(f"🎯 检测到手势: {gesture_text}")
+    def on_gesture_event(self, event):
+        """手势事件回调：started 时显示并执行动作，held 时按绑定的 repeat 设置重复执行"""
+        if event.type == "started":
+            # 更新最近检测的手势显示
+            gesture_text = f"{event.hand_type}手: {event.gesture}\n置信度: {event.confidence:.1f}%"
+            self.recent_gesture_label.setText(gesture_text)
+            
+            # 记录日志
+            self.add_log_message(f"🎯 检测到手势: {gesture_text}")
         
         # 执行对应的动作
-        binding = self.gesture_bindings.get_binding(gesture_name)
+        binding = self.gesture_bindings.get_binding(event.gesture)
         if binding and binding.get("enabled", True):
-            result = self.action_executor.execute_action(gesture_name, binding)
-            if result is True:
+            result = self.action_executor.execute_event(event, binding)
+            if result is True and event.type == "started":
                 self.add_log_message(f"✅ 执行动作: {binding.get('description', binding.get('action', ''))}")
             elif result is False:
                 self.add_log_message(f"❌ 执行动作失败: {binding.get('action', '')}")
-            # 如果result是None（冷却时间内），则不打印任何日志
+            # 如果result是None（冷却时间内或不需要执行），则不打印任何日志
     
-    def on_frame_processed(self, frame):
-        """帧处理回调"""
-        # 将OpenCV图像转换为Qt图像
-        height, width, channel = frame.shape
-        bytes_per_line = 3 * width
-        q_image = QImage(frame.data, width, height, bytes_per_line, QImage.Format.Format_RGB888)
-        q_image = q_image.rgbSwapped()  # BGR to RGB
-        
-        # 缩放图像以适应显示区域
-        pixmap = QPixmap.fromImage(q_image)
-        scaled_pixmap = pixmap.scaled(
-            self.camera_label.size(), 
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
-        
-        self.camera_label.setPixmap(scaled_pixmap)
+    def on_preview_ready(self, q_image):
+        """预览帧回调（预览图已在检测线程中缩放并转换为RGB）"""
+        self.camera_label.setPixmap(QPixmap.fromImage(q_image))
+        # 通知检测线程可以发送下一帧
+        self.detection_thread.preview_consumed()
     
     def on_status_updated(self, status: str):
         """状态更新回调"""
@@ -555,11 +548,6 @@ class MainWindow(QMainWindow):
         # 记录日志
         self.add_log_message(f"🔗 蓝牙手势: {gesture_text}")
     
-    def on_bluetooth_hand_data_received(self, hand_data):
-        """蓝牙手部数据接收回调"""
-        # 这里可以添加手部数据的可视化或处理逻辑
-        self.add_log_message(f"📥 接收到手部数据: {hand_data.hand_type}手")
-    
     def on_bluetooth_status_changed(self, connected: bool):
         """蓝牙连接状态变化回调"""
         status = "蓝牙已连接" if connected else "蓝牙已断开"
@@ -578,26 +566,37 @@ class MainWindow(QMainWindow):
         self.add_log_message(message)
     
     def add_log_message(self, message: str):
-        """添加日志消息到界面"""
-        from datetime import datetime
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {message}"
-        
-        self.log_text.append(log_entry)
+        """添加日志消息（由 update_interface 批量显示）"""
+        self.log_buffer.add(message)
+    
+    def flush_log(self):
+        """把缓冲的日志一次性追加到界面"""
+        lines = self.log_buffer.take_pending()
+        if not lines:
+            return
         
-        # 自动滚动到底部
+        # 只有在查看最新日志时才自动滚动到底部
         scrollbar = self.log_text.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+        self.log_text.appendPlainText("\n".join(lines))
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
     
     def clear_log(self):
         """清空日志"""
         self.log_text.clear()
+        self.log_buffer.clear()
         self.add_log_message("🗑 日志已清空")
     
     def update_interface(self):
         """定期更新界面"""
-        # 可以在这里添加周期性的界面更新逻辑
-        pass
+        self.flush_log()
+    
+    def changeEvent(self, event):
+        """窗口状态改变事件（最小化时暂停预览渲染）"""
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange and self.detection_thread:
+            self.detection_thread.set_preview_enabled(not self.isMinimized())
     
     def closeEvent(self, event):
         """关闭事件"""
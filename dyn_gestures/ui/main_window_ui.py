@@ -2,29 +2,30 @@
 使用Qt Designer设计的主窗口 - 响应式布局版本
 """
 
-import os
-from PyQt6 import uic
 from PyQt6.QtWidgets import QMainWindow, QApplication
-from PyQt6.QtCore import pyqtSignal, QSettings, Qt, QTimer
+from PyQt6.QtCore import pyqtSignal, QSettings, Qt, QTimer, QEvent
 from PyQt6.QtGui import QKeySequence, QShortcut
-from .threads.gesture_detection import GestureDetectionThread
+from .threads.backend_preload import BackendPreloader
+from .form_loader import setup_form
+from .log_buffer import LogBuffer
 from core.gesture_bindings import GestureBindings
-from core.action_executor import ActionExecutor
 
-# 获取.ui文件的绝对路径
-UI_FILE = os.path.join(os.path.dirname(__file__), 'main_window.ui')
+# 由 main_window.ui 生成的表单模块（.ui 文件修改后启动时自动重新生成）
+FORM_MODULE = 'ui.main_window_form'
 
 class MainWindowUI(QMainWindow):
     """基于.ui文件的主窗口类 - 响应式布局版本"""
     
-    def __init__(self):
+    def __init__(self, start_time: float = None):
+        """
+        Args:
+            start_time: 进程启动时间（time.time），第一次检测的启动指标从这里开始计时
+        """
         super().__init__()
+        self.start_time = start_time
         
-        # 加载.ui文件
-        if os.path.exists(UI_FILE):
-            uic.loadUi(UI_FILE, self)
-        else:
-            raise FileNotFoundError(f"UI文件不存在: {UI_FILE}")
+        # 加载预先生成的表单类，不在启动时解析.ui文件
+        setup_form(self, FORM_MODULE)
             
         # 初始化设置
         self.settings = QSettings('GestureDetection', 'MainWindow')
@@ -36,10 +37,20 @@ class MainWindowUI(QMainWindow):
         self.compact_width_threshold = 500  # 紧凑模式的宽度阈值
         self.auto_layout = True  # 自动布局管理
         
-        # 初始化业务逻辑
+        # 日志先写入缓冲区，由定时器每100ms批量显示
+        self.log_buffer = LogBuffer()
+        self.logTextEdit.setUndoRedoEnabled(False)
+        self.logTextEdit.document().setMaximumBlockCount(self.log_buffer.capacity)
+        self.log_timer = QTimer()
+        self.log_timer.timeout.connect(self.flush_log)
+        self.log_timer.start(100)
+        
+        # 初始化业务逻辑（检测线程和动作执行器依赖的模块较慢，窗口显示后在后台预加载，开始检测时再创建）
         self.gesture_bindings = GestureBindings()
-        self.action_executor = ActionExecutor()
+        self.action_executor = None
         self.detection_thread = None
+        self.backend_preloader = BackendPreloader()
+        self.backend_preloader.loaded.connect(self.on_backends_loaded)
         
         # 连接信号和槽
         self.setup_connections()
@@ -80,12 +91,28 @@ class MainWindowUI(QMainWindow):
         # 同步按钮和菜单项状态
         self.debugModeBtn.toggled.connect(self.actionToggleDebugMode.setChecked)
         self.actionToggleDebugMode.toggled.connect(self.debugModeBtn.setChecked)
-        
-        # 设置检测线程
-        self.detection_thread = GestureDetectionThread()
-        self.detection_thread.gesture_detected.connect(self.on_gesture_detected)
-        self.detection_thread.frame_processed.connect(self.on_frame_processed)
-        self.detection_thread.status_updated.connect(self.on_status_updated)
+    
+    def ensure_backends(self):
+        """创建检测线程和动作执行器（模块通常已在后台预加载完成，这里不再等待导入）"""
+        if self.action_executor is None:
+            from core.action_executor import ActionExecutor
+            self.action_executor = ActionExecutor()
+        
+        if self.detection_thread is None:
+            from .threads.gesture_detection import GestureDetectionThread
+            self.detection_thread = GestureDetectionThread(self.start_time)
+            self.detection_thread.gesture_event.connect(self.on_gesture_event)
+            self.detection_thread.preview_ready.connect(self.on_preview_ready)
+            self.detection_thread.status_updated.connect(self.on_status_updated)
+    
+    def on_backends_loaded(self, stats):
+        """后台预加载完成回调"""
+        self.log_message(f"后台模块加载完成: {stats['total_ms']:.0f}ms")
+        if self.debug_mode:
+            for name, elapsed_ms in stats['modules'].items():
+                self.log_message(f"  {name}: {elapsed_ms:.0f}ms")
+        for name, error in stats['errors'].items():
+            self.log_message(f"模块加载失败: {name}: {error}")
     
     def setup_shortcuts(self):
         """设置快捷键"""
@@ -169,6 +196,9 @@ class MainWindowUI(QMainWindow):
                 self.welcomePanel.setVisible(True)
                 self.log_message("摄像头预览面板已隐藏")
         
+        # 预览可见性变化时通知检测线程
+        self.update_preview_state()
+        
         # 保存设置
         self.settings.setValue('debug_mode', checked)
     
@@ -203,6 +233,7 @@ class MainWindowUI(QMainWindow):
         
         # 更新菜单项状态
         self.actionToggleExpandedView.setChecked(checked)
+        self.update_preview_state()
         
         # 保存设置
         self.settings.setValue('expanded_view', checked)
@@ -234,6 +265,17 @@ class MainWindowUI(QMainWindow):
                 else:
                     self.welcomePanel.setVisible(True)
                     self.debugPanel.setVisible(False)
+            
+            self.update_preview_state()
+    
+    def update_preview_state(self):
+        """根据摄像头预览是否可见，通知检测线程是否需要渲染叠加层"""
+        preview_visible = (self.debug_mode and self.expanded_view
+                           and self.isVisible() and not self.isMinimized())
+        if self.detection_thread:
+            label_size = self.cameraLabel.size()
+            self.detection_thread.set_preview_size(label_size.width(), label_size.height())
+            self.detection_thread.set_preview_enabled(preview_visible)
     
     def restore_settings(self):
         """恢复设置"""
@@ -277,8 +319,15 @@ class MainWindowUI(QMainWindow):
     
     def start_detection(self):
         """开始检测"""
+        try:
+            self.ensure_backends()
+        except Exception as e:
+            self.log_message(f"检测模块加载失败: {e}")
+            return
+        
         if self.detection_thread and not self.detection_thread.running:
             self.detection_thread.running = True
+            self.update_preview_state()
             self.detection_thread.start()
             
             self.is_detecting = True
@@ -307,59 +356,48 @@ class MainWindowUI(QMainWindow):
             self.statusLabel.setStyleSheet(self.statusLabel.styleSheet().replace(
                 "color: #047857; background: #d1fae5; border: 1px solid #a7f3d0;", ""))
     
-    def on_gesture_detected(self, gesture_name: str, hand_type: str, confidence: float):
-        """手势检测回调"""
-        # 更新手势显示
-        gesture_text = f"最近手势: {hand_type}手-{gesture_name} ({confidence:.0f}%)"
-        self.gestureLabel.setText(gesture_text)
-        
-        # 高亮显示手势标签
-        self.gestureLabel.setStyleSheet(self.gestureLabel.styleSheet() + 
-            "color: #047857; background: #d1fae5; border: 1px solid #a7f3d0;")
-        
-        # 记录日志
-        self.log_message(f"检测到手势: {hand_type}手 - {gesture_name} ({confidence:.0f}%)")
+    def on_gesture_event(self, event):
+        """手势事件回调：started 时显示并执行动作，held 时按绑定的 repeat 设置重复执行"""
+        if event.type == "started":
+            # 更新手势显示
+            gesture_text = f"最近手势: {event.hand_type}手-{event.gesture} ({event.confidence:.0f}%)"
+            self.gestureLabel.setText(gesture_text)
+            
+            # 高亮显示手势标签
+            self.gestureLabel.setStyleSheet(self.gestureLabel.styleSheet() + 
+                "color: #047857; background: #d1fae5; border: 1px solid #a7f3d0;")
+            
+            # 记录日志
+            self.log_message(f"检测到手势: {event.hand_type}手 - {event.gesture} ({event.confidence:.0f}%)")
         
         # 执行对应的动作
-        binding = self.gesture_bindings.get_binding(gesture_name)
-        if binding and binding.get("enabled", True):
-            result = self.action_executor.execute_action(gesture_name, binding)
-            if result is True:
+        binding = self.gesture_bindings.get_binding(event.gesture)
+        if binding and binding.get("enabled", True) and self.action_executor:
+            result = self.action_executor.execute_event(event, binding)
+            if result is True and event.type == "started":
                 action_desc = binding.get('description', binding.get('action', ''))
                 self.log_message(f"执行动作: {action_desc}")
             elif result is False:
                 self.log_message(f"执行动作失败: {binding.get('action', '')}")
     
-    def on_frame_processed(self, frame):
-        """帧处理回调"""
-        # 只在调试模式且展开视图下更新摄像头预览
-        if self.debug_mode and self.expanded_view and hasattr(self, 'cameraLabel'):
-            try:
-                # 将OpenCV图像转换为Qt图像并显示
-                from PyQt6.QtGui import QImage, QPixmap
-                
-                height, width, channel = frame.shape
-                bytes_per_line = 3 * width
-                q_image = QImage(frame.data, width, height, bytes_per_line, QImage.Format.Format_RGB888)
-                q_image = q_image.rgbSwapped()  # BGR to RGB
-                
-                # 缩放图像以适应显示区域
-                pixmap = QPixmap.fromImage(q_image)
-                scaled_pixmap = pixmap.scaled(
-                    self.cameraLabel.size(), 
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation
-                )
-                
-                self.cameraLabel.setPixmap(scaled_pixmap)
+    def on_preview_ready(self, q_image):
+        """预览帧回调（预览图已在检测线程中缩放并转换为RGB）"""
+        try:
+            # 只在调试模式且展开视图下更新摄像头预览
+            if self.debug_mode and self.expanded_view:
+                from PyQt6.QtGui import QPixmap
+                self.cameraLabel.setPixmap(QPixmap.fromImage(q_image))
                 
                 # 更新摄像头状态提示
                 if self.cameraLabel.text() != "":
                     self.cameraLabel.setText("")
                     
-            except Exception as e:
-                if self.debug_mode:
-                    self.log_message(f"摄像头预览更新失败: {e}")
+        except Exception as e:
+            if self.debug_mode:
+                self.log_message(f"摄像头预览更新失败: {e}")
+        finally:
+            # 通知检测线程可以发送下一帧
+            self.detection_thread.preview_consumed()
     
     def on_status_updated(self, status: str):
         """状态更新回调"""
@@ -368,23 +406,21 @@ class MainWindowUI(QMainWindow):
             self.log_message(f"{status}")
     
     def log_message(self, message: str):
-        """记录日志消息"""
-        from datetime import datetime
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {message}"
-        
-        self.logTextEdit.append(log_entry)
+        """记录日志消息（由 flush_log 批量显示）"""
+        self.log_buffer.add(message)
+    
+    def flush_log(self):
+        """把缓冲的日志一次性追加到界面（文档行数由 maximumBlockCount 限制）"""
+        lines = self.log_buffer.take_pending()
+        if not lines:
+            return
         
-        # 自动滚动到底部
+        # 只有在查看最新日志时才自动滚动到底部
         scrollbar = self.logTextEdit.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
-        
-        # 限制日志条数，避免占用过多内存
-        if self.logTextEdit.document().blockCount() > 300:
-            cursor = self.logTextEdit.textCursor()
-            cursor.movePosition(cursor.MoveOperation.Start)
-            cursor.movePosition(cursor.MoveOperation.Down, cursor.MoveMode.KeepAnchor, 50)
-            cursor.removeSelectedText()
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+        self.logTextEdit.append("\n".join(lines))
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
     
     def keyPressEvent(self, event):
         """键盘事件处理"""
@@ -397,12 +433,29 @@ class MainWindowUI(QMainWindow):
         else:
             super().keyPressEvent(event)
     
+    def showEvent(self, event):
+        """窗口首次显示后开始在后台预加载检测和动作执行模块"""
+        super().showEvent(event)
+        if not self.backend_preloader.isRunning() and not self.backend_preloader.isFinished():
+            QTimer.singleShot(0, self.backend_preloader.start)
+    
+    def changeEvent(self, event):
+        """窗口状态改变事件（最小化/还原时暂停或恢复预览渲染）"""
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange:
+            self.update_preview_state()
+    
     def resizeEvent(self, event):
         """窗口大小改变事件"""
         super().resizeEvent(event)
         
         # 延迟更新响应式布局，避免频繁触发
         self.layout_timer.start(100)
+        
+        # 预览区域尺寸变化后通知检测线程
+        if self.detection_thread:
+            label_size = self.cameraLabel.size()
+            self.detection_thread.set_preview_size(label_size.width(), label_size.height())
     
     def open_gesture_binding_config(self):
         """打开手势绑定配置界面"""
@@ -538,6 +591,9 @@ class MainWindowUI(QMainWindow):
             self.log_message("正在停止检测线程...")
             self.detection_thread.stop()
         
+        # 导入无法中断，等待后台预加载结束后再退出
+        self.backend_preloader.wait()
+        
         # 保存当前设置
         self.settings.setValue('debug_mode', self.debug_mode)
         self.settings.setValue('expanded_view', self.expanded_view)
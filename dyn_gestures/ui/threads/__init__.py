@@ -1,7 +1,25 @@
 """
 线程模块 - 包含所有后台线程相关的代码
+
+子模块按需导入：检测线程依赖 OpenCV 等较慢的模块。
 """
 
-from .gesture_detection import GestureDetectionThread
+from lazy_exports import lazy_exports
+
+# 窗口显示后由 BackendPreloader 在后台导入的模块，按使用顺序：
+# OpenCV、检测线程（手势检测器）、mediapipe、动作执行（pynput / pywin32）
+BACKEND_MODULES = (
+    'cv2',
+    'ui.threads.gesture_detection',
+    'cvzone.HandTrackingModule',
+    'core.action_executor'
+)
+
+_EXPORTS = {
+    'GestureDetectionThread': '.gesture_detection',
+    'BackendPreloader': '.backend_preload'
+}
+
+__all__ = ['GestureDetectionThread', 'BackendPreloader', 'BACKEND_MODULES']
 
-__all__ = ['GestureDetectionThread'] 
\ No newline at end of file
+__getattr__ = lazy_exports(__name__, _EXPORTS)
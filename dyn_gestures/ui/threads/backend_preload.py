@@ -0,0 +1,38 @@
+"""
+后台模块预加载线程 - 窗口显示后在后台导入检测和动作执行所需的重量级模块
+"""
+
+import importlib
+import time
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from . import BACKEND_MODULES
+
+
+class BackendPreloader(QThread):
+    """后台预加载线程，完成后发送各模块的导入耗时"""
+    loaded = pyqtSignal(dict)  # {'total_ms': 总耗时, 'modules': {模块: 耗时ms}, 'errors': {模块: 错误}}
+    
+    def __init__(self, modules=BACKEND_MODULES):
+        super().__init__()
+        self.modules = modules
+        
+    def run(self):
+        """依次导入模块；导入失败只记录错误，真正使用时再由调用方处理"""
+        start = time.perf_counter()
+        timings = {}
+        errors = {}
+        for name in self.modules:
+            module_start = time.perf_counter()
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                errors[name] = str(e)
+            timings[name] = round((time.perf_counter() - module_start) * 1000, 1)
+        
+        self.loaded.emit({
+            'total_ms': round((time.perf_counter() - start) * 1000, 1),
+            'modules': timings,
+            'errors': errors
+        })
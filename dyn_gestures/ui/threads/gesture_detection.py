@@ -2,33 +2,73 @@
 手势检测线程 - 负责在后台进行手势检测
 """
 
+import time
 import cv2
-import numpy as np
 from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtGui import QImage
 
 from gesture_manager import GestureManager
-from hand_utils import HandUtils
+from overlay import HandOverlay
+from motion_gate import MotionGate
+from frame_governor import FrameGovernor
+from frame_buffers import FrameBufferPool
+from frame_ring import open_capture
+from startup_metrics import StartupMetrics
+from session import SessionRecorder
 import config
 
 
 class GestureDetectionThread(QThread):
     """手势检测线程"""
-    gesture_detected = pyqtSignal(str, str, float)  # gesture_name, hand_type, confidence
-    frame_processed = pyqtSignal(np.ndarray)  # processed frame
+    gesture_event = pyqtSignal(object)  # GestureEvent（started / held / released）
+    preview_ready = pyqtSignal(QImage)  # 已缩放到预览尺寸的RGB预览图
     status_updated = pyqtSignal(str)  # status message
     
-    def __init__(self):
+    def __init__(self, start_time: float = None):
+        """
+        Args:
+            start_time: 进程启动时间（time.time），第一次运行的启动指标从这里开始计时，之后的运行从点击开始计时
+        """
         super().__init__()
+        self.start_time = start_time
         self.running = False
         self.cap = None
         self.detector = None
         self.gesture_manager = None
+        self.overlay = None
+        self.governor = None
+        self.startup = None
+        self.frame_buffers = FrameBufferPool()
+        
+        # 镜像显示时只镜像关键点坐标，整帧翻转只在生成预览时进行
+        self.flip_image = config.DISPLAY_CONFIG['flip_image']
+        self.mirror_landmarks = self.flip_image and config.DISPLAY_CONFIG['mirror_landmarks']
+        self.recorder = None
+        self.preview_enabled = False  # 只有界面上存在可见的预览时才渲染叠加层
+        self.preview_size = None      # 预览区域尺寸 (宽, 高)，None 时使用原始尺寸
+        self.preview_pending = False  # 上一帧预览尚未被界面取走时丢弃新帧
+        
+    def set_preview_enabled(self, enabled: bool):
+        """设置是否有可见的预览界面（由界面线程调用）"""
+        self.preview_enabled = enabled
+        
+    def set_preview_size(self, width: int, height: int):
+        """设置预览区域尺寸，预览图在检测线程中缩放到该尺寸（由界面线程调用）"""
+        self.preview_size = (width, height) if width > 0 and height > 0 else None
+        
+    def preview_consumed(self):
+        """界面线程显示完一帧预览后调用，允许发送下一帧"""
+        self.preview_pending = False
         
     def run(self):
         """运行检测线程"""
         try:
-            # 初始化摄像头
-            self.cap = cv2.VideoCapture(config.CAMERA_INDEX)
+            run_start = time.time()
+            self.startup = StartupMetrics("ui", self.start_time or run_start, run_start)
+            self.start_time = None
+            
+            # 初始化摄像头（CAPTURE_PROCESS_CONFIG 启用时在独立进程中采集）
+            self.cap = open_capture(config.CAMERA_INDEX, configure=False)
             if not self.cap.isOpened():
                 self.status_updated.emit("无法打开摄像头")
                 return
@@ -42,95 +82,122 @@ class GestureDetectionThread(QThread):
                 detectionCon=config.HAND_DETECTION_CONFIG['detection_confidence'],
                 minTrackCon=config.HAND_DETECTION_CONFIG['min_tracking_confidence']
             )
+            # 启动时预热模型，第一次举手时不再等待模型初始化
+            self.status_updated.emit("正在预热模型...")
+            self.detector.warm_up()
+            self.startup.detector_ready(self.detector)
             
             # 初始化手势管理器
             self.gesture_manager = GestureManager()
+            self.motion_gate = MotionGate()
+            self.overlay = HandOverlay(self.detector, config.DISPLAY_CONFIG['preview_fps'])
+            self.governor = FrameGovernor(self.cap, self.detector, self.overlay)
+            self.preview_pending = False
+            if config.RECORDING_CONFIG['enabled']:
+                self.recorder = SessionRecorder.create_default("camera")
             
             self.status_updated.emit("手势检测已启动")
             
             while self.running:
-                success, img = self.cap.read()
+                self.governor.begin_frame()
+                success, img = self.frame_buffers.read(self.cap)
+                self.governor.mark('capture')
                 if not success:
                     continue
                 
                 # 处理帧
-                img = self.process_frame(img)
+                img, hands = self.process_frame(img)
                 
-                # 发送处理后的帧
-                self.frame_processed.emit(img)
+                # 只有预览可见、界面已取走上一帧且到达渲染时间时才生成预览
+                if self.preview_enabled and not self.preview_pending and self.overlay.should_render():
+                    if self.mirror_landmarks:
+                        img = self.frame_buffers.flip(img, 1)
+                    self.emit_preview(self.overlay.render(img, hands))
+                self.governor.mark('overlay')
+                self.governor.end_frame()
                 
         except Exception as e:
             self.status_updated.emit(f"检测线程错误: {e}")
         finally:
             if self.cap:
                 self.cap.release()
+            if self.recorder:
+                self.recorder.close()
+                self.recorder = None
+    
+    def emit_preview(self, img):
+        """在检测线程中缩放并转换颜色，发送可直接显示的预览图"""
+        height, width = img.shape[:2]
+        if self.preview_size:
+            # 保持宽高比缩放到预览区域内
+            scale = min(self.preview_size[0] / width, self.preview_size[1] / height)
+            if scale < 1.0:
+                width, height = max(1, int(width * scale)), max(1, int(height * scale))
+                img = cv2.resize(img, (width, height), interpolation=cv2.INTER_AREA)
+            else:
+                img = img.copy()
+        else:
+            img = img.copy()
+        
+        # BGR转RGB，原地转换
+        cv2.cvtColor(img, cv2.COLOR_BGR2RGB, dst=img)
+        
+        # QImage 不持有numpy内存，复制一份小图后再跨线程发送
+        q_image = QImage(img.data, width, height, img.strides[0], QImage.Format.Format_RGB888).copy()
+        self.preview_pending = True
+        self.preview_ready.emit(q_image)
     
     def process_frame(self, img):
-        """处理单帧图像"""
-        # 左右翻转摄像头画面
-        if config.DISPLAY_CONFIG['flip_image']:
-            img = cv2.flip(img, 1)
+        """
+        处理单帧图像（只做推理和手势检测，不绘制）
+        Returns:
+            (图像, 手部列表)；使用关键点镜像时图像未翻转，绘制前需要翻转
+        """
+        # 左右翻转摄像头画面（不使用关键点镜像时）
+        if self.flip_image and not self.mirror_landmarks:
+            img = self.frame_buffers.flip(img, 1)
         
-        # 检测手部
-        hands, img = self.detector.findHands(
-            img, 
-            draw=config.DISPLAY_CONFIG['show_landmarks'], 
-            flipType=not config.DISPLAY_CONFIG['flip_image']
-        )
+        # 检测手部，空闲且画面静止时跳过
+        hands = []
+        if self.motion_gate.should_infer(img):
+            hands, img = self.detector.findHands(
+                img, 
+                draw=False, 
+                flipType=self.mirror_landmarks or not self.flip_image,
+                mirror=self.mirror_landmarks
+            )
+            self.motion_gate.update(bool(hands))
+        self.governor.mark('inference')
         
+        recorded_hands = []
         if hands:
             for i, hand in enumerate(hands):
                 hand_id = f"hand_{i}"
                 landmarks = hand["lmList"]
                 hand_type = hand["type"]
                 
-                # 使用手势管理器检测手势
-                detected_gestures = self.gesture_manager.detect_gestures(
+                # 使用手势管理器检测手势，并转换为手势事件
+                detected_gestures, events = self.gesture_manager.detect_events(
                     landmarks, hand_id, hand_type
                 )
+                recorded_hands.append({
+                    'hand_id': hand_id, 'hand_type': hand_type, 'landmarks': landmarks,
+                    'gestures': [gesture['gesture'] for gesture in detected_gestures]
+                })
 
-                if detected_gestures:
-                    # 发送检测到的手势
-                    for gesture in detected_gestures:
-                        self.gesture_detected.emit(
-                            gesture['gesture'],
-                            gesture['hand_type'],
-                            gesture.get('confidence', 0)
-                        )
-                
-                # 绘制手部信息
-                self.draw_hand_info(img, hand, i)
+                # 只发送状态变化，不再每帧发送
+                for event in events:
+                    self.startup.gesture_event(event)
+                    self.gesture_event.emit(event)
         else:
-            # 没有检测到手时，重置检测历史
-            self.gesture_manager.on_all_hands_lost()
-        
-        return img
-    
-    def draw_hand_info(self, img, hand, hand_index):
-        """绘制手部信息"""
-        landmarks = hand["lmList"]
-        hand_type = hand["type"]
-        
-        # 计算并绘制手掌中心
-        palm_center = HandUtils.calculate_palm_center(landmarks)
-        if config.DISPLAY_CONFIG['show_palm_center']:
-            HandUtils.draw_palm_center(img, palm_center, config.COLORS['palm_center'])
-        
-        # 计算手指数量
-        fingers = self.detector.fingersUp(hand)
-        finger_count = fingers.count(1)
+            # 没有检测到手时，重置检测历史并松开所有手势
+            for event in self.gesture_manager.on_all_hands_lost():
+                self.gesture_event.emit(event)
         
-        # 准备显示信息
-        info_dict = {
-            'Fingers': finger_count,
-            'Palm': f'({palm_center[0]}, {palm_center[1]})'
-        }
+        if self.recorder:
+            self.recorder.record_frame(time.time(), recorded_hands)
         
-        # 绘制信息
-        HandUtils.draw_text_info(
-            img, hand_type, info_dict, 
-            position_offset=hand_index * 120
-        )
+        return img, hands
     
     def stop(self):
         """停止检测线程"""
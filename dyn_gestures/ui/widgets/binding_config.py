@@ -215,6 +215,12 @@ class GestureBindingDialog(QDialog):
         """)
         config_layout.addWidget(self.description_edit, 3, 1)
         
+        # 按住重复
+        config_layout.addWidget(QLabel("按住重复:"), 4, 0)
+        self.repeat_checkbox = QCheckBox("按住手势时重复执行")
+        self.repeat_checkbox.setStyleSheet(self.enabled_checkbox.styleSheet())
+        config_layout.addWidget(self.repeat_checkbox, 4, 1)
+        
         config_group.setLayout(config_layout)
         right_layout.addWidget(config_group)
         
@@ -344,6 +350,7 @@ class GestureBindingDialog(QDialog):
         self.gesture_list.currentRowChanged.connect(self.on_gesture_selected)
         self.action_type_combo.currentTextChanged.connect(self.on_action_type_changed)
         self.enabled_checkbox.toggled.connect(self.on_config_changed)
+        self.repeat_checkbox.toggled.connect(self.on_config_changed)
         self.action_combo.currentTextChanged.connect(self.on_config_changed)
         self.description_edit.textChanged.connect(self.on_config_changed)
         
@@ -361,8 +368,8 @@ class GestureBindingDialog(QDialog):
             else:
                 # 使用默认配置
                 self.current_bindings = {
-                    "thumbs_up": {"action_type": "system_function", "action": "volume_up", "description": "音量增加", "enabled": True},
-                    "thumbs_down": {"action_type": "system_function", "action": "volume_down", "description": "音量减少", "enabled": True},
+                    "thumbs_up": {"action_type": "system_function", "action": "volume_up", "description": "音量增加", "enabled": True, "repeat": True},
+                    "thumbs_down": {"action_type": "system_function", "action": "volume_down", "description": "音量减少", "enabled": True, "repeat": True},
                     "peace": {"action_type": "system_function", "action": "play_pause", "description": "播放/暂停", "enabled": True},
                     "ok": {"action_type": "system_function", "action": "volume_mute", "description": "静音", "enabled": True},
                     "pinch": {"action_type": "system_function", "action": "previous_track", "description": "上一首", "enabled": True},
@@ -430,6 +437,7 @@ class GestureBindingDialog(QDialog):
         
         # 更新UI
         self.enabled_checkbox.setChecked(config.get("enabled", True))
+        self.repeat_checkbox.setChecked(config.get("repeat", False))
         
         # 设置动作类型
         action_type = config.get("action_type", "system_function")
@@ -583,6 +591,7 @@ class GestureBindingDialog(QDialog):
         # 更新配置
         config = self.current_bindings[gesture_key]
         config["enabled"] = self.enabled_checkbox.isChecked()
+        config["repeat"] = self.repeat_checkbox.isChecked()
         
         # 转换动作类型
         action_type_text = self.action_type_combo.currentText()
@@ -636,8 +645,8 @@ class GestureBindingDialog(QDialog):
         
         # 默认配置
         default_configs = {
-            "thumbs_up": {"action_type": "system_function", "action": "volume_up", "description": "音量增加", "enabled": True},
-            "thumbs_down": {"action_type": "system_function", "action": "volume_down", "description": "音量减少", "enabled": True},
+            "thumbs_up": {"action_type": "system_function", "action": "volume_up", "description": "音量增加", "enabled": True, "repeat": True},
+            "thumbs_down": {"action_type": "system_function", "action": "volume_down", "description": "音量减少", "enabled": True, "repeat": True},
             "peace": {"action_type": "system_function", "action": "play_pause", "description": "播放/暂停", "enabled": True},
             "ok": {"action_type": "system_function", "action": "volume_mute", "description": "静音", "enabled": True},
             "pinch": {"action_type": "system_function", "action": "previous_track", "description": "上一首", "enabled": True},